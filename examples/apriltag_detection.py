@@ -3,6 +3,13 @@
 
 @autonomous("AprilTag Auto", "Vision")
 class AprilTagDetectionRobot:
+    # Tags this routine navigates to; every tag uses the same approach
+    TAG_NAMES = {
+        1: "Tag 1",  # Left position
+        2: "Tag 2",  # Center position
+        3: "Tag 3"   # Right position
+    }
+    
     def init_hardware(self):
         # Drive motors
         self.left_drive = motor("left_drive", "forward")
@@ -14,45 +21,45 @@ class AprilTagDetectionRobot:
         self.webcam = webcam("Webcam 1")
         
         # Initialize AprilTag processor
-        self.apriltag_processor = apriltag_processor()
-        self.vision_portal = vision_portal(self.webcam, self.apriltag_processor)
-
-    def init_apriltag(self):
-        # Configure AprilTag detection
-        apriltag_config = {
+        # Decimation 2 roughly halves detection time at the cost of range;
+        # num_threads spreads quad detection across the Control Hub cores
+        self.apriltag_processor = apriltag_processor({
             "decimation": 2,
-            "sigma": 0.0,
-            "refine_edges": True,
+            "num_threads": 4,
             "tag_family": "TAG_36h11",
             "tag_library": "CENTER_STAGE"
-        }
-        self.apriltag_processor.configure(apriltag_config)
+        })
+        
+        # YUY2 frames are uncompressed, so the portal skips MJPEG decoding;
+        # the live view is off since nobody watches it during a match
+        self.vision_portal = vision_portal(self.webcam, self.apriltag_processor, {
+            "stream_format": "YUY2",
+            "live_view": False,
+            "auto_stop_live_view": True
+        })
 
     def run(self):
-        self.init_apriltag()
-        
         # Wait for camera to initialize
         sleep(2000)
         
-        # Main autonomous loop
-        while opmode_is_active():
+        # Main autonomous loop, polled at 20Hz
+        with at_rate(20):
             detections = self.get_apriltag_detections()
             
-            if detections:
-                for detection in detections:
-                    self.process_apriltag_detection(detection)
-                    break  # Process first detection
-            else:
-                # Search for tags
-                self.search_for_tags()
-            
-            sleep(50)  # Small delay
+            # None means the camera has not delivered a new frame yet, so
+            # the last frame's pose is not processed a second time
+            if detections is not None:
+                if detections:
+                    self.process_apriltag_detection(detections[0])  # Process first detection
+                else:
+                    # Search for tags
+                    self.search_for_tags()
 
     def get_apriltag_detections(self):
-        """Get current AprilTag detections"""
-        return self.apriltag_processor.get_detections()
+        """Get AprilTag detections from a new frame, or None if there is no new frame"""
+        return self.apriltag_processor.get_fresh_detections()
 
-    def process_apriltag_detection(self, detection):
+    def process_apriltag_detection(self, detection: AprilTagDetection):
         """Process a detected AprilTag"""
         tag_id = detection.id
         
@@ -78,15 +85,12 @@ class AprilTagDetectionRobot:
         telemetry_add("Z", z)
         
         # Navigate based on tag
-        if tag_id == 1:
-            self.navigate_to_tag_1(detection)
-        elif tag_id == 2:
-            self.navigate_to_tag_2(detection)
-        elif tag_id == 3:
-            self.navigate_to_tag_3(detection)
+        name = self.TAG_NAMES.get(tag_id, None)
+        if name:
+            self.navigate_to_tag(detection, name)
 
-    def navigate_to_tag_1(self, detection):
-        """Navigate to AprilTag ID 1 (Left position)"""
+    def navigate_to_tag(self, detection: AprilTagDetection, name: str):
+        """Navigate to a known AprilTag"""
         range_distance = detection.ftc_pose.range
         bearing = detection.ftc_pose.bearing
         
@@ -95,104 +99,50 @@ class AprilTagDetectionRobot:
         turn_power = self.calculate_turn_power(bearing)
         
         # Apply powers
-        self.mecanum_drive(drive_power, 0, turn_power)
+        self.drive_and_turn(drive_power, turn_power)
         
         # Stop when close enough
         if range_distance < 12:  # 12 inches
             self.stop_all_motors()
-            telemetry_add("Status", "Reached Tag 1")
-
-    def navigate_to_tag_2(self, detection):
-        """Navigate to AprilTag ID 2 (Center position)"""
-        range_distance = detection.ftc_pose.range
-        bearing = detection.ftc_pose.bearing
-        
-        drive_power = self.calculate_drive_power(range_distance)
-        turn_power = self.calculate_turn_power(bearing)
-        
-        self.mecanum_drive(drive_power, 0, turn_power)
-        
-        if range_distance < 12:
-            self.stop_all_motors()
-            telemetry_add("Status", "Reached Tag 2")
-
-    def navigate_to_tag_3(self, detection):
-        """Navigate to AprilTag ID 3 (Right position)"""
-        range_distance = detection.ftc_pose.range
-        bearing = detection.ftc_pose.bearing
-        
-        drive_power = self.calculate_drive_power(range_distance)
-        turn_power = self.calculate_turn_power(bearing)
-        
-        self.mecanum_drive(drive_power, 0, turn_power)
-        
-        if range_distance < 12:
-            self.stop_all_motors()
-            telemetry_add("Status", "Reached Tag 3")
+            telemetry_add("Status", "Reached " + name)
 
     def search_for_tags(self):
         """Search for AprilTags by rotating"""
         telemetry_add("Status", "Searching for tags...")
-        self.mecanum_drive(0, 0, 0.3)  # Slow rotation
+        self.turn_in_place(0.3)  # Slow rotation
 
     def calculate_drive_power(self, range_distance):
         """Calculate drive power based on distance to tag"""
         target_distance = 12.0  # Target distance in inches
         error = range_distance - target_distance
         
-        # Simple proportional control
+        # Simple proportional control, clamped to +/-0.5
         kp = 0.02
-        power = kp * error
+        power = clamp(kp * error, -0.5, 0.5)
         
-        # Clamp power
-        if power > 0.5:
-            power = 0.5
-        elif power < -0.5:
-            power = -0.5
-            
         return power
 
     def calculate_turn_power(self, bearing):
         """Calculate turn power based on bearing to tag"""
-        # Simple proportional control for turning
+        # Simple proportional control for turning, clamped to +/-0.3
         kp = 0.01
-        power = kp * bearing
+        power = clamp(kp * bearing, -0.3, 0.3)
         
-        # Clamp power
-        if power > 0.3:
-            power = 0.3
-        elif power < -0.3:
-            power = -0.3
-            
         return power
 
-    def mecanum_drive(self, drive, strafe, turn):
-        """Mecanum drive function"""
-        # Calculate individual motor powers
-        front_left_power = drive + strafe + turn
-        front_right_power = drive - strafe - turn
-        back_left_power = drive - strafe + turn
-        back_right_power = drive + strafe - turn
-        
-        # Normalize powers if any exceed 1.0
-        max_power = max(abs(front_left_power), abs(front_right_power), 
-                       abs(back_left_power), abs(back_right_power))
-        
-        if max_power > 1.0:
-            front_left_power = front_left_power / max_power
-            front_right_power = front_right_power / max_power
-            back_left_power = back_left_power / max_power
-            back_right_power = back_right_power / max_power
-        
-        # Set motor powers
-        self.front_left.set_power(front_left_power)
-        self.front_right.set_power(front_right_power)
-        self.left_drive.set_power(back_left_power)
-        self.right_drive.set_power(back_right_power)
+    def drive_and_turn(self, drive, turn):
+        """Mecanum drive without strafing"""
+        # The literal 0 strafe selects the specialized no-strafe mixer
+        mecanum_drive(drive, 0, turn,
+                      self.front_left, self.front_right,
+                      self.left_drive, self.right_drive)
+
+    def turn_in_place(self, turn):
+        """Rotate on the spot"""
+        mecanum_drive(0, 0, turn,
+                      self.front_left, self.front_right,
+                      self.left_drive, self.right_drive)
 
     def stop_all_motors(self):
         """Stop all drive motors"""
-        self.left_drive.set_power(0)
-        self.right_drive.set_power(0)
-        self.front_left.set_power(0)
-        self.front_right.set_power(0)
+        set_powers(0, self.left_drive, self.right_drive, self.front_left, self.front_right)
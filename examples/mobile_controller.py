@@ -3,6 +3,14 @@
 
 @teleop("Mobile Controller", "Advanced")
 class MobileControllerRobot:
+    # Arm preset encoder targets, built once instead of on every call
+    ARM_PRESET_TICKS = {
+        "HOME": 0,
+        "LOW": 500,
+        "MID": 1000,
+        "HIGH": 1500
+    }
+    
     def init_hardware(self):
         # Drive system
         self.left_drive = motor("left_drive", "forward")
@@ -22,36 +30,55 @@ class MobileControllerRobot:
         self.imu = imu("imu")
         self.touch_sensor = touch_sensor("limit_switch")
         
-        # Initialize dashboard variables
-        self.dashboard_config = self.init_dashboard()
+        # Dashboard-tunable settings, kept as typed fields
+        self.drive_speed = 1.0
+        self.turn_speed = 0.8
+        self.arm_speed = 0.6
+        self.precision_multiplier = 0.3
+        self.auto_align_enabled = True
+        self.safety_distance_cm = 15.0
+        self.init_dashboard()
         
         # Robot state variables
         self.drive_mode = "NORMAL"  # NORMAL, SLOW, TURBO
-        self.arm_position = "HOME"  # HOME, LOW, MID, HIGH
+        self.arm_position = "HOME"  # HOME, LOW, MID, HIGH, MANUAL
         self.claw_state = "OPEN"    # OPEN, CLOSED
         self.auto_functions_enabled = True
+        
+        # Previous button states for press (rising-edge) detection
+        self.prev_back = False
+        self.prev_dpad_down = False
+        self.prev_dpad_left = False
+        self.prev_dpad_up = False
+        self.prev_dpad_right = False
+        
+        # Non-blocking sequence state, advanced once per control loop
+        self.active_sequence = "NONE"  # NONE, INTAKE, SCORING
+        self.sequence_step = 0
+        self.sequence_deadline = 0.0
+        
+        # Cached sensor readings, refreshed once per control loop
+        self.distance_cm = 0.0
+        self.heading = 0.0
+        self.pitch = 0.0
+        self.roll = 0.0
+        self.arm_encoder = 0
+        self.limit_pressed = False
+        
+        # Gamepad snapshots, copied once per loop so every handler sees the
+        # same inputs and reads a plain object instead of the live gamepad
+        self.g1 = gamepad_snapshot()
+        self.g2 = gamepad_snapshot()
 
     def init_dashboard(self):
         """Initialize FTC Dashboard configuration"""
-        config = {
-            "drive_speed_multiplier": 1.0,
-            "turn_speed_multiplier": 0.8,
-            "arm_speed_multiplier": 0.6,
-            "precision_mode_multiplier": 0.3,
-            "auto_align_enabled": True,
-            "safety_distance_cm": 15.0,
-            "telemetry_update_rate": 50  # ms
-        }
-        
         # Register dashboard variables
-        dashboard_register("Drive Speed", config["drive_speed_multiplier"])
-        dashboard_register("Turn Speed", config["turn_speed_multiplier"])
-        dashboard_register("Arm Speed", config["arm_speed_multiplier"])
-        dashboard_register("Precision Multiplier", config["precision_mode_multiplier"])
-        dashboard_register("Auto Align", config["auto_align_enabled"])
-        dashboard_register("Safety Distance", config["safety_distance_cm"])
-        
-        return config
+        dashboard_register("Drive Speed", self.drive_speed)
+        dashboard_register("Turn Speed", self.turn_speed)
+        dashboard_register("Arm Speed", self.arm_speed)
+        dashboard_register("Precision Multiplier", self.precision_multiplier)
+        dashboard_register("Auto Align", self.auto_align_enabled)
+        dashboard_register("Safety Distance", self.safety_distance_cm)
 
     def run(self):
         # Initialize IMU
@@ -62,61 +89,61 @@ class MobileControllerRobot:
 
     def control_loop(self):
         """Main robot control loop with mobile dashboard integration"""
-        loop_count = 0
-        
-        while opmode_is_active():
+        # 50Hz control loop on a fixed schedule; a slow tick does not
+        # delay the ticks after it
+        with at_rate(50):
+            # Snapshot both gamepads and read sensors once; everything below
+            # uses the copies and cached values
+            self.g1.copy(gamepad1)
+            self.g2.copy(gamepad2)
+            self.refresh_sensors()
+            
             # Update dashboard values
             self.update_dashboard_config()
             
-            # Handle drive controls
-            self.handle_drive_controls()
-            
-            # Handle manipulator controls
-            self.handle_manipulator_controls()
+            # Manual controls yield to a running sequence
+            if self.active_sequence == "NONE":
+                self.handle_drive_controls()
+                self.handle_manipulator_controls()
+            else:
+                self.tick_sequence()
             
             # Handle special functions
             self.handle_special_functions()
             
-            # Update sensors and telemetry
+            # Telemetry every loop
             self.update_telemetry()
             
             # Auto functions
             if self.auto_functions_enabled:
                 self.run_auto_functions()
-            
-            # Dashboard and telemetry update
-            if loop_count % 5 == 0:  # Update every 5 loops
-                self.update_mobile_dashboard()
-            
-            loop_count += 1
-            sleep(20)  # 50Hz control loop
 
     def update_dashboard_config(self):
         """Update configuration from FTC Dashboard"""
-        self.dashboard_config["drive_speed_multiplier"] = dashboard_get("Drive Speed")
-        self.dashboard_config["turn_speed_multiplier"] = dashboard_get("Turn Speed")
-        self.dashboard_config["arm_speed_multiplier"] = dashboard_get("Arm Speed")
-        self.dashboard_config["precision_mode_multiplier"] = dashboard_get("Precision Multiplier")
-        self.dashboard_config["auto_align_enabled"] = dashboard_get("Auto Align")
-        self.dashboard_config["safety_distance_cm"] = dashboard_get("Safety Distance")
+        self.drive_speed = dashboard_get("Drive Speed")
+        self.turn_speed = dashboard_get("Turn Speed")
+        self.arm_speed = dashboard_get("Arm Speed")
+        self.precision_multiplier = dashboard_get("Precision Multiplier")
+        self.auto_align_enabled = dashboard_get("Auto Align")
+        self.safety_distance_cm = dashboard_get("Safety Distance")
 
     def handle_drive_controls(self):
         """Handle drive system controls with multiple modes"""
         # Get raw gamepad inputs
-        drive = -gamepad1.left_stick_y
-        strafe = gamepad1.left_stick_x
-        turn = gamepad1.right_stick_x
+        drive = -self.g1.left_stick_y
+        strafe = self.g1.left_stick_x
+        turn = self.g1.right_stick_x
         
         # Apply speed multipliers based on mode
         speed_multiplier = self.get_drive_speed_multiplier()
         
         drive *= speed_multiplier
         strafe *= speed_multiplier
-        turn *= speed_multiplier * self.dashboard_config["turn_speed_multiplier"]
+        turn *= speed_multiplier * self.turn_speed
         
         # Precision mode
-        if gamepad1.right_bumper:
-            precision_mult = self.dashboard_config["precision_mode_multiplier"]
+        if self.g1.right_bumper:
+            precision_mult = self.precision_multiplier
             drive *= precision_mult
             strafe *= precision_mult
             turn *= precision_mult
@@ -127,66 +154,70 @@ class MobileControllerRobot:
 
     def get_drive_speed_multiplier(self):
         """Get drive speed multiplier based on current mode"""
-        if gamepad1.left_bumper:
+        if self.g1.left_bumper:
             self.drive_mode = "TURBO"
-            return self.dashboard_config["drive_speed_multiplier"] * 1.2
-        elif gamepad1.left_trigger > 0.5:
+            return self.drive_speed * 1.2
+        elif self.g1.left_trigger > 0.5:
             self.drive_mode = "SLOW"
-            return self.dashboard_config["drive_speed_multiplier"] * 0.5
+            return self.drive_speed * 0.5
         else:
             self.drive_mode = "NORMAL"
-            return self.dashboard_config["drive_speed_multiplier"]
+            return self.drive_speed
 
     def handle_manipulator_controls(self):
         """Handle arm, wrist, and claw controls"""
         # Arm control
-        arm_power = -gamepad2.left_stick_y * self.dashboard_config["arm_speed_multiplier"]
+        arm_power = -self.g2.left_stick_y * self.arm_speed
         
         # Safety limits
-        if self.touch_sensor.is_pressed() and arm_power < 0:
+        if self.limit_pressed and arm_power < 0:
             arm_power = 0  # Don't go down if limit switch pressed
         
-        self.arm_motor.set_power(arm_power)
+        # A preset keeps driving the arm until the stick is moved
+        if self.arm_position == "MANUAL" or abs(arm_power) > 0.05:
+            if self.arm_position != "MANUAL":
+                self.arm_motor.set_mode("run_using_encoder")
+                self.arm_position = "MANUAL"
+            self.arm_motor.set_power(arm_power)
         
-        # Preset arm positions
-        if gamepad2.dpad_down:
+        # Preset arm positions, sent once per press rather than every tick
+        if self.g2.dpad_down and not self.prev_dpad_down:
             self.move_arm_to_position("HOME")
-        elif gamepad2.dpad_left:
+        elif self.g2.dpad_left and not self.prev_dpad_left:
             self.move_arm_to_position("LOW")
-        elif gamepad2.dpad_up:
+        elif self.g2.dpad_up and not self.prev_dpad_up:
             self.move_arm_to_position("MID")
-        elif gamepad2.dpad_right:
+        elif self.g2.dpad_right and not self.prev_dpad_right:
             self.move_arm_to_position("HIGH")
         
+        self.prev_dpad_down = self.g2.dpad_down
+        self.prev_dpad_left = self.g2.dpad_left
+        self.prev_dpad_up = self.g2.dpad_up
+        self.prev_dpad_right = self.g2.dpad_right
+        
         # Wrist control
-        if gamepad2.left_bumper:
+        if self.g2.left_bumper:
             self.wrist_servo.set_position(0.2)  # Wrist up
-        elif gamepad2.left_trigger > 0.5:
+        elif self.g2.left_trigger > 0.5:
             self.wrist_servo.set_position(0.8)  # Wrist down
         
         # Claw control
-        if gamepad2.a_button:
+        if self.g2.a_button:
             self.claw_servo.set_position(0.0)  # Open
             self.claw_state = "OPEN"
-        elif gamepad2.b_button:
+        elif self.g2.b_button:
             self.claw_servo.set_position(1.0)  # Close
             self.claw_state = "CLOSED"
         
         # Lift control
-        lift_power = -gamepad2.right_stick_y * 0.8
+        lift_power = -self.g2.right_stick_y * 0.8
         self.lift_motor.set_power(lift_power)
 
-    def move_arm_to_position(self, position):
+    def move_arm_to_position(self, position: str):
         """Move arm to preset position"""
-        positions = {
-            "HOME": 0,
-            "LOW": 500,
-            "MID": 1000,
-            "HIGH": 1500
-        }
-        
-        if position in positions:
-            target_position = positions[position]
+        target_position = self.ARM_PRESET_TICKS.get(position, -1)
+        
+        if target_position >= 0:
             self.arm_motor.set_target_position(target_position)
             self.arm_motor.set_mode("run_to_position")
             self.arm_motor.set_power(0.5)
@@ -194,39 +225,38 @@ class MobileControllerRobot:
 
     def handle_special_functions(self):
         """Handle special functions and macros"""
-        # Toggle auto functions
-        if gamepad1.back:
+        # Toggle auto functions once per press
+        if self.g1.back and not self.prev_back:
             self.auto_functions_enabled = not self.auto_functions_enabled
-            sleep(200)  # Debounce
+        self.prev_back = self.g1.back
         
         # Emergency stop
-        if gamepad1.start and gamepad2.start:
+        if self.g1.start and self.g2.start:
             self.emergency_stop()
         
         # Auto-align to nearest object
-        if gamepad1.y_button and self.dashboard_config["auto_align_enabled"]:
+        if self.g1.y_button and self.auto_align_enabled:
             self.auto_align_to_object()
         
         # Intake sequence
-        if gamepad2.x_button:
-            self.run_intake_sequence()
+        if self.g2.x_button and self.active_sequence == "NONE":
+            self.start_sequence("INTAKE")
         
         # Scoring sequence
-        if gamepad2.y_button:
-            self.run_scoring_sequence()
+        if self.g2.y_button and self.active_sequence == "NONE":
+            self.start_sequence("SCORING")
 
     def run_auto_functions(self):
         """Run automatic safety and assistance functions"""
         # Obstacle avoidance
-        distance = self.distance_sensor.get_distance()
-        if distance < self.dashboard_config["safety_distance_cm"]:
+        if self.distance_cm < self.safety_distance_cm:
             # Reduce forward drive power
-            if gamepad1.left_stick_y < -0.1:  # Moving forward
+            if self.g1.left_stick_y < -0.1:  # Moving forward
                 telemetry_add("Warning", "OBSTACLE DETECTED")
                 # Could reduce motor power here
         
         # Auto-level using IMU
-        if gamepad1.x_button:
+        if self.g1.x_button:
             self.auto_level_robot()
 
     def auto_align_to_object(self):
@@ -247,13 +277,9 @@ class MobileControllerRobot:
 
     def auto_level_robot(self):
         """Auto-level robot using IMU"""
-        # Get current robot orientation
-        pitch = self.imu.get_pitch()
-        roll = self.imu.get_roll()
-        
         # Simple leveling - move to counteract tilt
-        if abs(pitch) > 5:  # 5 degree threshold
-            if pitch > 0:
+        if abs(self.pitch) > 5:  # 5 degree threshold
+            if self.pitch > 0:
                 self.mecanum_drive(-0.2, 0, 0)  # Move backward
             else:
                 self.mecanum_drive(0.2, 0, 0)   # Move forward
@@ -261,147 +287,126 @@ class MobileControllerRobot:
             sleep(100)
             self.mecanum_drive(0, 0, 0)  # Stop
 
-    def run_intake_sequence(self):
-        """Automated intake sequence"""
-        telemetry_add("Sequence", "Running Intake")
-        
-        # Lower arm
-        self.move_arm_to_position("LOW")
-        sleep(1000)
-        
-        # Open claw
-        self.claw_servo.set_position(0.0)
-        self.claw_state = "OPEN"
-        sleep(500)
-        
-        # Move forward slightly
-        self.mecanum_drive(0.2, 0, 0)
-        sleep(500)
-        self.mecanum_drive(0, 0, 0)
-        
-        # Close claw
-        self.claw_servo.set_position(1.0)
-        self.claw_state = "CLOSED"
-        sleep(500)
-        
-        # Raise arm
-        self.move_arm_to_position("MID")
-        
-        telemetry_add("Sequence", "Intake Complete")
+    def start_sequence(self, name: str):
+        """Start a sequence; control_loop advances it without blocking"""
+        self.active_sequence = name
+        self.sequence_step = 0
+        self.sequence_deadline = runtime_ms()
 
-    def run_scoring_sequence(self):
-        """Automated scoring sequence"""
-        telemetry_add("Sequence", "Running Scoring")
-        
-        # Raise arm to high position
-        self.move_arm_to_position("HIGH")
-        sleep(1500)
-        
-        # Position wrist
-        self.wrist_servo.set_position(0.3)
-        sleep(500)
-        
-        # Move to scoring position
-        self.mecanum_drive(0.15, 0, 0)
-        sleep(800)
-        self.mecanum_drive(0, 0, 0)
-        
-        # Release object
-        self.claw_servo.set_position(0.0)
-        self.claw_state = "OPEN"
-        sleep(500)
-        
-        # Back away
-        self.mecanum_drive(-0.2, 0, 0)
-        sleep(500)
-        self.mecanum_drive(0, 0, 0)
+    def tick_sequence(self):
+        """Run the next sequence step once the previous step's wait has elapsed"""
+        now = runtime_ms()
+        if now >= self.sequence_deadline:
+            if self.active_sequence == "INTAKE":
+                wait_ms = self.run_intake_sequence(self.sequence_step)
+            else:
+                wait_ms = self.run_scoring_sequence(self.sequence_step)
+            
+            if wait_ms < 0:
+                self.active_sequence = "NONE"
+            else:
+                self.sequence_step += 1
+                self.sequence_deadline = now + wait_ms
+
+    def run_intake_sequence(self, step):
+        """Automated intake sequence; runs one step and returns its wait in ms, or -1 when done"""
+        if step == 0:
+            telemetry_add("Sequence", "Running Intake")
+            
+            # Lower arm
+            self.move_arm_to_position("LOW")
+            return 1000
+        elif step == 1:
+            # Open claw
+            self.claw_servo.set_position(0.0)
+            self.claw_state = "OPEN"
+            return 500
+        elif step == 2:
+            # Move forward slightly
+            self.mecanum_drive(0.2, 0, 0)
+            return 500
+        elif step == 3:
+            self.mecanum_drive(0, 0, 0)
+            
+            # Close claw
+            self.claw_servo.set_position(1.0)
+            self.claw_state = "CLOSED"
+            return 500
+        elif step == 4:
+            # Raise arm
+            self.move_arm_to_position("MID")
+            
+            telemetry_add("Sequence", "Intake Complete")
         
-        # Return to home position
-        self.move_arm_to_position("HOME")
+        return -1
+
+    def run_scoring_sequence(self, step):
+        """Automated scoring sequence; runs one step and returns its wait in ms, or -1 when done"""
+        if step == 0:
+            telemetry_add("Sequence", "Running Scoring")
+            
+            # Raise arm to high position
+            self.move_arm_to_position("HIGH")
+            return 1500
+        elif step == 1:
+            # Position wrist
+            self.wrist_servo.set_position(0.3)
+            return 500
+        elif step == 2:
+            # Move to scoring position
+            self.mecanum_drive(0.15, 0, 0)
+            return 800
+        elif step == 3:
+            self.mecanum_drive(0, 0, 0)
+            
+            # Release object
+            self.claw_servo.set_position(0.0)
+            self.claw_state = "OPEN"
+            return 500
+        elif step == 4:
+            # Back away
+            self.mecanum_drive(-0.2, 0, 0)
+            return 500
+        elif step == 5:
+            self.mecanum_drive(0, 0, 0)
+            
+            # Return to home position
+            self.move_arm_to_position("HOME")
+            
+            telemetry_add("Sequence", "Scoring Complete")
         
-        telemetry_add("Sequence", "Scoring Complete")
+        return -1
 
     def emergency_stop(self):
         """Emergency stop all motors"""
-        self.left_drive.set_power(0)
-        self.right_drive.set_power(0)
-        self.front_left.set_power(0)
-        self.front_right.set_power(0)
-        self.arm_motor.set_power(0)
-        self.lift_motor.set_power(0)
+        self.active_sequence = "NONE"
+        
+        set_powers(0, self.left_drive, self.right_drive, self.front_left, self.front_right,
+                   self.arm_motor, self.lift_motor)
         
         telemetry_add("EMERGENCY", "ALL MOTORS STOPPED")
 
+    def refresh_sensors(self):
+        """Read each I2C sensor once per loop into the cached fields"""
+        self.distance_cm = self.distance_sensor.get_distance()
+        self.heading = self.imu.get_heading()
+        self.pitch = self.imu.get_pitch()
+        self.roll = self.imu.get_roll()
+        self.arm_encoder = self.arm_motor.get_current_position()
+        self.limit_pressed = self.touch_sensor.is_pressed()
+
     def update_telemetry(self):
-        """Update telemetry with sensor readings and robot state"""
-        # Sensor readings
-        distance = self.distance_sensor.get_distance()
-        color = self.color_sensor.get_color()
-        
-        # IMU readings
-        heading = self.imu.get_heading()
-        pitch = self.imu.get_pitch()
-        roll = self.imu.get_roll()
-        
-        # Motor positions
-        arm_position = self.arm_motor.get_current_position()
-        
+        """Update driver station telemetry from the cached readings"""
         # Basic telemetry
         telemetry_add("Drive Mode", self.drive_mode)
         telemetry_add("Arm Position", self.arm_position)
         telemetry_add("Claw State", self.claw_state)
-        telemetry_add("Distance (cm)", distance)
-        telemetry_add("Heading", heading)
+        telemetry_add("Distance (cm)", self.distance_cm)
+        telemetry_add("Heading", self.heading)
         telemetry_add("Auto Functions", self.auto_functions_enabled)
 
-    def update_mobile_dashboard(self):
-        """Update mobile dashboard with detailed information"""
-        # Create dashboard packet
-        dashboard_packet = {
-            "robot_state": {
-                "drive_mode": self.drive_mode,
-                "arm_position": self.arm_position,
-                "claw_state": self.claw_state,
-                "auto_functions": self.auto_functions_enabled
-            },
-            "sensors": {
-                "distance_cm": self.distance_sensor.get_distance(),
-                "heading_deg": self.imu.get_heading(),
-                "pitch_deg": self.imu.get_pitch(),
-                "roll_deg": self.imu.get_roll(),
-                "arm_encoder": self.arm_motor.get_current_position(),
-                "limit_switch": self.touch_sensor.is_pressed()
-            },
-            "controls": {
-                "gamepad1_connected": True,  # Simplified
-                "gamepad2_connected": True,
-                "drive_power": abs(gamepad1.left_stick_y),
-                "turn_power": abs(gamepad1.right_stick_x)
-            },
-            "config": self.dashboard_config
-        }
-        
-        # Send to dashboard
-        dashboard_send_packet(dashboard_packet)
-
     def mecanum_drive(self, drive, strafe, turn):
         """Mecanum drive with power normalization"""
-        front_left_power = drive + strafe + turn
-        front_right_power = drive - strafe - turn
-        back_left_power = drive - strafe + turn
-        back_right_power = drive + strafe - turn
-        
-        # Normalize powers
-        max_power = max(abs(front_left_power), abs(front_right_power), 
-                       abs(back_left_power), abs(back_right_power))
-        
-        if max_power > 1.0:
-            front_left_power /= max_power
-            front_right_power /= max_power
-            back_left_power /= max_power
-            back_right_power /= max_power
-        
-        self.front_left.set_power(front_left_power)
-        self.front_right.set_power(front_right_power)
-        self.left_drive.set_power(back_left_power)
-        self.right_drive.set_power(back_right_power)
+        mecanum_drive(drive, strafe, turn,
+                      self.front_left, self.front_right,
+                      self.left_drive, self.right_drive)
@@ -3,6 +3,23 @@
 
 @autonomous("TensorFlow Auto", "Machine Learning")
 class TensorFlowDetectionRobot:
+    # Target priority per object label
+    OBJECT_PRIORITIES = {
+        "Bolt": 1.0,      # Highest priority
+        "Bulb": 0.8,      # Medium priority
+        "Panel": 0.6      # Lower priority
+    }
+    
+    # Inference takes well over one 50 ms control tick, so recognitions are
+    # re-queried at most this often and reused in between
+    MIN_INFERENCE_PERIOD_MS = 150
+    
+    # Horizontal image center of the 640x480 webcam stream, navigation gain
+    # and the object area (pixels^2) at which the robot is close enough
+    IMAGE_CENTER_X = 320.0
+    TURN_KP = 0.001
+    TARGET_AREA = 15000
+
     def init_hardware(self):
         # Drive motors
         self.left_drive = motor("left_drive", "forward")
@@ -14,34 +31,47 @@ class TensorFlowDetectionRobot:
         self.arm_motor = motor("arm_motor", "forward")
         self.intake_motor = motor("intake_motor", "forward")
         
+        # Arm moves run to encoder targets, counted from the stowed position
+        self.arm_motor.set_mode("stop_and_reset_encoder")
+        
         # Vision hardware
         self.webcam = webcam("Webcam 1")
         
-        # Initialize TensorFlow processor
-        self.tensorflow_processor = tensorflow_processor()
-        self.vision_portal = vision_portal(self.webcam, self.tensorflow_processor)
-
-    def init_tensorflow(self):
-        """Initialize TensorFlow object detection"""
-        # Configure TensorFlow model
-        tf_config = {
-            "model_asset_name": "PowerPlay.tflite",
+        # TensorFlow processor running the int8 post-training-quantized
+        # model (see "Preparing a quantized model" in the API reference)
+        self.tensorflow_processor = tensorflow_processor({
+            "model_asset_name": "PowerPlay_int8.tflite",
             "model_labels": ["Bolt", "Bulb", "Panel"],
             "is_model_tensor_flow2": True,
-            "is_model_quantized": True,
+            "precision": "int8",
             "input_size": 300,
             "confidence_threshold": 0.7,
-            "max_num_detections": 10
-        }
-        self.tensorflow_processor.configure(tf_config)
+            "max_num_detections": 10,
+            "num_executor_threads": 2,
+            "num_detector_threads": 2
+        })
+        # Capture at the 640x480 the navigation math assumes; a smaller frame
+        # is also cheaper to scale down to the 300x300 model input
+        self.vision_portal = vision_portal(self.webcam, self.tensorflow_processor, {
+            "camera_resolution": [640, 480]
+        })
+        
+        # Latest recognitions, shared across control ticks; fields that start
+        # out as None are annotated so they are declared with a Java type
+        self.last_detections: list[Recognition] = None
+        self.detections_deadline = 0.0
+        
+        # Best recognition for matched_label in matched_detections
+        self.matched_detections: list[Recognition] = None
+        self.matched_label = ""
+        self.matched_detection: Recognition = None
 
     def run(self):
-        self.init_tensorflow()
-        
         # Wait for camera and model to initialize
         sleep(3000)
         
         telemetry_add("Status", "TensorFlow initialized")
+        telemetry_add("Model", "PowerPlay_int8.tflite (int8)")
         
         # Main autonomous sequence
         self.autonomous_sequence()
@@ -65,7 +95,7 @@ class TensorFlowDetectionRobot:
         # Phase 5: Complete autonomous
         self.complete_autonomous()
 
-    def search_for_objects(self):
+    def search_for_objects(self) -> list[Recognition]:
         """Search for objects using TensorFlow detection"""
         search_time = 0
         max_search_time = 10000  # 10 seconds
@@ -87,69 +117,48 @@ class TensorFlowDetectionRobot:
         telemetry_add("Status", "No objects found")
         return None
 
-    def get_tensorflow_detections(self):
-        """Get current TensorFlow detections"""
-        return self.tensorflow_processor.get_recognitions()
+    def get_tensorflow_detections(self) -> list[Recognition]:
+        """Get TensorFlow detections, re-querying only when a new result can exist"""
+        now = runtime_ms()
+        if now >= self.detections_deadline:
+            fresh = self.tensorflow_processor.get_fresh_recognitions()
+            if fresh is not None:
+                self.last_detections = fresh
+                self.detections_deadline = now + self.MIN_INFERENCE_PERIOD_MS
+        return self.last_detections
 
-    def analyze_objects(self, detections):
+    def analyze_objects(self, detections: list[Recognition]) -> Recognition:
         """Analyze detected objects and choose target"""
-        best_detection = None
+        best_detection: Recognition = None
+        best_label = ""
         best_confidence = 0.0
+        best_score = 0.0
         
         for detection in detections:
             label = detection.label
             confidence = detection.confidence
             
-            telemetry_add(f"Object: {label}", f"Conf: {confidence:.2f}")
-            
-            # Prioritize certain objects
-            priority_score = self.get_object_priority(label) * confidence
+            # Prioritize certain objects; unknown labels score 0.5
+            priority_score = self.OBJECT_PRIORITIES.get(label, 0.5) * confidence
             
-            if priority_score > best_confidence:
-                best_confidence = priority_score
+            # Keep the winner's fields from the locals already read
+            if priority_score > best_score:
+                best_score = priority_score
                 best_detection = detection
+                best_label = label
+                best_confidence = confidence
         
+        # One summary for the whole frame instead of a line per detection
         if best_detection:
-            telemetry_add("Target Object", best_detection.label)
-            telemetry_add("Target Confidence", best_detection.confidence)
+            telemetry_add("Target Object", best_label)
+            telemetry_add("Target Confidence", best_confidence)
         
         return best_detection
 
-    def get_object_priority(self, label):
-        """Get priority score for different objects"""
-        priorities = {
-            "Bolt": 1.0,      # Highest priority
-            "Bulb": 0.8,      # Medium priority
-            "Panel": 0.6      # Lower priority
-        }
-        return priorities.get(label, 0.5)
-
-    def navigate_to_object(self, detection):
+    def navigate_to_object(self, detection: Recognition):
         """Navigate to the detected object"""
-        # Get object position in image
-        left = detection.left
-        right = detection.right
-        top = detection.top
-        bottom = detection.bottom
-        
-        # Calculate object center
-        center_x = (left + right) / 2
-        center_y = (top + bottom) / 2
-        
-        # Image dimensions (typical webcam)
-        image_width = 640
-        image_height = 480
-        
-        # Calculate error from image center
-        x_error = center_x - (image_width / 2)
-        y_error = center_y - (image_height / 2)
-        
-        # Calculate object size (for distance estimation)
-        object_width = right - left
-        object_height = bottom - top
-        object_area = object_width * object_height
-        
-        # Navigation control
+        # Navigation control; the object's position is read from a fresh
+        # detection on every iteration
         navigation_time = 0
         max_navigation_time = 5000  # 5 seconds
         
@@ -159,11 +168,17 @@ class TensorFlowDetectionRobot:
             current_detection = self.find_matching_detection(current_detections, detection.label)
             
             if current_detection:
+                # Read each box edge once; every attribute read is a call
+                # into the recognition object
+                left = current_detection.left
+                right = current_detection.right
+                top = current_detection.top
+                bottom = current_detection.bottom
+                
                 # Update position
-                center_x = (current_detection.left + current_detection.right) / 2
-                x_error = center_x - (image_width / 2)
-                object_area = (current_detection.right - current_detection.left) * \
-                             (current_detection.bottom - current_detection.top)
+                center_x = (left + right) / 2
+                x_error = center_x - self.IMAGE_CENTER_X
+                object_area = (right - left) * (bottom - top)
                 
                 # Calculate control signals
                 turn_power = self.calculate_turn_from_x_error(x_error)
@@ -173,7 +188,7 @@ class TensorFlowDetectionRobot:
                 self.mecanum_drive(drive_power, 0, turn_power)
                 
                 # Check if close enough
-                if object_area > 15000:  # Object is large enough (close)
+                if object_area > self.TARGET_AREA:  # Object is large enough (close)
                     break
             else:
                 # Lost object, stop
@@ -186,22 +201,30 @@ class TensorFlowDetectionRobot:
         self.stop_all_motors()
         telemetry_add("Status", "Navigation complete")
 
-    def find_matching_detection(self, detections, target_label):
-        """Find detection matching the target label"""
-        if not detections:
-            return None
-        
-        for detection in detections:
-            if detection.label == target_label:
-                return detection
-        
-        return None
+    def find_matching_detection(self, detections: list[Recognition], target_label: str) -> Recognition:
+        """Find the highest-confidence detection matching the target label"""
+        # Recognitions only change once per inference period, so the scan
+        # runs once per new result instead of once per control tick
+        if detections is self.matched_detections and target_label == self.matched_label:
+            return self.matched_detection
+        
+        self.matched_detections = detections
+        self.matched_label = target_label
+        self.matched_detection = None
+        
+        if detections:
+            best_confidence = 0.0
+            for detection in detections:
+                if detection.label == target_label and detection.confidence > best_confidence:
+                    best_confidence = detection.confidence
+                    self.matched_detection = detection
+        
+        return self.matched_detection
 
     def calculate_turn_from_x_error(self, x_error):
         """Calculate turn power from horizontal error"""
         # Proportional control
-        kp = 0.001
-        turn_power = kp * x_error
+        turn_power = self.TURN_KP * x_error
         
         # Clamp power
         if turn_power > 0.3:
@@ -213,9 +236,7 @@ class TensorFlowDetectionRobot:
 
     def calculate_drive_from_area(self, object_area):
         """Calculate drive power from object area (distance estimate)"""
-        target_area = 15000  # Target object area
-        
-        if object_area < target_area:
+        if object_area < self.TARGET_AREA:
             # Object is far, drive forward
             drive_power = 0.3
         else:
@@ -224,7 +245,7 @@ class TensorFlowDetectionRobot:
         
         return drive_power
 
-    def interact_with_object(self, detection):
+    def interact_with_object(self, detection: Recognition):
         """Interact with the detected object"""
         object_label = detection.label
         
@@ -242,9 +263,7 @@ class TensorFlowDetectionRobot:
         telemetry_add("Action", "Collecting Bolt")
         
         # Lower arm
-        self.arm_motor.set_power(-0.5)
-        sleep(1000)
-        self.arm_motor.set_power(0)
+        self.arm_move(-500, 0.5)
         
         # Run intake
         self.intake_motor.set_power(1.0)
@@ -252,25 +271,30 @@ class TensorFlowDetectionRobot:
         self.intake_motor.set_power(0)
         
         # Raise arm
-        self.arm_motor.set_power(0.5)
-        sleep(1000)
-        self.arm_motor.set_power(0)
+        self.arm_move(0, 0.5)
 
     def collect_bulb(self):
         """Collect a bulb object"""
         telemetry_add("Action", "Collecting Bulb")
         
-        # Similar to bolt but different timing
-        self.arm_motor.set_power(-0.3)
-        sleep(800)
-        self.arm_motor.set_power(0)
+        # Similar to bolt but a shallower, gentler arm move
+        self.arm_move(-250, 0.3)
         
         self.intake_motor.set_power(0.8)
         sleep(1500)
         self.intake_motor.set_power(0)
         
-        self.arm_motor.set_power(0.3)
-        sleep(800)
+        self.arm_move(0, 0.3)
+
+    def arm_move(self, position, power):
+        """Run the arm to an encoder position, returning as soon as it arrives"""
+        self.arm_motor.set_target_position(int(position))
+        self.arm_motor.set_mode("run_to_position")
+        self.arm_motor.set_power(power)
+        
+        while opmode_is_active() and self.arm_motor.is_busy():
+            sleep(20)
+        
         self.arm_motor.set_power(0)
 
     def interact_with_panel(self):
@@ -293,31 +317,12 @@ class TensorFlowDetectionRobot:
 
     def mecanum_drive(self, drive, strafe, turn):
         """Mecanum drive function"""
-        front_left_power = drive + strafe + turn
-        front_right_power = drive - strafe - turn
-        back_left_power = drive - strafe + turn
-        back_right_power = drive + strafe - turn
-        
-        # Normalize powers
-        max_power = max(abs(front_left_power), abs(front_right_power), 
-                       abs(back_left_power), abs(back_right_power))
-        
-        if max_power > 1.0:
-            front_left_power /= max_power
-            front_right_power /= max_power
-            back_left_power /= max_power
-            back_right_power /= max_power
-        
-        self.front_left.set_power(front_left_power)
-        self.front_right.set_power(front_right_power)
-        self.left_drive.set_power(back_left_power)
-        self.right_drive.set_power(back_right_power)
+        # Mix and normalize motor powers in one fused builtin
+        mecanum_drive(drive, strafe, turn,
+                      self.front_left, self.front_right,
+                      self.left_drive, self.right_drive)
 
     def stop_all_motors(self):
         """Stop all motors"""
-        self.left_drive.set_power(0)
-        self.right_drive.set_power(0)
-        self.front_left.set_power(0)
-        self.front_right.set_power(0)
-        self.arm_motor.set_power(0)
-        self.intake_motor.set_power(0)
+        set_powers(0, self.left_drive, self.right_drive, self.front_left, self.front_right,
+                   self.arm_motor, self.intake_motor)
@@ -30,106 +30,103 @@ class CompetitionRobot:
         self.back_left.set_mode("run_using_encoder")
         self.back_right.set_mode("run_using_encoder")
         self.arm_motor.set_mode("run_using_encoder")
+        
+        # Gamepad snapshots, copied once per loop so every check below reads
+        # a plain object instead of the live gamepad
+        self.g1 = gamepad_snapshot()
+        self.g2 = gamepad_snapshot()
 
     def run(self):
         self.main_loop()
 
     def main_loop(self):
+        # Snapshot both gamepads once; everything below reads the copies
+        self.g1.copy(gamepad1)
+        self.g2.copy(gamepad2)
+        
         # Mecanum drive control
-        drive = -gamepad1.left_stick_y
-        strafe = gamepad1.left_stick_x
-        turn = gamepad1.right_stick_x
+        drive = -self.g1.left_stick_y
+        strafe = self.g1.left_stick_x
+        turn = self.g1.right_stick_x
         
         # Apply speed control
         speed_multiplier = 1.0
-        if gamepad1.right_bumper:
+        if self.g1.right_bumper:
             speed_multiplier = 0.3  # Precision mode
-        elif gamepad1.left_bumper:
+        elif self.g1.left_bumper:
             speed_multiplier = 1.5  # Turbo mode
         
         drive = drive * speed_multiplier
         strafe = strafe * speed_multiplier
         turn = turn * speed_multiplier * 0.8  # Reduce turn sensitivity
         
-        # Calculate mecanum drive powers
-        front_left_power = drive + strafe + turn
-        front_right_power = drive - strafe - turn
-        back_left_power = drive - strafe + turn
-        back_right_power = drive + strafe - turn
-        
-        # Normalize powers if any exceed 1.0
-        max_power = max(abs(front_left_power), abs(front_right_power),
-                       abs(back_left_power), abs(back_right_power))
-        
-        if max_power > 1.0:
-            front_left_power = front_left_power / max_power
-            front_right_power = front_right_power / max_power
-            back_left_power = back_left_power / max_power
-            back_right_power = back_right_power / max_power
-        
-        # Set drive motor powers
-        self.front_left.set_power(front_left_power)
-        self.front_right.set_power(front_right_power)
-        self.back_left.set_power(back_left_power)
-        self.back_right.set_power(back_right_power)
+        # Safety features - cap at 30% of the normalized power with an
+        # obstacle ahead while moving forward. The largest mecanum wheel
+        # power is |drive| + |strafe| + |turn|, so this scale reproduces
+        # normalize-then-reduce in a single mixer call
+        distance = self.distance_sensor.get_distance()
+        obstacle_status = "CLEAR"
+        if distance < 15 and drive > 0:
+            obstacle_scale = 0.3 / max(1.0, abs(drive) + abs(strafe) + abs(turn))
+            drive = drive * obstacle_scale
+            strafe = strafe * obstacle_scale
+            turn = turn * obstacle_scale
+            obstacle_status = "OBSTACLE DETECTED"
+        
+        # Mix, normalize and set the drive motor powers in one fused builtin
+        mecanum_drive(drive, strafe, turn,
+                      self.front_left, self.front_right,
+                      self.back_left, self.back_right)
         
         # Arm control
-        arm_power = -gamepad2.left_stick_y * 0.8
+        arm_power = -self.g2.left_stick_y * 0.8
         
         # Safety limit - don't go down if limit switch pressed
-        if self.touch_sensor.is_pressed() and arm_power < 0:
+        limit_pressed = self.touch_sensor.is_pressed()
+        if limit_pressed and arm_power < 0:
             arm_power = 0
         
         self.arm_motor.set_power(arm_power)
         
         # Preset arm positions
-        if gamepad2.dpad_down:
+        if self.g2.dpad_down:
             self.move_arm_to_position(0)      # Home position
-        elif gamepad2.dpad_left:
+        elif self.g2.dpad_left:
             self.move_arm_to_position(500)    # Low position
-        elif gamepad2.dpad_up:
+        elif self.g2.dpad_up:
             self.move_arm_to_position(1000)   # Mid position
-        elif gamepad2.dpad_right:
+        elif self.g2.dpad_right:
             self.move_arm_to_position(1500)   # High position
         
         # Wrist control
-        if gamepad2.left_bumper:
+        if self.g2.left_bumper:
             self.wrist_servo.set_position(0.2)  # Wrist up
-        elif gamepad2.left_trigger > 0.5:
+        elif self.g2.left_trigger > 0.5:
             self.wrist_servo.set_position(0.8)  # Wrist down
         
         # Claw control
-        if gamepad2.a_button:
+        if self.g2.a_button:
             self.claw_servo.set_position(0.0)  # Open
-        elif gamepad2.b_button:
+        elif self.g2.b_button:
             self.claw_servo.set_position(1.0)  # Close
         
         # Intake control
         intake_power = 0
-        if gamepad2.right_bumper:
+        if self.g2.right_bumper:
             intake_power = 1.0   # Intake
-        elif gamepad2.right_trigger > 0.5:
+        elif self.g2.right_trigger > 0.5:
             intake_power = -1.0  # Outtake
         
         self.intake_motor.set_power(intake_power)
         
         # Automated sequences
-        if gamepad2.x_button:
+        if self.g2.x_button:
             self.intake_sequence()
-        elif gamepad2.y_button:
+        elif self.g2.y_button:
             self.scoring_sequence()
         
-        # Safety features
-        distance = self.distance_sensor.get_distance()
-        if distance < 15 and drive > 0:  # Obstacle ahead while moving forward
-            # Reduce forward power
-            self.front_left.set_power(front_left_power * 0.3)
-            self.front_right.set_power(front_right_power * 0.3)
-            self.back_left.set_power(back_left_power * 0.3)
-            self.back_right.set_power(back_right_power * 0.3)
-            telemetry_add("Warning", "OBSTACLE DETECTED")
-        
-        # Telemetry
+        # Telemetry, gathered in one block and sent as a single frame
+        telemetry_add("Warning", obstacle_status)
         telemetry_add("Drive", drive)
         telemetry_add("Strafe", strafe)
         telemetry_add("Turn", turn)
@@ -137,7 +134,8 @@ class CompetitionRobot:
         telemetry_add("Arm Power", arm_power)
         telemetry_add("Arm Position", self.arm_motor.get_current_position())
         telemetry_add("Distance", distance)
-        telemetry_add("Limit Switch", self.touch_sensor.is_pressed())
+        telemetry_add("Limit Switch", limit_pressed)
+        telemetry_update()
 
     def move_arm_to_position(self, target_position):
         """Move arm to preset position using encoders"""
@@ -193,34 +191,22 @@ class CompetitionRobot:
         # Move forward slightly (if safe)
         distance = self.distance_sensor.get_distance()
         if distance > 20:
-            self.front_left.set_power(0.2)
-            self.front_right.set_power(0.2)
-            self.back_left.set_power(0.2)
-            self.back_right.set_power(0.2)
+            set_powers(0.2, self.front_left, self.front_right, self.back_left, self.back_right)
             sleep(800)
             
             # Stop
-            self.front_left.set_power(0)
-            self.front_right.set_power(0)
-            self.back_left.set_power(0)
-            self.back_right.set_power(0)
+            set_powers(0, self.front_left, self.front_right, self.back_left, self.back_right)
         
         # Release game element
         self.claw_servo.set_position(0.0)
         sleep(500)
         
         # Back away
-        self.front_left.set_power(-0.3)
-        self.front_right.set_power(-0.3)
-        self.back_left.set_power(-0.3)
-        self.back_right.set_power(-0.3)
+        set_powers(-0.3, self.front_left, self.front_right, self.back_left, self.back_right)
         sleep(500)
         
         # Stop
-        self.front_left.set_power(0)
-        self.front_right.set_power(0)
-        self.back_left.set_power(0)
-        self.back_right.set_power(0)
+        set_powers(0, self.front_left, self.front_right, self.back_left, self.back_right)
         
         # Return arm to safe position
         self.move_arm_to_position(500)
@@ -2,8 +2,13 @@
 # Team: Sample FTC Team
 # Season: 2024-2025
 
+import math
+
 @autonomous("Red Alliance Auto", "Competition")
 class RedAutonomous:
+    # Encoder counts per inch of travel: 1120 counts per revolution, 4 inch wheels
+    COUNTS_PER_INCH = 1120.0 / (4.0 * math.pi)
+
     def init_hardware(self):
         # Drive system
         self.front_left = motor("front_left", "forward")
@@ -24,7 +29,8 @@ class RedAutonomous:
         self.apriltag_processor = apriltag_processor()
         self.vision_portal = vision_portal(self.webcam, self.apriltag_processor)
         
-        # Set motor modes for autonomous
+        # Reset the drive encoders once; drive_straight() moves relative to
+        # the current positions, so it never needs to reset them again
         self.front_left.set_mode("stop_and_reset_encoder")
         self.front_right.set_mode("stop_and_reset_encoder")
         self.back_left.set_mode("stop_and_reset_encoder")
@@ -70,18 +76,16 @@ class RedAutonomous:
 
     def score_preload(self):
         """Score the pre-loaded game element"""
-        # Raise arm to scoring position
+        # Raise arm to scoring position; it keeps rising while the robot drives
         self.arm_motor.set_target_position(1200)
         self.arm_motor.set_mode("run_to_position")
         self.arm_motor.set_power(0.6)
         
-        # Wait for arm to reach position
-        sleep(1500)
-        
         # Drive forward to scoring position
         self.drive_straight(24, 0.4)  # 24 inches forward
         
-        # Score the element
+        # Score the element once the arm is up
+        self.wait_for_arm()
         self.claw_servo.set_position(0.0)  # Open claw
         sleep(500)
         
@@ -129,7 +133,7 @@ class RedAutonomous:
         # If no tags found, use dead reckoning
         telemetry_add("Vision", "No tags found, using dead reckoning")
 
-    def align_to_apriltag(self, detection):
+    def align_to_apriltag(self, detection: AprilTagDetection):
         """Align robot to detected AprilTag"""
         range_distance = detection.ftc_pose.range
         bearing = detection.ftc_pose.bearing
@@ -147,15 +151,13 @@ class RedAutonomous:
 
     def collect_and_score_elements(self):
         """Collect game elements and score them"""
-        # Lower arm for collection
+        # Lower arm for collection and open the claw on the way down
         self.arm_motor.set_target_position(200)
         self.arm_motor.set_mode("run_to_position")
         self.arm_motor.set_power(0.5)
-        sleep(1000)
-        
-        # Open claw
         self.claw_servo.set_position(0.0)
         sleep(500)
+        self.wait_for_arm()
         
         # Drive forward to collect element
         self.drive_straight(8, 0.2)  # Slow approach
@@ -164,10 +166,9 @@ class RedAutonomous:
         self.claw_servo.set_position(1.0)
         sleep(500)
         
-        # Raise arm
+        # Raise arm; it keeps rising while the robot turns and drives
         self.arm_motor.set_target_position(800)
         self.arm_motor.set_power(0.6)
-        sleep(1000)
         
         # Navigate back to scoring area
         self.turn_to_heading(0)  # Face forward
@@ -176,7 +177,7 @@ class RedAutonomous:
         # Score the collected element
         self.arm_motor.set_target_position(1200)
         self.arm_motor.set_power(0.6)
-        sleep(1000)
+        self.wait_for_arm()
         
         self.claw_servo.set_position(0.0)  # Release
         sleep(500)
@@ -195,90 +196,73 @@ class RedAutonomous:
 
     def drive_straight(self, distance_inches, power):
         """Drive straight for specified distance"""
-        # Calculate encoder counts (example: 1120 counts per revolution, 4 inch wheels)
-        counts_per_inch = 1120 / (4 * 3.14159)
-        target_counts = int(distance_inches * counts_per_inch)
+        target_counts = int(distance_inches * self.COUNTS_PER_INCH)
         
-        # Reset encoders
-        self.front_left.set_mode("stop_and_reset_encoder")
-        self.front_right.set_mode("stop_and_reset_encoder")
-        self.back_left.set_mode("stop_and_reset_encoder")
-        self.back_right.set_mode("stop_and_reset_encoder")
+        # Set target positions relative to where each wheel is now
+        self.front_left.set_target_position(self.front_left.get_current_position() + target_counts)
+        self.front_right.set_target_position(self.front_right.get_current_position() + target_counts)
+        self.back_left.set_target_position(self.back_left.get_current_position() + target_counts)
+        self.back_right.set_target_position(self.back_right.get_current_position() + target_counts)
         
-        # Set target positions
-        self.front_left.set_target_position(target_counts)
-        self.front_right.set_target_position(target_counts)
-        self.back_left.set_target_position(target_counts)
-        self.back_right.set_target_position(target_counts)
-        
-        # Set to run to position mode
+        # Set to run to position mode; only the first move sends it, later
+        # calls are no-ops in the motors' mode cache
         self.front_left.set_mode("run_to_position")
         self.front_right.set_mode("run_to_position")
         self.back_left.set_mode("run_to_position")
         self.back_right.set_mode("run_to_position")
         
         # Set power
-        self.front_left.set_power(power)
-        self.front_right.set_power(power)
-        self.back_left.set_power(power)
-        self.back_right.set_power(power)
-        
-        # Wait for movement to complete
-        while (opmode_is_active() and 
-               (abs(self.front_left.get_current_position() - target_counts) > 10)):
-            telemetry_add("Target", target_counts)
-            telemetry_add("Current", self.front_left.get_current_position())
-            sleep(50)
+        set_powers(power, self.front_left, self.front_right, self.back_left, self.back_right)
+        
+        # Wait for the motor controller to report the target reached,
+        # updating telemetry every 5th poll
+        polls = 0
+        while opmode_is_active() and self.front_left.is_busy():
+            if polls % 5 == 0:
+                telemetry_add("Target", target_counts)
+                telemetry_add("Current", self.front_left.get_current_position())
+            sleep(20)
+            polls += 1
         
         # Stop motors
-        self.front_left.set_power(0)
-        self.front_right.set_power(0)
-        self.back_left.set_power(0)
-        self.back_right.set_power(0)
+        set_powers(0, self.front_left, self.front_right, self.back_left, self.back_right)
+
+    def wait_for_arm(self):
+        """Wait until the arm reaches its RUN_TO_POSITION target"""
+        while opmode_is_active() and self.arm_motor.is_busy():
+            sleep(20)
 
     def turn_to_heading(self, target_heading):
         """Turn robot to specific heading using IMU"""
-        current_heading = self.imu.get_heading()
-        error = target_heading - current_heading
-        
-        # Normalize error to -180 to 180 degrees
-        while error > 180:
-            error -= 360
-        while error < -180:
-            error += 360
-        
-        # Turn until within tolerance
-        while opmode_is_active() and abs(error) > 2:  # 2 degree tolerance
-            turn_power = error * 0.01  # Proportional control
+        # One IMU read per iteration, taken right before it is used; the
+        # read itself is a blocking I2C transaction, so the sleep between
+        # corrections is kept short
+        while opmode_is_active():
+            current_heading = self.imu.get_heading()
             
-            # Limit turn power
-            if turn_power > 0.3:
-                turn_power = 0.3
-            elif turn_power < -0.3:
-                turn_power = -0.3
+            # Error wrapped to -180..180 degrees in one step
+            error = math.remainder(target_heading - current_heading, 360.0)
             
-            self.turn_robot(turn_power)
+            if abs(error) <= 2:  # 2 degree tolerance
+                break
             
-            sleep(50)
-            current_heading = self.imu.get_heading()
-            error = target_heading - current_heading
+            # Proportional control, limited to +/-0.3
+            turn_power = clamp(error * 0.01, -0.3, 0.3)
             
-            # Normalize error
-            while error > 180:
-                error -= 360
-            while error < -180:
-                error += 360
+            self.turn_robot(turn_power)
             
             telemetry_add("Target Heading", target_heading)
             telemetry_add("Current Heading", current_heading)
             telemetry_add("Error", error)
+            
+            sleep(20)
         
         # Stop turning
         self.turn_robot(0)
 
     def turn_robot(self, turn_power):
         """Turn robot with specified power"""
-        self.front_left.set_power(turn_power)
-        self.front_right.set_power(-turn_power)
-        self.back_left.set_power(turn_power)
-        self.back_right.set_power(-turn_power)
+        # Pure-turn mixer: +turn on the left wheels, -turn on the right
+        mecanum_drive(0, 0, turn_power,
+                      self.front_left, self.front_right,
+                      self.back_left, self.back_right)
@@ -18,84 +18,466 @@ Usage:
 """
 
 import ast
+import io
 import sys
 import re
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+
+# FTC API mappings, shared read-only by every transpiler instance
+HARDWARE_TYPES = MappingProxyType({
+    'motor': 'DcMotor',
+    'servo': 'Servo',
+    'color_sensor': 'ColorSensor',
+    'distance_sensor': 'DistanceSensor',
+    'gyro': 'GyroSensor',
+    'touch_sensor': 'TouchSensor',
+    'light_sensor': 'LightSensor',
+    'imu': 'IMU',
+    'webcam': 'WebcamName'
+})
+
+MOTOR_DIRECTIONS = MappingProxyType({
+    'forward': 'DcMotor.Direction.FORWARD',
+    'reverse': 'DcMotor.Direction.REVERSE'
+})
+
+MOTOR_MODES = MappingProxyType({
+    'run_using_encoder': 'DcMotor.RunMode.RUN_USING_ENCODER',
+    'run_without_encoder': 'DcMotor.RunMode.RUN_WITHOUT_ENCODER',
+    'run_to_position': 'DcMotor.RunMode.RUN_TO_POSITION',
+    'stop_and_reset_encoder': 'DcMotor.RunMode.STOP_AND_RESET_ENCODER'
+})
+
+# DSL gamepad attribute names -> Gamepad fields
+GAMEPAD_MAPPINGS = MappingProxyType({
+    'left_stick_y': 'left_stick_y',
+    'right_stick_x': 'right_stick_x',
+    'left_stick_x': 'left_stick_x',
+    'right_stick_y': 'right_stick_y',
+    'a_button': 'a',
+    'b_button': 'b',
+    'x_button': 'x',
+    'y_button': 'y',
+    'dpad_up': 'dpad_up',
+    'dpad_down': 'dpad_down',
+    'dpad_left': 'dpad_left',
+    'dpad_right': 'dpad_right',
+    'left_bumper': 'left_bumper',
+    'right_bumper': 'right_bumper',
+    'left_trigger': 'left_trigger',
+    'right_trigger': 'right_trigger'
+})
+
+# Standard FTC imports
+STANDARD_IMPORTS = frozenset({
+    'com.qualcomm.robotcore.eventloop.opmode.LinearOpMode',
+    'com.qualcomm.robotcore.eventloop.opmode.TeleOp',
+    'com.qualcomm.robotcore.eventloop.opmode.Autonomous',
+    'com.qualcomm.robotcore.hardware.DcMotor',
+    'com.qualcomm.robotcore.hardware.Servo',
+    'com.qualcomm.robotcore.hardware.ColorSensor',
+    'com.qualcomm.robotcore.hardware.DistanceSensor',
+    'com.qualcomm.robotcore.hardware.TouchSensor',
+    'com.qualcomm.robotcore.hardware.LightSensor',
+    'com.qualcomm.robotcore.hardware.IMU',
+    'org.firstinspires.ftc.robotcore.external.navigation.DistanceUnit',
+    'org.firstinspires.ftc.robotcore.external.navigation.AngleUnit'
+})
+
+# The sorted standard import lines, for OpModes that need nothing else
+IMPORT_BLOCK = "".join(f"import {imp};\n" for imp in sorted(STANDARD_IMPORTS)) + "\n"
+
+# Line templates for the declarations and hardware lookups emitted per
+# component; a %-format fills the one or two names without f-string setup
+_FIELD_TPL = "private %s %s = null;"
+_CACHE_FIELD_TPL = "private PowerCache %s_cache = null;"
+_STATE_FIELD_TPL = "private %s %s;"
+_HARDWARE_MAP_TPL = '%s = hardwareMap.get(%s.class, "%s");'
+_DIRECTION_TPL = "%s.setDirection(%s);"
+_CACHE_INIT_TPL = "%s_cache = new PowerCache(%s);"
+
+# Java helper emitted once per OpMode that uses the mecanum_drive() builtin.
+# Wheel powers come from one loop over a fixed sign table (rows fl, fr, bl,
+# br; columns drive, strafe, turn) that the JIT can unroll. The max of
+# |power| is taken on the raw IEEE-754 bits with the sign masked off, since
+# non-negative doubles order the same as their bit patterns, and the powers
+# are normalized with a single reciprocal, so the hot path has one divide.
+# The powers go into a local array, which escape analysis keeps off the heap
+# and no other OpMode instance or thread can see.
+# Call sites that pass a literal 0 strafe (or 0 drive and strafe) are bound
+# to the specialized applyNoStrafe()/applyPureTurn() variants instead.
+MECANUM_MIXER_HELPER = [
+    "private static final class MecanumMixer {",
+    "    private static final double[] SIGNS = {",
+    "        1,  1,  1,",
+    "        1, -1, -1,",
+    "        1, -1,  1,",
+    "        1,  1, -1",
+    "    };",
+    "    private static final long ABS_MASK = 0x7FFFFFFFFFFFFFFFL;",
+    "    private static final long ONE_BITS = Double.doubleToRawLongBits(1.0);",
+    "",
+    "    static void apply(double d, double s, double t, PowerCache fl, PowerCache fr, PowerCache bl, PowerCache br) {",
+    "        double[] powers = new double[4];",
+    "        long maxBits = ONE_BITS;",
+    "        for (int i = 0; i < 4; i++) {",
+    "            double p = SIGNS[3 * i] * d + SIGNS[3 * i + 1] * s + SIGNS[3 * i + 2] * t;",
+    "            powers[i] = p;",
+    "            maxBits = Math.max(maxBits, Double.doubleToRawLongBits(p) & ABS_MASK);",
+    "        }",
+    "        double inv = 1.0 / Double.longBitsToDouble(maxBits);",
+    "        fl.setPower(powers[0] * inv);",
+    "        fr.setPower(powers[1] * inv);",
+    "        bl.setPower(powers[2] * inv);",
+    "        br.setPower(powers[3] * inv);",
+    "    }",
+    "",
+    "    static void applyNoStrafe(double d, double t, PowerCache fl, PowerCache fr, PowerCache bl, PowerCache br) {",
+    "        double left = d + t;",
+    "        double right = d - t;",
+    "        double inv = 1.0 / Math.max(1.0, Math.max(Math.abs(left), Math.abs(right)));",
+    "        left *= inv;",
+    "        right *= inv;",
+    "        fl.setPower(left);",
+    "        fr.setPower(right);",
+    "        bl.setPower(left);",
+    "        br.setPower(right);",
+    "    }",
+    "",
+    "    static void applyPureTurn(double t, PowerCache fl, PowerCache fr, PowerCache bl, PowerCache br) {",
+    "        double p = Math.max(-1.0, Math.min(1.0, t));",
+    "        fl.setPower(p);",
+    "        fr.setPower(-p);",
+    "        bl.setPower(p);",
+    "        br.setPower(-p);",
+    "    }",
+    "}",
+]
+
+# Java helper wrapped around every DcMotor. Each setPower() and setMode() is
+# a Lynx command over the hub's serial bus, so repeating the last value is
+# skipped. A mode change can stop the motor, so it invalidates the cached
+# power. STOP_AND_RESET_ENCODER is an action rather than a state and is
+# always sent. setAll() backs the set_powers() builtin, so stopping a group
+# of motors only commands the ones that are not already at that power.
+POWER_CACHE_HELPER = [
+    "private static final class PowerCache {",
+    "    private final DcMotor motor;",
+    "    private double lastPower = Double.NaN;",
+    "    private DcMotor.RunMode lastMode = null;",
+    "",
+    "    PowerCache(DcMotor motor) {",
+    "        this.motor = motor;",
+    "    }",
+    "",
+    "    void setPower(double power) {",
+    "        if (power != lastPower) {",
+    "            motor.setPower(power);",
+    "            lastPower = power;",
+    "        }",
+    "    }",
+    "",
+    "    static void setAll(double power, PowerCache... motors) {",
+    "        for (PowerCache motor : motors) {",
+    "            motor.setPower(power);",
+    "        }",
+    "    }",
+    "",
+    "    void setMode(DcMotor.RunMode mode) {",
+    "        if (mode != lastMode || mode == DcMotor.RunMode.STOP_AND_RESET_ENCODER) {",
+    "            motor.setMode(mode);",
+    "            lastMode = mode;",
+    "            lastPower = Double.NaN;",
+    "        }",
+    "    }",
+    "}",
+]
 
 class OpModeType(Enum):
     TELEOP = "TeleOp"
     AUTONOMOUS = "Autonomous"
     DISABLED = "Disabled"
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__; slots= needs 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class HardwareComponent:
     name: str
     type: str
     config_name: str
     direction: Optional[str] = None
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class OpModeInfo:
     name: str
     group: str
     type: OpModeType
 
 class FTCTranspiler(ast.NodeVisitor):
+    # Python binary and comparison operators -> Java operators
+    _BINOP_MAP = {
+        ast.Add: "+",
+        ast.Sub: "-",
+        ast.Mult: "*",
+        ast.Div: "/",
+        ast.Mod: "%",
+        ast.LShift: "<<",
+        ast.RShift: ">>",
+        ast.BitAnd: "&",
+        ast.BitXor: "^",
+        ast.BitOr: "|",
+        ast.Lt: "<",
+        ast.Gt: ">",
+        ast.LtE: "<=",
+        ast.GtE: ">=",
+        ast.Eq: "==",
+        ast.NotEq: "!="
+    }
+    
+    # Binding strength of the binary operators, which Python and Java order
+    # the same way. ** and // lower to calls, which bind tightest of all
+    _BINOP_PRECEDENCE = {
+        ast.BitOr: 1,
+        ast.BitXor: 2,
+        ast.BitAnd: 3,
+        ast.LShift: 4,
+        ast.RShift: 4,
+        ast.Add: 5,
+        ast.Sub: 5,
+        ast.Mult: 6,
+        ast.Div: 6,
+        ast.Mod: 6
+    }
+    
+    _BITWISE_OPS = (ast.LShift, ast.RShift, ast.BitAnd, ast.BitXor, ast.BitOr)
+    
+    # Methods that lower one-to-one: DSL name -> (Java call, argument count).
+    # A zero-argument entry is the complete call suffix.
+    _METHOD_HANDLERS = {
+        'set_position': ('setPosition', 1),
+        'set_target_position': ('setTargetPosition', 1),
+        'copy': ('copy', 1),
+        'get_distance': ('getDistance(DistanceUnit.CM)', 0),
+        'is_pressed': ('isPressed()', 0),
+        'get_current_position': ('getCurrentPosition()', 0),
+        'is_busy': ('isBusy()', 0),
+        'get_detections': ('getDetections()', 0),
+        'get_fresh_detections': ('getFreshDetections()', 0),
+        'get_recognitions': ('getRecognitions()', 0),
+        'get_fresh_recognitions': ('getFreshRecognitions()', 0)
+    }
+    
     def __init__(self):
-        self.java_code = []
+        # Output is built in named sections of (indent level, line) pairs;
+        # indentation is only applied when they are joined at the end
+        self._sections = {'header': [], 'fields': [], 'body': [], 'footer': []}
+        self._indent_cache = [""]
         self.imports = set()
         self.hardware_components = {}
+        self.state_fields = {}
+        self.class_constants = {}
+        self.lookup_types = {}
+        self.enum_fields = {}
         self.opmode_info = None
         self.class_name = ""
         self.indent_level = 0
+        self.helper_classes = {}
+        self.local_types = {}
+        self.declared_locals = set()
+        self.hoisted_locals = {}
+        self.inferred_returns = {}
+        self.methods = {}
+        self.rate_loops = 0
+        self.has_init_hardware = False
+        
+        self.hardware_types = HARDWARE_TYPES
+        self.motor_directions = MOTOR_DIRECTIONS
+        self.motor_modes = MOTOR_MODES
+        self.standard_imports = STANDARD_IMPORTS
+        
+        # Vision components are built in initHardware() rather than looked up
+        self.vision_types = {
+            'apriltag_processor': 'AprilTagProcessor',
+            'tensorflow_processor': 'TfodProcessor',
+            'vision_portal': 'VisionPortal'
+        }
+        
+        # apriltag_processor() config keys -> AprilTagProcessor.Builder setters
+        self.apriltag_builder_options = {
+            'tag_family': 'setTagFamily',
+            'tag_library': 'setTagLibrary',
+            'num_threads': 'setNumThreads',
+            'draw_axes': 'setDrawAxes',
+            'draw_cube_projection': 'setDrawCubeProjection',
+            'draw_tag_outline': 'setDrawTagOutline',
+            'draw_tag_id': 'setDrawTagID'
+        }
+        
+        # tensorflow_processor() config keys -> TfodProcessor.Builder setters
+        self.tensorflow_builder_options = {
+            'model_asset_name': 'setModelAssetName',
+            'model_file_name': 'setModelFileName',
+            'is_model_tensor_flow2': 'setIsModelTensorFlow2',
+            'is_model_quantized': 'setIsModelQuantized',
+            'input_size': 'setModelInputSize',
+            'model_aspect_ratio': 'setModelAspectRatio',
+            'max_num_detections': 'setMaxNumRecognitions',
+            'num_executor_threads': 'setNumExecutorThreads',
+            'num_detector_threads': 'setNumDetectorThreads'
+        }
+        
+        # vision_portal() config keys -> VisionPortal.Builder setters
+        self.vision_portal_options = {
+            'live_view': 'enableLiveView',
+            'auto_stop_live_view': 'setAutoStopLiveView'
+        }
+        
+        self.apriltag_tag_libraries = {
+            'CURRENT_GAME': 'AprilTagGameDatabase.getCurrentGameTagLibrary()',
+            'CENTER_STAGE': 'AprilTagGameDatabase.getCenterStageTagLibrary()'
+        }
+        
+        # math module functions -> java.lang.Math
+        self.math_functions = {
+            'remainder': 'Math.IEEEremainder',
+            'sqrt': 'Math.sqrt',
+            'hypot': 'Math.hypot',
+            'atan2': 'Math.atan2'
+        }
         
-        # FTC API mappings
-        self.hardware_types = {
-            'motor': 'DcMotor',
-            'servo': 'Servo',
-            'color_sensor': 'ColorSensor',
-            'distance_sensor': 'DistanceSensor',
-            'gyro': 'GyroSensor',
-            'touch_sensor': 'TouchSensor',
-            'light_sensor': 'LightSensor',
-            'imu': 'IMU'
+        # IMU angle readers -> YawPitchRollAngles getters
+        self.imu_angles = {
+            'get_heading': 'getYaw',
+            'get_pitch': 'getPitch',
+            'get_roll': 'getRoll'
         }
         
-        self.motor_directions = {
-            'forward': 'DcMotor.Direction.FORWARD',
-            'reverse': 'DcMotor.Direction.REVERSE'
+        # math module constants -> java.lang.Math
+        self.math_constants = {
+            'pi': 'Math.PI',
+            'e': 'Math.E'
         }
         
-        self.motor_modes = {
-            'run_using_encoder': 'DcMotor.RunMode.RUN_USING_ENCODER',
-            'run_without_encoder': 'DcMotor.RunMode.RUN_WITHOUT_ENCODER',
-            'run_to_position': 'DcMotor.RunMode.RUN_TO_POSITION',
-            'stop_and_reset_encoder': 'DcMotor.RunMode.STOP_AND_RESET_ENCODER'
+        # Java field types for constant-initialized state in init_hardware()
+        self.state_field_types = {
+            bool: 'boolean',
+            int: 'int',
+            float: 'double',
+            str: 'String'
         }
         
-        # Standard FTC imports
-        self.standard_imports = {
-            'com.qualcomm.robotcore.eventloop.opmode.LinearOpMode',
-            'com.qualcomm.robotcore.eventloop.opmode.TeleOp',
-            'com.qualcomm.robotcore.eventloop.opmode.Autonomous',
-            'com.qualcomm.robotcore.hardware.DcMotor',
-            'com.qualcomm.robotcore.hardware.Servo',
-            'com.qualcomm.robotcore.hardware.ColorSensor',
-            'com.qualcomm.robotcore.hardware.DistanceSensor',
-            'com.qualcomm.robotcore.hardware.TouchSensor',
-            'com.qualcomm.robotcore.hardware.LightSensor',
-            'com.qualcomm.robotcore.hardware.IMU',
-            'org.firstinspires.ftc.robotcore.external.navigation.DistanceUnit',
-            'org.firstinspires.ftc.robotcore.external.navigation.AngleUnit'
+        # DSL type annotations -> Java types; other names are used as written
+        self.annotation_types = {
+            'int': 'int',
+            'float': 'double',
+            'bool': 'boolean',
+            'str': 'String'
+        }
+        
+        # Boxed forms of the primitive types, for generic type arguments
+        self.boxed_types = {
+            'int': 'Integer',
+            'double': 'Double',
+            'boolean': 'Boolean'
+        }
+        
+        # Imports for the Java types annotations and inference can produce
+        self.type_imports = {
+            'List': 'java.util.List',
+            'Recognition': 'org.firstinspires.ftc.robotcore.external.tfod.Recognition',
+            'AprilTagDetection': 'org.firstinspires.ftc.vision.apriltag.AprilTagDetection',
+            'AprilTagPoseFtc': 'org.firstinspires.ftc.vision.apriltag.AprilTagPoseFtc'
+        }
+        
+        # Result types of the detection getters, which locals take on
+        self.method_return_types = {
+            'get_detections': 'List<AprilTagDetection>',
+            'get_fresh_detections': 'List<AprilTagDetection>',
+            'get_recognitions': 'List<Recognition>',
+            'get_fresh_recognitions': 'List<Recognition>'
+        }
+        
+        # Recognition fields -> (getter, Java type when not a number)
+        self.recognition_getters = {
+            'label': ('getLabel()', 'String'),
+            'confidence': ('getConfidence()', None),
+            'left': ('getLeft()', None),
+            'right': ('getRight()', None),
+            'top': ('getTop()', None),
+            'bottom': ('getBottom()', None)
+        }
+        
+        # AprilTagDetection fields -> (Java field, Java type when not a
+        # number); the AprilTagPoseFtc fields keep their names and are doubles
+        self.apriltag_fields = {
+            'id': ('id', 'int'),
+            'decision_margin': ('decisionMargin', None),
+            'ftc_pose': ('ftcPose', 'AprilTagPoseFtc')
+        }
+        
+        # Zero values for locals declared ahead of their first assignment
+        self.default_values = {
+            'double': '0.0',
+            'int': '0',
+            'boolean': 'false'
+        }
+        
+        self.vision_imports = {
+            'WebcamName': 'org.firstinspires.ftc.robotcore.external.hardware.camera.WebcamName',
+            'AprilTagProcessor': 'org.firstinspires.ftc.vision.apriltag.AprilTagProcessor',
+            'TfodProcessor': 'org.firstinspires.ftc.vision.tfod.TfodProcessor',
+            'VisionPortal': 'org.firstinspires.ftc.vision.VisionPortal'
+        }
+        
+        # Statement visitors keyed by node type, so visit() is one dict
+        # lookup rather than NodeVisitor's name formatting and getattr
+        self._dispatch = {
+            ast.ClassDef: self.visit_ClassDef,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Assign: self.visit_Assign,
+            ast.AnnAssign: self.visit_AnnAssign,
+            ast.AugAssign: self.visit_AugAssign,
+            ast.Expr: self.visit_Expr,
+            ast.If: self.visit_If,
+            ast.While: self.visit_While,
+            ast.For: self.visit_For,
+            ast.Return: self.visit_Return,
+            ast.Break: self.visit_Break,
+            ast.Continue: self.visit_Continue,
+            ast.With: self.visit_With
+        }
+        
+        # Expression lowerings keyed the same way for visit_expression()
+        self._expr_dispatch = {
+            ast.Constant: self._expr_const,
+            ast.Name: self._expr_name,
+            ast.Attribute: self._expr_attr,
+            ast.UnaryOp: self._expr_unary,
+            ast.BoolOp: self._expr_boolop,
+            ast.Compare: self._expr_compare,
+            ast.BinOp: self._expr_binop,
+            ast.Subscript: self._expr_subscript,
+            ast.Call: self.visit_call_expression
         }
 
-    def indent(self) -> str:
-        return "    " * self.indent_level
+    def visit(self, node: ast.AST):
+        return self._dispatch.get(type(node), self.generic_visit)(node)
 
-    def add_line(self, line: str):
-        self.java_code.append(self.indent() + line)
+    def indent(self, level: Optional[int] = None) -> str:
+        if level is None:
+            level = self.indent_level
+        cache = self._indent_cache
+        while len(cache) <= level:
+            cache.append(cache[-1] + "    ")
+        return cache[level]
+
+    def add_line(self, line: str, section: str = 'body'):
+        self._sections[section].append((self.indent_level, line))
 
     def visit_ClassDef(self, node: ast.ClassDef):
         self.class_name = node.name
@@ -118,45 +500,166 @@ class FTCTranspiler(ast.NodeVisitor):
 
         # Generate Java class header
         if self.opmode_info:
-            self.add_line(f"@{self.opmode_info.type.value}(name=\"{self.opmode_info.name}\", group=\"{self.opmode_info.group}\")")
+            self.add_line(f"@{self.opmode_info.type.value}(name=\"{self.opmode_info.name}\", group=\"{self.opmode_info.group}\")", 'header')
         
-        self.add_line(f"public class {self.class_name} extends LinearOpMode {{")
+        self.add_line(f"public class {self.class_name} extends LinearOpMode {{", 'header')
         self.indent_level += 1
         
-        # Add hardware component declarations
-        if self.hardware_components:
-            self.add_line("// Hardware components")
-            for comp_name, comp in self.hardware_components.items():
-                self.add_line(f"private {comp.type} {comp_name} = null;")
-            self.add_line("")
-        
-        # Process class body to find hardware components first
+        # One pass over the class body: scan init_hardware() for hardware,
+        # emit class-level constants ahead of the methods (they land in the
+        # body section, after the declarations) and keep the rest for later
+        body_items = []
         for item in node.body:
+            if isinstance(item, ast.Assign):
+                self.generate_class_constant(item)
+                continue
+            if isinstance(item, ast.FunctionDef) and item.name not in ('init_hardware', 'run', 'loop'):
+                # Only these become private methods that can be called
+                self.methods[item.name] = item
             if isinstance(item, ast.FunctionDef) and item.name == 'init_hardware':
+                self.has_init_hardware = True
                 self.scan_hardware_components(item)
+            body_items.append(item)
+        self.scan_enum_fields(node)
         
-        # Add hardware component declarations after scanning
+        # Add hardware component declarations
         if self.hardware_components:
-            self.java_code.insert(-1, self.indent() + "// Hardware components")
+            self.add_line("// Hardware components", 'fields')
             for comp_name, comp in self.hardware_components.items():
-                self.java_code.insert(-1, self.indent() + f"private {comp.type} {comp_name} = null;")
-            self.java_code.insert(-1, self.indent() + "")
+                self.add_line(_FIELD_TPL % (comp.type, comp_name), 'fields')
+                if comp.type == 'DcMotor':
+                    self.add_line(_CACHE_FIELD_TPL % comp_name, 'fields')
+            self.add_line("", 'fields')
+        
+        if self.state_fields:
+            self.add_line("// Robot state", 'fields')
+            for field_name, field_type in self.state_fields.items():
+                self.add_line(_STATE_FIELD_TPL % (field_type, field_name), 'fields')
+            self.add_line("", 'fields')
         
         # Process class body
-        for item in node.body:
+        for item in body_items:
             self.visit(item)
         
+        # Every OpMode needs runOpMode(), even with nothing to run
+        if not any(isinstance(item, ast.FunctionDef) and item.name == 'run' for item in body_items):
+            self.generate_run_opmode(ast.FunctionDef(name='run', args=ast.arguments(), body=[]))
+        
+        # Emit helper classes requested by builtins used in the body
+        for helper_lines in self.helper_classes.values():
+            for line in helper_lines:
+                self.add_line(line)
+        
         self.indent_level -= 1
-        self.add_line("}")
+        self.add_line("}", 'footer')
+
+    def generate_class_constant(self, node: ast.Assign):
+        """Emit a class-level literal as a static constant or a switch lookup"""
+        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+            return
+        
+        name = node.targets[0].id
+        if isinstance(node.value, ast.Constant):
+            java_type = self.state_field_types.get(type(node.value.value))
+            if java_type:
+                self.class_constants[name] = java_type
+                self.add_line(f"private static final {java_type} {name} = {self.visit_expression(node.value)};")
+                self.add_line("")
+        
+        elif isinstance(node.value, ast.BinOp):
+            # Arithmetic on literals is computed once, typed from its operands;
+            # an expression with no Java type is left out like other literals
+            java_type = self.constant_type(node.value)
+            if java_type:
+                self.class_constants[name] = java_type
+                self.add_line(f"private static final {java_type} {name} = {self.visit_expression(node.value)};")
+                self.add_line("")
+        
+        elif isinstance(node.value, ast.Dict):
+            # A literal lookup table lowers to a static switch, so a lookup
+            # costs no map allocation or hashing at runtime
+            entries = [(key, value) for key, value in zip(node.value.keys, node.value.values)
+                       if isinstance(key, ast.Constant) and isinstance(value, ast.Constant)]
+            key_types = {self.state_field_types.get(type(key.value)) for key, _ in entries}
+            value_types = {self.state_field_types.get(type(value.value)) for _, value in entries}
+            key_type = 'int' if key_types == {'int'} else 'String'
+            if value_types == {'int'} or value_types == {'String'}:
+                java_type = value_types.pop()
+            else:
+                java_type = 'double'
+            self.class_constants[name] = 'lookup'
+            self.lookup_types[name] = java_type
+            
+            self.add_line(f"private static {java_type} get_{name.lower()}({key_type} key, {java_type} fallback) {{")
+            self.indent_level += 1
+            self.add_line("switch (key) {")
+            self.indent_level += 1
+            for key, value in entries:
+                self.add_line(f"case {self.visit_expression(key)}: return {self.visit_expression(value)};")
+            self.add_line("default: return fallback;")
+            self.indent_level -= 1
+            self.add_line("}")
+            self.indent_level -= 1
+            self.add_line("}")
+            self.add_line("")
+
+    def constant_type(self, node: ast.expr) -> Optional[str]:
+        """Java type of an expression on literals and class constants, if it has one"""
+        if isinstance(node, ast.Constant):
+            return None if isinstance(node.value, bool) else self.state_field_types.get(type(node.value))
+        if isinstance(node, ast.Name):
+            java_type = self.class_constants.get(node.id)
+            return None if java_type == 'lookup' else java_type
+        if isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id == 'math' and node.attr in self.math_constants:
+                return 'double'
+            return None
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = self.constant_type(node.operand)
+            return operand if operand in ('int', 'double') else None
+        if not isinstance(node, ast.BinOp):
+            return None
+        
+        types = {self.constant_type(node.left), self.constant_type(node.right)}
+        if 'String' in types:
+            # Only + is defined on strings
+            return 'String' if isinstance(node.op, ast.Add) else None
+        if not types <= {'int', 'double'}:
+            return None
+        if isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Pow)) or 'double' in types:
+            # True division and the Math calls ** and // lower to are
+            # double, and Java has no bitwise operators on doubles
+            return None if isinstance(node.op, self._BITWISE_OPS) else 'double'
+        return 'int'
 
     def scan_hardware_components(self, node: ast.FunctionDef):
         """Pre-scan to identify hardware components for declaration"""
+        # Exact type checks: AST node classes are never subclassed here
         for stmt in node.body:
-            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
-                if isinstance(stmt.targets[0], ast.Attribute):
+            if type(stmt) is ast.AnnAssign:
+                # An annotated field takes its declared type, whatever it
+                # starts out as
+                name = self.self_attr_name(stmt.target)
+                if name:
+                    self.state_fields[name] = self.use_type(self.annotation_type(stmt.annotation))
+            
+            elif type(stmt) is ast.Assign and len(stmt.targets) == 1:
+                if type(stmt.targets[0]) is ast.Attribute:
                     attr = stmt.targets[0]
-                    if isinstance(attr.value, ast.Name) and attr.value.id == 'self':
-                        if isinstance(stmt.value, ast.Call) and isinstance(stmt.value.func, ast.Name):
+                    if type(attr.value) is ast.Name and attr.value.id == 'self':
+                        if attr.attr in self.state_fields:
+                            continue
+                        
+                        if type(stmt.value) is ast.Constant:
+                            field_type = self.state_field_types.get(type(stmt.value.value))
+                            if stmt.value.value is None:
+                                # Nothing to infer from; annotate the field
+                                # to give it a usable type
+                                field_type = 'Object'
+                            if field_type and attr.attr not in self.hardware_components:
+                                self.state_fields[attr.attr] = field_type
+                        
+                        elif type(stmt.value) is ast.Call and type(stmt.value.func) is ast.Name:
                             func_name = stmt.value.func.id
                             if func_name in self.hardware_types:
                                 config_name = self.get_string_arg(stmt.value, 0, attr.attr)
@@ -169,8 +672,229 @@ class FTCTranspiler(ast.NodeVisitor):
                                     direction=direction
                                 )
                                 self.hardware_components[attr.attr] = comp
+                            elif func_name in self.vision_types:
+                                comp = HardwareComponent(
+                                    name=attr.attr,
+                                    type=self.vision_types[func_name],
+                                    config_name=attr.attr
+                                )
+                                self.hardware_components[attr.attr] = comp
+                            elif func_name == 'gamepad_snapshot':
+                                comp = HardwareComponent(
+                                    name=attr.attr,
+                                    type='Gamepad',
+                                    config_name=attr.attr
+                                )
+                                self.hardware_components[attr.attr] = comp
+                                self.imports.add('com.qualcomm.robotcore.hardware.Gamepad')
+                            else:
+                                continue
+                            
+                            if comp.type in self.vision_imports:
+                                self.imports.add(self.vision_imports[comp.type])
+                            elif comp.type == 'DcMotor':
+                                self.helper_classes['PowerCache'] = POWER_CACHE_HELPER
+
+    def scan_enum_fields(self, node: ast.ClassDef):
+        """Promote String state fields that only ever hold literals to enums"""
+        values = {name: [] for name, field_type in self.state_fields.items() if field_type == 'String'}
+        rejected = set()
+        
+        def record(name, value_node):
+            if (isinstance(value_node, ast.Constant) and isinstance(value_node.value, str)
+                    and value_node.value.isidentifier()):
+                if value_node.value not in values[name]:
+                    values[name].append(value_node.value)
+            else:
+                rejected.add(name)
+        
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Assign):
+                for target in sub.targets:
+                    name = self.self_attr_name(target)
+                    if name in values:
+                        record(name, sub.value)
+            elif isinstance(sub, ast.AugAssign):
+                name = self.self_attr_name(sub.target)
+                if name in values:
+                    rejected.add(name)
+            elif isinstance(sub, ast.Compare) and len(sub.ops) == 1:
+                for field, other in ((sub.left, sub.comparators[0]), (sub.comparators[0], sub.left)):
+                    name = self.self_attr_name(field)
+                    if name in values:
+                        record(name, other)
+        
+        for name, literals in values.items():
+            if name not in rejected and literals:
+                enum_name = "".join(part.capitalize() for part in name.split('_'))
+                self.enum_fields[name] = enum_name
+                self.state_fields[name] = enum_name
+                self.helper_classes[enum_name] = [f"private enum {enum_name} {{ {', '.join(literals)} }}"]
+
+    def self_attr_name(self, node) -> Optional[str]:
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'self':
+            return node.attr
+        return None
+
+    def annotation_type(self, node: ast.expr) -> str:
+        """Map a DSL type annotation to a Java type"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return self.annotation_types.get(node.value, node.value)
+        if isinstance(node, ast.Name):
+            return self.annotation_types.get(node.id, node.id)
+        if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name)
+                and node.value.id in ('list', 'List')):
+            element = self.annotation_type(node.slice)
+            return f"List<{self.boxed_types.get(element, element)}>"
+        return 'Object'
+
+    def use_type(self, java_type: str) -> str:
+        """Import the classes a Java type names and return it"""
+        for name in re.findall(r'\w+', java_type):
+            if name in self.type_imports:
+                self.imports.add(self.type_imports[name])
+        return java_type
+
+    def infer_type(self, node: ast.expr) -> Optional[str]:
+        """Java type of a non-numeric expression, or None when it is not known"""
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool):
+                return 'boolean'
+            if isinstance(node.value, str):
+                return 'String'
+        elif isinstance(node, (ast.Compare, ast.BoolOp)):
+            return 'boolean'
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return 'boolean'
+        elif isinstance(node, ast.Name):
+            return self.local_types.get(node.id)
+        elif isinstance(node, ast.Attribute):
+            name = self.self_attr_name(node)
+            if name in self.state_fields:
+                return self.state_fields[name]
+            if name in self.hardware_components:
+                return self.hardware_components[name].type
+            value_type = self.infer_type(node.value)
+            if node.attr in self.recognition_getters and value_type == 'Recognition':
+                return self.recognition_getters[node.attr][1]
+            if node.attr in self.apriltag_fields and value_type == 'AprilTagDetection':
+                return self.apriltag_fields[node.attr][1]
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            method = self.methods.get(self.self_attr_name(node.func))
+            if method is not None:
+                return_type = self.method_return_type(method)
+                return self.use_type(return_type) if return_type else None
+            if node.func.attr == 'get':
+                # A lookup table's get_<name>() returns its value type
+                table = self.self_attr_name(node.func.value) or getattr(node.func.value, 'id', None)
+                if table in self.lookup_types:
+                    return self.lookup_types[table]
+            return self.method_return_types.get(node.func.attr)
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            if 'String' in (self.infer_type(node.left), self.infer_type(node.right)):
+                return 'String'
+        elif isinstance(node, ast.Subscript):
+            list_type = self.infer_type(node.value) or ''
+            if list_type.startswith('List<'):
+                return list_type[5:-1]
+        return None
+
+    def method_return_type(self, node: ast.FunctionDef) -> Optional[str]:
+        """Java return type of a class method, or None when it returns nothing.
+        
+        An unannotated method returns the type of what it returns, found by
+        typing its locals the way lowering its body does. Call sites can come
+        before the method itself, so the result is cached per method.
+        """
+        if node.returns is not None:
+            return self.annotation_type(node.returns)
+        if node.name in self.inferred_returns:
+            return self.inferred_returns[node.name]
+        
+        # A recursive call says nothing about the type
+        self.inferred_returns[node.name] = None
+        caller_types = self.local_types
+        self.local_types = {arg.arg: self.annotation_type(arg.annotation)
+                            for arg in node.args.args if arg.annotation is not None}
+        returns = []
+        
+        def scan(stmts):
+            for stmt in stmts:
+                if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+                    self.local_types[stmt.target.id] = self.annotation_type(stmt.annotation)
+                elif (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                        and isinstance(stmt.targets[0], ast.Name)):
+                    self.local_types.setdefault(stmt.targets[0].id, self.infer_type(stmt.value) or 'double')
+                elif isinstance(stmt, ast.For) and isinstance(stmt.target, ast.Name):
+                    iterable = stmt.iter
+                    if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and iterable.func.id == 'range':
+                        self.local_types[stmt.target.id] = 'int'
+                    else:
+                        list_type = self.infer_type(iterable) or ''
+                        self.local_types[stmt.target.id] = list_type[5:-1] if list_type.startswith('List<') else 'double'
+                elif isinstance(stmt, ast.Return) and stmt.value is not None:
+                    # None says nothing about the type; unknown values are numbers
+                    if not (isinstance(stmt.value, ast.Constant) and stmt.value.value is None):
+                        returns.append(self.infer_type(stmt.value) or 'double')
+                    else:
+                        returns.append(None)
+                for field in ('body', 'orelse'):
+                    scan(getattr(stmt, field, ()))
+        
+        scan(node.body)
+        self.local_types = caller_types
+        
+        return_type = next((t for t in returns if t), 'Object') if returns else None
+        self.inferred_returns[node.name] = return_type
+        return return_type
+
+    def plan_locals(self, node: ast.FunctionDef):
+        """Find the locals that must be declared before their first assignment.
+        
+        Java scopes a local to the block it is declared in, so a local is
+        declared at its first assignment only when that assignment is a
+        direct statement of the innermost block using it. Otherwise it is
+        declared at the top of that block, keyed by the block's list id.
+        """
+        uses = {}
+        first = {}
+        
+        def scan(path, stmts):
+            for stmt in stmts:
+                if isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+                    for target in getattr(stmt, 'targets', None) or [stmt.target]:
+                        if isinstance(target, ast.Name) and target.id not in first:
+                            first[target.id] = path
+                for field, value in ast.iter_fields(stmt):
+                    if field == 'orelse' and len(value) == 1 and isinstance(value[0], ast.If):
+                        # An elif is lowered in its parent's block
+                        scan(path, value)
+                        continue
+                    if field in ('body', 'orelse'):
+                        scan(path + (id(value),), value)
+                        continue
+                    for child in value if isinstance(value, list) else [value]:
+                        if isinstance(child, ast.AST):
+                            for sub in ast.walk(child):
+                                if isinstance(sub, ast.Name):
+                                    uses.setdefault(sub.id, []).append(path)
+        
+        scan((id(node.body),), node.body)
+        
+        hoisted = {}
+        for name, path in first.items():
+            scope = path
+            for use in uses[name]:
+                while use[:len(scope)] != scope:
+                    scope = scope[:-1]
+            if scope != path:
+                hoisted.setdefault(scope[-1], []).append(name)
+        return hoisted
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.local_types = {}
+        self.declared_locals = {arg.arg for arg in node.args.args}
+        self.hoisted_locals = self.plan_locals(node)
         if node.name == 'init_hardware':
             self.generate_init_hardware(node)
         elif node.name == 'run':
@@ -184,8 +908,7 @@ class FTCTranspiler(ast.NodeVisitor):
         self.add_line("private void initHardware() {")
         self.indent_level += 1
         
-        for stmt in node.body:
-            self.visit(stmt)
+        self.visit_body(node.body)
         
         self.indent_level -= 1
         self.add_line("}")
@@ -197,16 +920,16 @@ class FTCTranspiler(ast.NodeVisitor):
         self.indent_level += 1
         
         # Add standard initialization
-        self.add_line("initHardware();")
-        self.add_line("")
+        if self.has_init_hardware:
+            self.add_line("initHardware();")
+            self.add_line("")
         self.add_line("telemetry.addData(\"Status\", \"Initialized\");")
         self.add_line("telemetry.update();")
         self.add_line("")
         self.add_line("waitForStart();")
         self.add_line("")
         
-        for stmt in node.body:
-            self.visit(stmt)
+        self.visit_body(node.body)
         
         self.indent_level -= 1
         self.add_line("}")
@@ -215,34 +938,85 @@ class FTCTranspiler(ast.NodeVisitor):
         self.add_line("while (opModeIsActive()) {")
         self.indent_level += 1
         
-        for stmt in node.body:
-            self.visit(stmt)
+        self.visit_body(node.body)
         
         self.add_line("telemetry.update();")
         self.indent_level -= 1
         self.add_line("}")
 
     def generate_regular_method(self, node: ast.FunctionDef):
-        # Determine return type (simplified)
-        return_type = "void"  # Default
+        # Annotations give the return and parameter types; unannotated
+        # parameters are doubles, and an unannotated method returns the
+        # type of what it returns
+        return_type = self.use_type(self.method_return_type(node) or "void")
         
-        # Check for parameters
         params = []
         for arg in node.args.args:
             if arg.arg != 'self':
-                params.append(f"double {arg.arg}")
+                param_type = "double"
+                if arg.annotation is not None:
+                    param_type = self.use_type(self.annotation_type(arg.annotation))
+                    self.local_types[arg.arg] = param_type
+                params.append(f"{param_type} {arg.arg}")
         
         param_str = ", ".join(params)
         self.add_line(f"private {return_type} {node.name}({param_str}) {{")
         self.indent_level += 1
         
-        for stmt in node.body:
-            self.visit(stmt)
+        self.visit_body(node.body)
         
         self.indent_level -= 1
         self.add_line("}")
         self.add_line("")
 
+    def visit_body(self, stmts: List[ast.stmt]):
+        """Visit a block, coalescing consecutive telemetry_add() calls into one chain"""
+        hoisted = self.hoisted_locals.get(id(stmts), ())
+        self.declared_locals.update(hoisted)
+        body = self._sections['body']
+        start = len(body)
+        
+        i = 0
+        while i < len(stmts):
+            j = i
+            while j < len(stmts) and self.is_telemetry_add(stmts[j]):
+                j += 1
+            
+            if j - i >= 2:
+                self.emit_telemetry_chain(stmts[i:j])
+                i = j
+            else:
+                self.visit(stmts[i])
+                i += 1
+        
+        # The block's types are known now that it has been lowered
+        body[start:start] = [(self.indent_level, self.local_declaration(name)) for name in hoisted]
+
+    def local_declaration(self, name: str) -> str:
+        java_type = self.local_types.get(name, 'double')
+        return f"{java_type} {name} = {self.default_values.get(java_type, 'null')};"
+
+    def is_telemetry_add(self, stmt: ast.stmt) -> bool:
+        return (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call) and
+                isinstance(stmt.value.func, ast.Name) and
+                stmt.value.func.id == 'telemetry_add' and len(stmt.value.args) >= 2)
+
+    def emit_telemetry_chain(self, stmts: List[ast.Expr]):
+        # Item.addData() appends the next item after the receiver, so the
+        # chain keeps one caption per line on the Driver Station
+        items = []
+        for stmt in stmts:
+            key = self.visit_expression(stmt.value.args[0])
+            value = self.visit_expression(stmt.value.args[1])
+            items.append(f"addData({key}, {value})")
+        
+        self.add_line(f"telemetry.{items[0]}")
+        self.indent_level += 2
+        for item in items[1:-1]:
+            self.add_line(f".{item}")
+        self.add_line(f".{items[-1]};")
+        self.indent_level -= 2
+
     def visit_Assign(self, node: ast.Assign):
         if len(node.targets) == 1 and isinstance(node.targets[0], ast.Attribute):
             attr = node.targets[0]
@@ -254,11 +1028,31 @@ class FTCTranspiler(ast.NodeVisitor):
                         config_name = self.get_string_arg(node.value, 0, attr.attr)
                         direction = self.get_string_arg(node.value, 1, None)
                         
-                        self.add_line(f"{attr.attr} = hardwareMap.get({self.hardware_types[func_name]}.class, \"{config_name}\");")
+                        self.add_line(_HARDWARE_MAP_TPL % (attr.attr, self.hardware_types[func_name], config_name))
                         
                         if direction and func_name == 'motor':
                             java_direction = self.motor_directions.get(direction, direction)
-                            self.add_line(f"{attr.attr}.setDirection({java_direction});")
+                            self.add_line(_DIRECTION_TPL % (attr.attr, java_direction))
+                        
+                        if self.is_cached_motor(attr.attr):
+                            self.add_line(_CACHE_INIT_TPL % (attr.attr, attr.attr))
+                    
+                    elif func_name in self.vision_types:
+                        self.generate_vision_component(attr.attr, func_name, node.value)
+                    
+                    elif func_name == 'gamepad_snapshot':
+                        self.add_line(f"{attr.attr} = new Gamepad();")
+                    
+                    else:
+                        # Other builtins, such as runtime_ms() or abs(), are
+                        # plain values; one with no lowering stays visible
+                        # as a comment rather than breaking the class
+                        value = self.visit_expression(node.value)
+                        prefix = "// " if value.startswith("/*") else ""
+                        self.add_line(f"{prefix}{attr.attr} = {value};")
+                
+                elif attr.attr in self.enum_fields and isinstance(node.value, ast.Constant):
+                    self.add_line(f"{attr.attr} = {self.enum_fields[attr.attr]}.{node.value.value};")
                 
                 else:
                     # Regular attribute assignment
@@ -266,42 +1060,263 @@ class FTCTranspiler(ast.NodeVisitor):
                     self.add_line(f"{attr.attr} = {value};")
         
         elif len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
-            # Local variable assignment
+            # Local variable assignment; numbers stay double so that / keeps
+            # Python's true division
             var_name = node.targets[0].id
             value = self.visit_expression(node.value)
-            self.add_line(f"double {var_name} = {value};")
+            if var_name in self.declared_locals:
+                self.local_types.setdefault(var_name, self.use_type(self.infer_type(node.value) or 'double'))
+                self.add_line(f"{var_name} = {value};")
+                return
+            
+            java_type = self.local_types.get(var_name) or self.infer_type(node.value) or 'double'
+            self.local_types[var_name] = self.use_type(java_type)
+            self.declared_locals.add(var_name)
+            self.add_line(f"{java_type} {var_name} = {value};")
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if isinstance(node.target, ast.Name):
+            self.local_types[node.target.id] = self.use_type(self.annotation_type(node.annotation))
+        if node.value is not None:
+            self.visit_Assign(ast.Assign(targets=[node.target], value=node.value))
+
+    def visit_AugAssign(self, node: ast.AugAssign):
+        if type(node.op) in self._BINOP_MAP:
+            target = self.visit_expression(node.target)
+            self.add_line(f"{target} {self.convert_binary_op(node.op)}= {self.visit_expression(node.value)};")
+        else:
+            # No Java compound form; spell out the binary operation
+            value = ast.BinOp(left=node.target, op=node.op, right=node.value)
+            self.visit_Assign(ast.Assign(targets=[node.target], value=value))
+
+    def generate_vision_component(self, name: str, func_name: str, call: ast.Call):
+        if func_name == 'apriltag_processor':
+            config = self.get_dict_arg(call, 0)
+            setters = []
+            for key, value in config.items():
+                if key == 'tag_family' and isinstance(value, ast.Constant):
+                    setters.append(f".setTagFamily(AprilTagProcessor.TagFamily.{value.value})")
+                elif key == 'tag_library' and isinstance(value, ast.Constant):
+                    library = self.apriltag_tag_libraries.get(value.value, value.value)
+                    self.imports.add('org.firstinspires.ftc.vision.apriltag.AprilTagGameDatabase')
+                    setters.append(f".setTagLibrary({library})")
+                elif key in self.apriltag_builder_options:
+                    setters.append(f".{self.apriltag_builder_options[key]}({self.visit_expression(value)})")
+            
+            self.add_line(f"{name} = new AprilTagProcessor.Builder()")
+            self.indent_level += 2
+            for setter in setters:
+                self.add_line(setter)
+            self.add_line(".build();")
+            self.indent_level -= 2
+            
+            # Decimation is a live processor setting, not a builder option
+            if 'decimation' in config:
+                self.add_line(f"{name}.setDecimation({self.visit_expression(config['decimation'])});")
+        
+        elif func_name == 'tensorflow_processor':
+            config = self.get_dict_arg(call, 0)
+            if not config:
+                self.add_line(f"{name} = TfodProcessor.easyCreateWithDefaults();")
+                return
+            
+            setters = []
+            for key, value in config.items():
+                if key == 'model_labels' and isinstance(value, (ast.List, ast.Tuple)):
+                    labels = ", ".join(self.visit_expression(elt) for elt in value.elts)
+                    setters.append(f".setModelLabels(new String[] {{{labels}}})")
+                elif key == 'precision' and isinstance(value, ast.Constant) and value.value in ('int8', 'fp16', 'fp32'):
+                    # Only int8 models take quantized (uint8) input tensors
+                    quantized = 'true' if value.value == 'int8' else 'false'
+                    setters.append(f".setIsModelQuantized({quantized})")
+                elif key in self.tensorflow_builder_options:
+                    setters.append(f".{self.tensorflow_builder_options[key]}({self.visit_expression(value)})")
+            
+            self.add_line(f"{name} = new TfodProcessor.Builder()")
+            self.indent_level += 2
+            for setter in setters:
+                self.add_line(setter)
+            self.add_line(".build();")
+            self.indent_level -= 2
+            
+            # The confidence threshold is a live processor setting
+            if 'confidence_threshold' in config:
+                threshold = self.visit_expression(config['confidence_threshold'])
+                self.add_line(f"{name}.setMinResultConfidence((float) {threshold});")
+        
+        elif func_name == 'vision_portal':
+            camera = self.visit_expression(call.args[0]) if len(call.args) > 0 else "/* CAMERA */"
+            processors = [arg for arg in call.args[1:] if not isinstance(arg, ast.Dict)]
+            config = self.get_dict_arg(call, len(call.args) - 1)
+            
+            self.add_line(f"{name} = new VisionPortal.Builder()")
+            self.indent_level += 2
+            self.add_line(f".setCamera({camera})")
+            for processor in processors:
+                self.add_line(f".addProcessor({self.visit_expression(processor)})")
+            for key, value in config.items():
+                if key == 'stream_format' and isinstance(value, ast.Constant):
+                    self.add_line(f".setStreamFormat(VisionPortal.StreamFormat.{value.value})")
+                elif key == 'camera_resolution' and isinstance(value, (ast.List, ast.Tuple)) and len(value.elts) == 2:
+                    width, height = (self.visit_expression(elt) for elt in value.elts)
+                    self.imports.add('android.util.Size')
+                    self.add_line(f".setCameraResolution(new Size({width}, {height}))")
+                elif key in self.vision_portal_options:
+                    self.add_line(f".{self.vision_portal_options[key]}({self.visit_expression(value)})")
+            self.add_line(".build();")
+            self.indent_level -= 2
 
     def visit_expression(self, node) -> str:
-        if isinstance(node, ast.Constant):
-            if isinstance(node.value, str):
-                return f'"{node.value}"'
-            return str(node.value)
+        return self._expr_dispatch.get(type(node), self._expr_unknown)(node)
+
+    def _expr_const(self, node: ast.Constant) -> str:
+        if isinstance(node.value, str):
+            return f'"{node.value}"'
+        if isinstance(node.value, bool):
+            return "true" if node.value else "false"
+        if node.value is None:
+            return "null"
+        return str(node.value)
+
+    def _expr_name(self, node: ast.Name) -> str:
+        return node.id
+
+    def _expr_attr(self, node: ast.Attribute) -> str:
+        value_type = self.infer_type(node.value)
+        if node.attr in self.recognition_getters and value_type == 'Recognition':
+            return f"{self.visit_expression(node.value)}.{self.recognition_getters[node.attr][0]}"
+        if node.attr in self.apriltag_fields and value_type == 'AprilTagDetection':
+            return f"{self.visit_expression(node.value)}.{self.apriltag_fields[node.attr][0]}"
+        if value_type == 'AprilTagPoseFtc':
+            return f"{self.visit_expression(node.value)}.{node.attr}"
         
-        elif isinstance(node, ast.Name):
-            return node.id
+        if isinstance(node.value, ast.Name):
+            if node.value.id == 'self':
+                return node.attr
+            elif node.value.id == 'gamepad1':
+                return f"gamepad1.{self.convert_gamepad_attr(node.attr)}"
+            elif node.value.id == 'gamepad2':
+                return f"gamepad2.{self.convert_gamepad_attr(node.attr)}"
+            elif node.value.id == 'math' and node.attr in self.math_constants:
+                return self.math_constants[node.attr]
+            else:
+                return f"{node.value.id}.{node.attr}"
         
-        elif isinstance(node, ast.Attribute):
-            if isinstance(node.value, ast.Name):
-                if node.value.id == 'gamepad1':
-                    return f"gamepad1.{self.convert_gamepad_attr(node.attr)}"
-                elif node.value.id == 'gamepad2':
-                    return f"gamepad2.{self.convert_gamepad_attr(node.attr)}"
-                else:
-                    return f"{node.value.id}.{node.attr}"
+        elif self.is_gamepad_snapshot(node.value):
+            return f"{node.value.attr}.{self.convert_gamepad_attr(node.attr)}"
         
-        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return self._expr_unknown(node)
+
+    def _expr_unary(self, node: ast.UnaryOp) -> str:
+        if isinstance(node.op, ast.USub):
             operand = self.visit_expression(node.operand)
             return f"-{operand}"
         
-        elif isinstance(node, ast.BinOp):
-            left = self.visit_expression(node.left)
-            right = self.visit_expression(node.right)
-            op = self.convert_binary_op(node.op)
-            return f"{left} {op} {right}"
+        elif isinstance(node.op, ast.Not):
+            operand = self.visit_expression(node.operand)
+            if isinstance(node.operand, (ast.BoolOp, ast.Compare, ast.BinOp)):
+                operand = f"({operand})"
+            return f"!{operand}"
+        
+        return self._expr_unknown(node)
+
+    def _expr_boolop(self, node: ast.BoolOp) -> str:
+        op = " && " if isinstance(node.op, ast.And) else " || "
+        values = []
+        for value in node.values:
+            java_value = self.visit_expression(value)
+            if isinstance(value, ast.BoolOp):
+                java_value = f"({java_value})"
+            values.append(java_value)
+        return op.join(values)
+
+    def _expr_compare(self, node: ast.Compare) -> str:
+        # a < b < c lowers to a < b && b < c
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            left_str = self.comparison_operand(left)
+            right_str = self.comparison_operand(right)
+            literal = self.string_literal_operand(left, right)
+            if literal is not None and isinstance(op, (ast.Eq, ast.NotEq)):
+                field, value = literal
+                negate = "!" if isinstance(op, ast.NotEq) else ""
+                if field in self.enum_fields:
+                    # Enum constants compare by identity
+                    parts.append(f"{field} {self.convert_binary_op(op)} {self.enum_fields[field]}.{value}")
+                else:
+                    parts.append(f'{negate}"{value}".equals({field})')
+            elif (isinstance(op, (ast.Eq, ast.NotEq)) and
+                    self.infer_type(left) == 'String' and self.infer_type(right) == 'String'):
+                negate = "!" if isinstance(op, ast.NotEq) else ""
+                parts.append(f"{negate}{left_str}.equals({right_str})")
+            elif isinstance(op, ast.Is):
+                parts.append(f"{left_str} == {right_str}")
+            elif isinstance(op, ast.IsNot):
+                parts.append(f"{left_str} != {right_str}")
+            else:
+                parts.append(f"{left_str} {self.convert_binary_op(op)} {right_str}")
+            left = right
+        return " && ".join(parts)
+
+    def comparison_operand(self, node: ast.expr) -> str:
+        # Java's comparisons bind tighter than its bitwise operators, the
+        # reverse of Python, so a bitwise operand keeps its grouping
+        java = self.visit_expression(node)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitXor, ast.BitOr)):
+            return f"({java})"
+        return java
+
+    def _expr_binop(self, node: ast.BinOp) -> str:
+        left = self.visit_expression(node.left)
+        right = self.visit_expression(node.right)
+        
+        # Java has no power or floor-division operator
+        if isinstance(node.op, ast.Pow):
+            return f"Math.pow({left}, {right})"
+        if isinstance(node.op, ast.FloorDiv):
+            return f"Math.floor((double) {self.parenthesize(node.left, left)} / {self.parenthesize(node.right, right)})"
+        
+        op = self.convert_binary_op(node.op)
         
-        elif isinstance(node, ast.Call):
-            return self.visit_call_expression(node)
+        # Keep the Python grouping: a looser operand on the left, or a
+        # looser-or-equal one on the right, needs parentheses
+        precedence = self.binop_precedence(node.op)
+        if isinstance(node.left, ast.BinOp) and self.binop_precedence(node.left.op) < precedence:
+            left = f"({left})"
+        if isinstance(node.right, ast.BinOp) and self.binop_precedence(node.right.op) <= precedence:
+            right = f"({right})"
+        
+        if (isinstance(node.op, ast.Div) and
+                self.constant_type(node.left) == 'int' and self.constant_type(node.right) == 'int'):
+            # Keep Python's true division of two ints
+            left = f"(double) {left}"
+        return f"{left} {op} {right}"
+
+    def parenthesize(self, node: ast.expr, java: str) -> str:
+        """Wrap an operand unless it is a single term"""
+        if isinstance(node, (ast.Name, ast.Attribute, ast.Call)):
+            return java
+        if isinstance(node, ast.Constant) and not (isinstance(node.value, (int, float)) and node.value < 0):
+            return java
+        return f"({java})"
+
+    def _expr_subscript(self, node: ast.Subscript) -> str:
+        # Only lists index in Java; List.get() takes the index as an int
+        if not (self.infer_type(node.value) or '').startswith('List<'):
+            return self._expr_unknown(node)
         
+        value = self.visit_expression(node.value)
+        index = node.slice
+        if (isinstance(index, ast.UnaryOp) and isinstance(index.op, ast.USub)
+                and isinstance(index.operand, ast.Constant) and type(index.operand.value) is int):
+            # A negative literal counts from the end, as in Python
+            return f"{value}.get({value}.size() - {index.operand.value})"
+        if (isinstance(index, ast.Constant) and type(index.value) is int) or self.infer_type(index) == 'int':
+            return f"{value}.get({self.visit_expression(index)})"
+        return f"{value}.get((int) {self.parenthesize(index, self.visit_expression(index))})"
+
+    def _expr_unknown(self, node) -> str:
         return "/* UNKNOWN EXPRESSION */"
 
     def visit_call_expression(self, node: ast.Call) -> str:
@@ -309,27 +1324,38 @@ class FTCTranspiler(ast.NodeVisitor):
             obj = self.visit_expression(node.func.value)
             method = node.func.attr
             
+            if obj == 'math' and method in self.math_functions:
+                args = ", ".join(self.visit_expression(arg) for arg in node.args)
+                return f"{self.math_functions[method]}({args})"
+            
+            if self.self_attr_name(node.func) in self.methods:
+                args = ", ".join(self.visit_expression(arg) for arg in node.args)
+                return f"{method}({args})"
+            
+            if method == 'get' and self.class_constants.get(obj) == 'lookup' and len(node.args) == 2:
+                key, fallback = (self.visit_expression(arg) for arg in node.args)
+                return f"get_{obj.lower()}({key}, {fallback})"
+            
             # Convert Python method names to Java equivalents
             if method == 'set_power':
                 arg = self.visit_expression(node.args[0])
+                if self.is_cached_motor(obj):
+                    return f"{obj}_cache.setPower({arg})"
                 return f"{obj}.setPower({arg})"
-            elif method == 'set_position':
-                arg = self.visit_expression(node.args[0])
-                return f"{obj}.setPosition({arg})"
-            elif method == 'get_distance':
-                return f"{obj}.getDistance(DistanceUnit.CM)"
-            elif method == 'is_pressed':
-                return f"{obj}.isPressed()"
-            elif method == 'get_current_position':
-                return f"{obj}.getCurrentPosition()"
-            elif method == 'set_target_position':
-                arg = self.visit_expression(node.args[0])
-                return f"{obj}.setTargetPosition({arg})"
+            elif method in self._METHOD_HANDLERS:
+                java_method, arity = self._METHOD_HANDLERS[method]
+                if arity == 0:
+                    return f"{obj}.{java_method}"
+                return f"{obj}.{java_method}({self.visit_expression(node.args[0])})"
+            elif method in self.imu_angles:
+                return f"{obj}.getRobotYawPitchRollAngles().{self.imu_angles[method]}(AngleUnit.DEGREES)"
             elif method == 'set_mode':
                 if len(node.args) > 0:
                     mode_arg = self.visit_expression(node.args[0])
                     if mode_arg.strip('"') in self.motor_modes:
                         java_mode = self.motor_modes[mode_arg.strip('"')]
+                        if self.is_cached_motor(obj):
+                            return f"{obj}_cache.setMode({java_mode})"
                         return f"{obj}.setMode({java_mode})"
                 return f"{obj}.setMode(/* UNKNOWN MODE */)"
         
@@ -339,10 +1365,52 @@ class FTCTranspiler(ast.NodeVisitor):
                     key = self.visit_expression(node.args[0])
                     value = self.visit_expression(node.args[1])
                     return f"telemetry.addData({key}, {value})"
+            elif node.func.id == 'telemetry_update':
+                return "telemetry.update()"
             elif node.func.id == 'sleep':
                 if len(node.args) > 0:
                     time_ms = self.visit_expression(node.args[0])
                     return f"sleep({time_ms})"
+            elif node.func.id == 'abs':
+                if len(node.args) == 1:
+                    return f"Math.abs({self.visit_expression(node.args[0])})"
+            elif node.func.id == 'int':
+                if len(node.args) == 1:
+                    return f"(int) ({self.visit_expression(node.args[0])})"
+            elif node.func.id in ('max', 'min'):
+                if len(node.args) >= 2:
+                    # Java's Math.max/min are binary, so fold left
+                    args = [self.visit_expression(arg) for arg in node.args]
+                    result = args[0]
+                    for arg in args[1:]:
+                        result = f"Math.{node.func.id}({result}, {arg})"
+                    return result
+            elif node.func.id == 'opmode_is_active':
+                return "opModeIsActive()"
+            elif node.func.id == 'runtime_ms':
+                return "getRuntime() * 1000"
+            elif node.func.id == 'mecanum_drive':
+                if len(node.args) == 7:
+                    args = [self.visit_expression(arg) for arg in node.args[:3]]
+                    motors = [self.power_cache(arg) for arg in node.args[3:]]
+                    self.helper_classes['MecanumMixer'] = MECANUM_MIXER_HELPER
+                    
+                    # Specialize on literal-zero drive/strafe arguments
+                    if self.is_literal_zero(node.args[1]):
+                        if self.is_literal_zero(node.args[0]):
+                            return f"MecanumMixer.applyPureTurn({', '.join([args[2]] + motors)})"
+                        return f"MecanumMixer.applyNoStrafe({', '.join([args[0], args[2]] + motors)})"
+                    return f"MecanumMixer.apply({', '.join(args[:3] + motors)})"
+            elif node.func.id == 'set_powers':
+                if len(node.args) >= 2:
+                    power = self.visit_expression(node.args[0])
+                    motors = [self.power_cache(arg) for arg in node.args[1:]]
+                    return f"PowerCache.setAll({', '.join([power] + motors)})"
+            elif node.func.id == 'clamp':
+                if len(node.args) == 3:
+                    value, low, high = (self.visit_expression(arg) for arg in node.args)
+                    self.imports.add('com.qualcomm.robotcore.util.Range')
+                    return f"Range.clip({value}, {low}, {high})"
         
         return "/* UNKNOWN CALL */"
 
@@ -352,96 +1420,251 @@ class FTCTranspiler(ast.NodeVisitor):
             if not call_str.startswith("/*"):
                 self.add_line(f"{call_str};")
 
+    def is_gamepad_snapshot(self, node) -> bool:
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'self':
+            comp = self.hardware_components.get(node.attr)
+            return comp is not None and comp.type == 'Gamepad'
+        return False
+
+    def is_literal_zero(self, node: ast.AST) -> bool:
+        """Check if an expression is a literal numeric 0"""
+        return (isinstance(node, ast.Constant) and not isinstance(node.value, bool)
+                and isinstance(node.value, (int, float)) and node.value == 0)
+    
+    def is_cached_motor(self, name: str) -> bool:
+        comp = self.hardware_components.get(name)
+        return comp is not None and comp.type == 'DcMotor'
+
+    def power_cache(self, node: ast.expr) -> str:
+        """Lower a motor argument to the PowerCache the helpers expect"""
+        motor = self.visit_expression(node)
+        if self.is_cached_motor(motor):
+            return f"{motor}_cache"
+        
+        # A motor held in a local or parameter has no cache field to reuse
+        self.helper_classes['PowerCache'] = POWER_CACHE_HELPER
+        return f"new PowerCache({motor})"
+
+    def condition(self, node: ast.expr) -> str:
+        """Lower a condition, giving lists and objects Python's truthiness"""
+        negated = isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not)
+        operand = node.operand if negated else node
+        java_type = self.infer_type(operand) or 'double'
+        if java_type == 'boolean' or java_type in self.default_values:
+            return self.visit_expression(node)
+        
+        value = self.visit_expression(operand)
+        if java_type == 'String' or java_type.startswith('List<'):
+            # Empty strings and lists are false, as in Python
+            return f"{value} == null || {value}.isEmpty()" if negated else f"{value} != null && !{value}.isEmpty()"
+        return f"{value} == null" if negated else f"{value} != null"
+
     def visit_If(self, node: ast.If):
-        condition = self.visit_expression(node.test)
+        condition = self.condition(node.test)
         self.add_line(f"if ({condition}) {{")
         self.indent_level += 1
         
-        for stmt in node.body:
-            self.visit(stmt)
+        self.visit_body(node.body)
         
         self.indent_level -= 1
         
+        # An elif chain stays flat: each branch continues the same if
+        while len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            node = node.orelse[0]
+            self.add_line(f"}} else if ({self.condition(node.test)}) {{")
+            self.indent_level += 1
+            
+            self.visit_body(node.body)
+            
+            self.indent_level -= 1
+        
         if node.orelse:
             self.add_line("} else {")
             self.indent_level += 1
             
-            for stmt in node.orelse:
-                self.visit(stmt)
+            self.visit_body(node.orelse)
             
             self.indent_level -= 1
         
         self.add_line("}")
 
     def visit_While(self, node: ast.While):
-        condition = self.visit_expression(node.test)
+        condition = self.condition(node.test)
         self.add_line(f"while ({condition}) {{")
         self.indent_level += 1
         
-        for stmt in node.body:
-            self.visit(stmt)
+        self.visit_body(node.body)
         
         self.indent_level -= 1
         self.add_line("}")
 
+    def visit_For(self, node: ast.For):
+        if not isinstance(node.target, ast.Name):
+            return
+        
+        name = node.target.id
+        iterable = node.iter
+        if (isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and
+                iterable.func.id == 'range' and 1 <= len(iterable.args) <= 2):
+            # range() lowers to a counting loop instead of a boxed list
+            bounds = [self.visit_expression(arg) for arg in iterable.args]
+            start, stop = bounds if len(bounds) == 2 else ["0"] + bounds
+            self.local_types[name] = 'int'
+            self.add_line(f"for (int {name} = {start}; {name} < {stop}; {name}++) {{")
+        else:
+            # Lists come from annotations or detection getters; anything
+            # else is assumed to hold numbers
+            list_type = self.infer_type(iterable) or ''
+            element_type = list_type[5:-1] if list_type.startswith('List<') else 'double'
+            self.local_types[name] = element_type
+            self.add_line(f"for ({element_type} {name} : {self.visit_expression(iterable)}) {{")
+        
+        self.declared_locals.add(name)
+        self.indent_level += 1
+        
+        self.visit_body(node.body)
+        
+        self.indent_level -= 1
+        self.add_line("}")
+
+    def visit_Return(self, node: ast.Return):
+        if node.value is None:
+            self.add_line("return;")
+            return
+        
+        self.add_line(f"return {self.visit_expression(node.value)};")
+
+    def visit_Break(self, node: ast.Break):
+        self.add_line("break;")
+
+    def visit_Continue(self, node: ast.Continue):
+        self.add_line("continue;")
+
+    def visit_With(self, node: ast.With):
+        # `with at_rate(hz):` runs its body on a fixed monotonic schedule
+        # while the OpMode is active, so a slow iteration does not push
+        # every later tick back the way a trailing sleep() does
+        if len(node.items) == 1:
+            call = node.items[0].context_expr
+            if isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == 'at_rate':
+                # The period is fixed at transpile time, so the rate must be
+                # a positive number literal
+                hz = call.args[0].value if len(call.args) == 1 and isinstance(call.args[0], ast.Constant) else None
+                if isinstance(hz, bool) or not isinstance(hz, (int, float)) or not hz > 0:
+                    rate = ", ".join(ast.unparse(arg) for arg in call.args)
+                    raise ValueError(f"at_rate() needs a positive rate in Hz as a number literal, got at_rate({rate})")
+                period_ns = int(round(1_000_000_000 / hz))
+                self.imports.add('java.util.concurrent.locks.LockSupport')
+                
+                # Every loop gets its own names, since two in one method (or
+                # one nested in another) would otherwise redeclare them
+                self.rate_loops += 1
+                suffix = "" if self.rate_loops == 1 else f"_{self.rate_loops}"
+                deadline, wait = f"tick_deadline_ns{suffix}", f"wait_ns{suffix}"
+                
+                self.add_line(f"long {deadline} = System.nanoTime();")
+                self.add_line("while (opModeIsActive()) {")
+                self.indent_level += 1
+                self.add_line(f"long {wait};")
+                self.add_line(f"while (({wait} = {deadline} - System.nanoTime()) > 0) {{")
+                self.add_line(f"    LockSupport.parkNanos({wait});")
+                self.add_line("}")
+                self.add_line(f"if ({wait} < -{period_ns}L) {{")
+                self.add_line(f"    {deadline} -= {wait};  // Overran a whole period: resync instead of bursting")
+                self.add_line("}")
+                self.add_line(f"{deadline} += {period_ns}L;")
+                self.add_line("")
+                
+                self.visit_body(node.body)
+                
+                self.indent_level -= 1
+                self.add_line("}")
+                return
+        
+        self.visit_body(node.body)
+
+    def string_literal_operand(self, left, right):
+        """Return (other operand, literal) when one side of a comparison is a string literal"""
+        for operand, other in ((left, right), (right, left)):
+            if isinstance(other, ast.Constant) and isinstance(other.value, str):
+                return self.visit_expression(operand), other.value
+        return None
+
     def convert_gamepad_attr(self, attr: str) -> str:
-        gamepad_mappings = {
-            'left_stick_y': 'left_stick_y',
-            'right_stick_x': 'right_stick_x',
-            'left_stick_x': 'left_stick_x',
-            'right_stick_y': 'right_stick_y',
-            'a_button': 'a',
-            'b_button': 'b',
-            'x_button': 'x',
-            'y_button': 'y',
-            'dpad_up': 'dpad_up',
-            'dpad_down': 'dpad_down',
-            'dpad_left': 'dpad_left',
-            'dpad_right': 'dpad_right',
-            'left_bumper': 'left_bumper',
-            'right_bumper': 'right_bumper',
-            'left_trigger': 'left_trigger',
-            'right_trigger': 'right_trigger'
-        }
-        return gamepad_mappings.get(attr, attr)
+        return GAMEPAD_MAPPINGS.get(attr, attr)
+
+    def binop_precedence(self, op) -> int:
+        return self._BINOP_PRECEDENCE.get(type(op), 7)
 
     def convert_binary_op(self, op) -> str:
-        if isinstance(op, ast.Add):
-            return "+"
-        elif isinstance(op, ast.Sub):
-            return "-"
-        elif isinstance(op, ast.Mult):
-            return "*"
-        elif isinstance(op, ast.Div):
-            return "/"
-        elif isinstance(op, ast.Lt):
-            return "<"
-        elif isinstance(op, ast.Gt):
-            return ">"
-        elif isinstance(op, ast.LtE):
-            return "<="
-        elif isinstance(op, ast.GtE):
-            return ">="
-        elif isinstance(op, ast.Eq):
-            return "=="
-        elif isinstance(op, ast.NotEq):
-            return "!="
-        return "?"
+        return self._BINOP_MAP.get(type(op), "?")
 
     def get_string_arg(self, call_node: ast.Call, index: int, default: str) -> str:
-        if len(call_node.args) > index and isinstance(call_node.args[index], ast.Constant):
-            return call_node.args[index].value
+        args = call_node.args
+        if len(args) > index:
+            arg = args[index]
+            if type(arg) is ast.Constant:
+                return arg.value
         return default
 
+    def get_dict_arg(self, call_node: ast.Call, index: int) -> Dict[str, ast.expr]:
+        if len(call_node.args) > index and isinstance(call_node.args[index], ast.Dict):
+            arg = call_node.args[index]
+            return {key.value: value for key, value in zip(arg.keys, arg.values)
+                    if isinstance(key, ast.Constant)}
+        return {}
+
     def generate_java_code(self) -> str:
-        # Generate imports
-        imports = []
-        for imp in sorted(self.standard_imports):
-            imports.append(f"import {imp};")
+        buf = io.StringIO()
+        write = buf.write
+        
+        # Generate imports; the standard block is pre-sorted unless a
+        # builtin or vision component added imports of its own
+        if self.standard_imports is STANDARD_IMPORTS and self.imports <= STANDARD_IMPORTS:
+            write(IMPORT_BLOCK)
+        else:
+            for imp in sorted(self.standard_imports | self.imports):
+                write("import ")
+                write(imp)
+                write(";\n")
+            write("\n")
         
-        # Combine imports and class code
-        result = "\n".join(imports) + "\n\n" + "\n".join(self.java_code)
-        return result
+        # Append the class code section by section, one line per entry
+        indent = self.indent
+        separator = ""
+        for section in ('header', 'fields', 'body', 'footer'):
+            for level, line in self._sections[section]:
+                write(separator)
+                write(indent(level))
+                write(line)
+                separator = "\n"
+        return buf.getvalue()
+
+@lru_cache(maxsize=128)
+def _parse_cached(python_code: str) -> ast.Module:
+    """Parse DSL source, reusing the tree for source seen before.
+
+    Safe to share because FTCTranspiler only reads the tree. Type comments
+    are never lowered, so they are not collected.
+    """
+    return ast.parse(python_code, type_comments=False)
+
+def transpile_ast(tree: ast.Module) -> str:
+    """
+    Transpile an already parsed FTC Python DSL module to Java.
+    
+    Lets callers that parse once reuse the tree. Errors propagate instead of
+    being folded into the output.
+    
+    Args:
+        tree: Module parsed from Python source using FTC DSL
+        
+    Returns:
+        Generated Java code for FTC
+    """
+    transpiler = FTCTranspiler()
+    transpiler.visit(tree)
+    return transpiler.generate_java_code()
 
 def transpile_ftc_python_to_java(python_code: str) -> str:
     """
@@ -454,10 +1677,7 @@ def transpile_ftc_python_to_java(python_code: str) -> str:
         Generated Java code for FTC
     """
     try:
-        tree = ast.parse(python_code)
-        transpiler = FTCTranspiler()
-        transpiler.visit(tree)
-        return transpiler.generate_java_code()
+        return transpile_ast(_parse_cached(python_code))
     except Exception as e:
         return f"// Transpilation error: {str(e)}\n// Original Python code:\n/*\n{python_code}\n*/"
 
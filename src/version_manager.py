@@ -18,22 +18,34 @@ import sys
 import os
 from pathlib import Path
 
+_VERSION_RE = re.compile(r'^(\d+)\.(\d+)\.(\d+)$')
+
 class VersionManager:
     def __init__(self, version_file="VERSION"):
         self.version_file = Path(version_file)
-        self.version_pattern = re.compile(r'^(\d+)\.(\d+)\.(\d+)$')
+        self.version_pattern = _VERSION_RE
+        self._is_git_repo = None
+        # Last version read or written, and its parsed components
+        self._cached = None
+        self._cached_parts = None
     
     def get_current_version(self):
         """Get the current version from VERSION file"""
-        if not self.version_file.exists():
-            return "0.0.0"
+        if self._cached is not None:
+            return self._cached
         
-        with open(self.version_file, 'r') as f:
-            version = f.read().strip()
+        if not self.version_file.exists():
+            version = "0.0.0"
+        else:
+            with open(self.version_file, 'r') as f:
+                version = f.read().strip()
         
-        if not self.version_pattern.match(version):
+        match = self.version_pattern.match(version)
+        if not match:
             raise ValueError(f"Invalid version format in {self.version_file}: {version}")
         
+        self._cached = version
+        self._cached_parts = tuple(int(group) for group in match.groups())
         return version
     
     def parse_version(self, version_string):
@@ -51,17 +63,19 @@ class VersionManager:
     def set_version(self, new_version):
         """Set version to specific value"""
         # Validate format
-        self.parse_version(new_version)
+        parts = self.parse_version(new_version)
         
         with open(self.version_file, 'w') as f:
             f.write(new_version)
         
+        self._cached = new_version
+        self._cached_parts = parts
         return new_version
     
     def bump_version(self, bump_type):
         """Bump version by specified type (major, minor, patch)"""
         current_version = self.get_current_version()
-        major, minor, patch = self.parse_version(current_version)
+        major, minor, patch = self._cached_parts
         
         if bump_type == "major":
             major += 1
@@ -82,12 +96,15 @@ class VersionManager:
     
     def is_git_repo(self):
         """Check if current directory is a git repository"""
-        try:
-            subprocess.run(['git', 'rev-parse', '--git-dir'], 
-                         check=True, capture_output=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        # Every git call is a fork+exec, so the answer is looked up once
+        if self._is_git_repo is None:
+            try:
+                result = subprocess.run(['git', 'rev-parse', '--git-dir'], 
+                                      capture_output=True)
+                self._is_git_repo = result.returncode == 0
+            except FileNotFoundError:
+                self._is_git_repo = False
+        return self._is_git_repo
     
     def git_commit_version(self, version):
         """Commit version change to git"""
@@ -95,14 +112,17 @@ class VersionManager:
             print("Warning: Not in a git repository, skipping commit")
             return False
         
-        try:
-            subprocess.run(['git', 'add', str(self.version_file)], check=True)
-            subprocess.run(['git', 'commit', '-m', f'Bump version to {version}'], check=True)
-            print(f"✓ Committed version {version}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Error committing version: {e}")
-            return False
+        # git's own output, including any hook output, goes straight to the
+        # terminal so a failure explains itself
+        for command in (['git', 'add', str(self.version_file)],
+                        ['git', 'commit', '-m', f'Bump version to {version}']):
+            result = subprocess.run(command)
+            if result.returncode != 0:
+                print(f"Error committing version: {' '.join(command[:2])} exited with {result.returncode}")
+                return False
+        
+        print(f"✓ Committed version {version}")
+        return True
     
     def git_tag_version(self, version):
         """Create git tag for version"""
@@ -111,42 +131,55 @@ class VersionManager:
             return False
         
         tag_name = f"v{version}"
-        try:
-            subprocess.run(['git', 'tag', tag_name], check=True)
-            print(f"✓ Created tag {tag_name}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Error creating tag: {e}")
+        result = subprocess.run(['git', 'tag', tag_name])
+        if result.returncode != 0:
+            print(f"Error creating tag: git tag exited with {result.returncode}")
             return False
+        
+        print(f"✓ Created tag {tag_name}")
+        return True
     
     def get_git_status(self):
         """Get git status information"""
         if not self.is_git_repo():
             return None
         
-        try:
-            # Check if there are uncommitted changes
-            result = subprocess.run(['git', 'status', '--porcelain'], 
-                                  capture_output=True, text=True, check=True)
-            has_changes = bool(result.stdout.strip())
-            
-            # Get current branch
-            result = subprocess.run(['git', 'branch', '--show-current'], 
-                                  capture_output=True, text=True, check=True)
-            current_branch = result.stdout.strip()
-            
-            # Get latest commit
-            result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], 
-                                  capture_output=True, text=True, check=True)
-            latest_commit = result.stdout.strip()
-            
-            return {
-                'has_changes': has_changes,
-                'current_branch': current_branch,
-                'latest_commit': latest_commit
-            }
-        except subprocess.CalledProcessError:
+        # One porcelain v2 status reports the branch, the HEAD commit and
+        # the uncommitted changes together
+        result = subprocess.run(['git', 'status', '--porcelain=v2', '--branch'], 
+                              capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        
+        headers = {}
+        has_changes = False
+        for line in result.stdout.splitlines():
+            if line.startswith('# '):
+                key, _, value = line[2:].partition(' ')
+                headers[key] = value
+            elif line:
+                has_changes = True
+        
+        if headers.get('branch.oid', '(initial)') == '(initial)':
+            # No commits yet
             return None
+        
+        # git picks the short hash length that keeps it unambiguous
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], 
+                              capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        latest_commit = result.stdout.strip()
+        
+        current_branch = headers.get('branch.head', '')
+        if current_branch == '(detached)':
+            current_branch = ''
+        
+        return {
+            'has_changes': has_changes,
+            'current_branch': current_branch,
+            'latest_commit': latest_commit
+        }
 
 def main():
     parser = argparse.ArgumentParser(description='FTC Python DSL Version Manager')
@@ -10,270 +10,432 @@ import unittest
 import sys
 import os
 import re
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import ftc_transpiler
 from ftc_transpiler import transpile_ftc_python_to_java
 
-class TestExampleTranspilation(unittest.TestCase):
-    """Test transpilation of example files"""
-    
-    def setUp(self):
-        """Set up test fixtures"""
-        self.examples_dir = os.path.join(os.path.dirname(__file__), '..', 'examples')
-    
-    def load_example_file(self, filename):
-        """Load an example Python file"""
-        filepath = os.path.join(self.examples_dir, filename)
-        if not os.path.exists(filepath):
-            self.skipTest(f"Example file {filename} not found")
-        
-        with open(filepath, 'r') as f:
-            return f.read()
-    
-    def test_basic_teleop_transpilation(self):
-        """Test basic TeleOp example transpilation"""
-        python_code = self.load_example_file('basic_teleop.py')
-        java_code = transpile_ftc_python_to_java(python_code)
-        
+EXAMPLE_FILES = (
+    'basic_teleop.py',
+    'apriltag_detection.py',
+    'tensorflow_detection.py',
+    'mobile_controller.py'
+)
+
+# Snippets every example's generated Java must contain. One test walks the
+# table with a subtest per example, so each file reports all of its
+# missing snippets at once. Each example is searched on its own: several
+# snippets (e.g. the left_drive declaration) occur in more than one
+# example, so a scan over the concatenated outputs could pass one file's
+# check on another file's Java
+EXPECTED_SNIPPETS = MappingProxyType({
+    'basic_teleop.py': (
         # Check for proper class structure
-        self.assertIn('@TeleOp(name="Basic Drive", group="Linear OpMode")', java_code)
-        self.assertIn('public class BasicDriveRobot extends LinearOpMode', java_code)
+        '@TeleOp(name="Basic Drive", group="Linear OpMode")',
+        'public class BasicDriveRobot extends LinearOpMode',
         
         # Check hardware declarations
-        self.assertIn('private DcMotor left_drive = null;', java_code)
-        self.assertIn('private DcMotor right_drive = null;', java_code)
-        self.assertIn('private DcMotor arm_motor = null;', java_code)
-        self.assertIn('private Servo claw_servo = null;', java_code)
-        self.assertIn('private DistanceSensor distance_sensor = null;', java_code)
-        self.assertIn('private ColorSensor color_sensor = null;', java_code)
+        'private DcMotor left_drive = null;',
+        'private DcMotor right_drive = null;',
+        'private DcMotor arm_motor = null;',
+        'private Servo claw_servo = null;',
+        'private DistanceSensor distance_sensor = null;',
+        'private ColorSensor color_sensor = null;',
         
         # Check hardware initialization
-        self.assertIn('left_drive = hardwareMap.get(DcMotor.class, "left_drive");', java_code)
-        self.assertIn('left_drive.setDirection(DcMotor.Direction.FORWARD);', java_code)
-        self.assertIn('right_drive.setDirection(DcMotor.Direction.REVERSE);', java_code)
+        'left_drive = hardwareMap.get(DcMotor.class, "left_drive");',
+        'left_drive.setDirection(DcMotor.Direction.FORWARD);',
+        'right_drive.setDirection(DcMotor.Direction.REVERSE);',
         
         # Check motor mode settings
-        self.assertIn('left_drive.setMode(DcMotor.RunMode.RUN_USING_ENCODER);', java_code)
+        'left_drive_cache.setMode(DcMotor.RunMode.RUN_USING_ENCODER);',
         
         # Check control logic
-        self.assertIn('double drive = -gamepad1.left_stick_y;', java_code)
-        self.assertIn('double turn = gamepad1.right_stick_x;', java_code)
-        self.assertIn('left_drive.setPower(left_power);', java_code)
-        self.assertIn('right_drive.setPower(right_power);', java_code)
+        'double drive = -gamepad1.left_stick_y;',
+        'double turn = gamepad1.right_stick_x;',
+        'left_drive_cache.setPower(left_power);',
+        'right_drive_cache.setPower(right_power);',
         
         # Check servo control
-        self.assertIn('if (gamepad1.a) {', java_code)
-        self.assertIn('claw_servo.setPosition(0.0);', java_code)
-        self.assertIn('} else if (gamepad1.b) {', java_code)
-        self.assertIn('claw_servo.setPosition(1.0);', java_code)
+        'if (gamepad1.a) {',
+        'claw_servo.setPosition(0.0);',
+        '} else if (gamepad1.b) {',
+        'claw_servo.setPosition(1.0);',
         
         # Check sensor usage
-        self.assertIn('distance_sensor.getDistance(DistanceUnit.CM)', java_code)
+        'distance_sensor.getDistance(DistanceUnit.CM)',
         
         # Check telemetry
-        self.assertIn('telemetry.addData("Drive Power", drive);', java_code)
-        self.assertIn('telemetry.addData("Distance (cm)", distance);', java_code)
+        'telemetry.addData("Drive Power", drive)',
+        '.addData("Distance (cm)", distance);',
         
         # Check safety logic
-        self.assertIn('if (distance < 10) {', java_code)
-        self.assertIn('telemetry.addData("Status", "OBSTACLE DETECTED!");', java_code)
-    
-    def test_apriltag_detection_transpilation(self):
-        """Test AprilTag detection example transpilation"""
-        python_code = self.load_example_file('apriltag_detection.py')
-        java_code = transpile_ftc_python_to_java(python_code)
-        
+        'if (distance < 10) {',
+        'telemetry.addData("Status", "OBSTACLE DETECTED!");'
+    ),
+    'apriltag_detection.py': (
         # Check for autonomous annotation
-        self.assertIn('@Autonomous(name="AprilTag Auto", group="Vision")', java_code)
-        self.assertIn('public class AprilTagDetectionRobot extends LinearOpMode', java_code)
+        '@Autonomous(name="AprilTag Auto", group="Vision")',
+        'public class AprilTagDetectionRobot extends LinearOpMode',
         
         # Check drive motor declarations
-        self.assertIn('private DcMotor left_drive = null;', java_code)
-        self.assertIn('private DcMotor right_drive = null;', java_code)
-        self.assertIn('private DcMotor front_left = null;', java_code)
-        self.assertIn('private DcMotor front_right = null;', java_code)
-        
-        # Check vision-related method calls (these would be custom implementations)
-        # The transpiler should preserve method calls even if they're not standard FTC
-        self.assertIn('webcam("Webcam 1")', java_code)
-        self.assertIn('apriltag_processor()', java_code)
-        self.assertIn('vision_portal(', java_code)
+        'private DcMotor left_drive = null;',
+        'private DcMotor right_drive = null;',
+        'private DcMotor front_left = null;',
+        'private DcMotor front_right = null;',
+        
+        # Check vision components are built through the SDK builders
+        'webcam = hardwareMap.get(WebcamName.class, "Webcam 1");',
+        'apriltag_processor = new AprilTagProcessor.Builder()',
+        '.setNumThreads(4)',
+        'apriltag_processor.setDecimation(2);',
+        'vision_portal = new VisionPortal.Builder()',
+        
+        # Check the first fresh detection is taken from the typed list
+        'List<AprilTagDetection> detections = get_apriltag_detections();',
+        'if (detections != null && !detections.isEmpty()) {',
+        'process_apriltag_detection(detections.get(0));',
+        
+        # Check detections are read through the SDK's typed fields
+        'private void process_apriltag_detection(AprilTagDetection detection) {',
+        'int tag_id = detection.id;',
+        'double range_distance = detection.ftcPose.range;',
+        'String name = get_tag_names(tag_id, null);',
+        'if (name != null && !name.isEmpty()) {',
         
         # Check navigation methods
-        self.assertIn('private void navigate_to_tag_1(', java_code)
-        self.assertIn('private void navigate_to_tag_2(', java_code)
-        self.assertIn('private void navigate_to_tag_3(', java_code)
+        'private void navigate_to_tag(AprilTagDetection detection, String name) {',
+        'private static String get_tag_names(int key, String fallback) {',
+        'case 2: return "Tag 2";',
         
         # Check mecanum drive implementation
-        self.assertIn('private void mecanum_drive(', java_code)
-        self.assertIn('front_left.setPower(front_left_power);', java_code)
+        'private void drive_and_turn(',
+        'MecanumMixer.applyNoStrafe(drive, turn, front_left_cache, front_right_cache, left_drive_cache, right_drive_cache);',
+        'private void turn_in_place(',
+        'MecanumMixer.applyPureTurn(turn, front_left_cache, front_right_cache, left_drive_cache, right_drive_cache);',
+        'private static final class MecanumMixer {',
         
         # Check calculation methods
-        self.assertIn('private void calculate_drive_power(', java_code)
-        self.assertIn('private void calculate_turn_power(', java_code)
-    
-    def test_tensorflow_detection_transpilation(self):
-        """Test TensorFlow detection example transpilation"""
-        python_code = self.load_example_file('tensorflow_detection.py')
-        java_code = transpile_ftc_python_to_java(python_code)
-        
+        'private double calculate_drive_power(',
+        'private double calculate_turn_power('
+    ),
+    'tensorflow_detection.py': (
         # Check for autonomous annotation
-        self.assertIn('@Autonomous(name="TensorFlow Auto", group="Machine Learning")', java_code)
-        self.assertIn('public class TensorFlowDetectionRobot extends LinearOpMode', java_code)
+        '@Autonomous(name="TensorFlow Auto", group="Machine Learning")',
+        'public class TensorFlowDetectionRobot extends LinearOpMode',
         
         # Check hardware declarations
-        self.assertIn('private DcMotor left_drive = null;', java_code)
-        self.assertIn('private DcMotor arm_motor = null;', java_code)
-        self.assertIn('private DcMotor intake_motor = null;', java_code)
+        'private DcMotor left_drive = null;',
+        'private DcMotor arm_motor = null;',
+        'private DcMotor intake_motor = null;',
         
-        # Check TensorFlow-related method calls
-        self.assertIn('tensorflow_processor()', java_code)
+        # Check the TensorFlow processor is built from its config
+        'tensorflow_processor = new TfodProcessor.Builder()',
         
         # Check autonomous sequence methods
-        self.assertIn('private void autonomous_sequence(', java_code)
-        self.assertIn('private void search_for_objects(', java_code)
-        self.assertIn('private void analyze_objects(', java_code)
-        self.assertIn('private void navigate_to_object(', java_code)
+        'private void autonomous_sequence(',
+        'private List<Recognition> search_for_objects(',
+        'private Recognition analyze_objects(',
+        'private void navigate_to_object(',
         
         # Check object interaction methods
-        self.assertIn('private void collect_bolt(', java_code)
-        self.assertIn('private void collect_bulb(', java_code)
-        self.assertIn('private void interact_with_panel(', java_code)
+        'private void collect_bolt(',
+        'private void collect_bulb(',
+        'private void interact_with_panel(',
+        
+        # Check arm moves wait on the encoder instead of a fixed sleep
+        'private void arm_move(',
+        'while (opModeIsActive() && arm_motor.isBusy()) {',
         
         # Check control calculations
-        self.assertIn('private void calculate_turn_from_x_error(', java_code)
-        self.assertIn('private void calculate_drive_from_area(', java_code)
+        'private double calculate_turn_from_x_error(',
+        'private double calculate_drive_from_area(',
         
-        # Check sleep calls
-        self.assertIn('sleep(3000);', java_code)
-        self.assertIn('sleep(1000);', java_code)
-    
-    def test_mobile_controller_transpilation(self):
-        """Test mobile controller example transpilation"""
-        python_code = self.load_example_file('mobile_controller.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        # Check the priority table is a static lookup used inline
+        'private static double get_object_priorities(String key, double fallback) {',
+        'get_object_priorities(label, 0.5) * confidence',
+        
+        # Check recognitions are re-queried at most once per inference period
+        'private static final int MIN_INFERENCE_PERIOD_MS = 150;',
+        'tensorflow_processor.getFreshRecognitions()',
+        'detections_deadline = now + MIN_INFERENCE_PERIOD_MS;',
+        
+        # Check mecanum drive uses the fused mixer
+        'MecanumMixer.apply(drive, strafe, turn, front_left_cache, front_right_cache, left_drive_cache, right_drive_cache);',
         
+        # Check sleep calls
+        'sleep(3000);',
+        'sleep(1000);'
+    ),
+    'mobile_controller.py': (
         # Check for TeleOp annotation
-        self.assertIn('@TeleOp(name="Mobile Controller", group="Advanced")', java_code)
-        self.assertIn('public class MobileControllerRobot extends LinearOpMode', java_code)
+        '@TeleOp(name="Mobile Controller", group="Advanced")',
+        'public class MobileControllerRobot extends LinearOpMode',
         
         # Check comprehensive hardware declarations
-        self.assertIn('private DcMotor left_drive = null;', java_code)
-        self.assertIn('private DcMotor front_left = null;', java_code)
-        self.assertIn('private DcMotor arm_motor = null;', java_code)
-        self.assertIn('private Servo wrist_servo = null;', java_code)
-        self.assertIn('private Servo claw_servo = null;', java_code)
-        self.assertIn('private DcMotor lift_motor = null;', java_code)
-        self.assertIn('private DistanceSensor distance_sensor = null;', java_code)
-        self.assertIn('private ColorSensor color_sensor = null;', java_code)
-        self.assertIn('private IMU imu = null;', java_code)
-        self.assertIn('private TouchSensor touch_sensor = null;', java_code)
+        'private DcMotor left_drive = null;',
+        'private DcMotor front_left = null;',
+        'private DcMotor arm_motor = null;',
+        'private Servo wrist_servo = null;',
+        'private Servo claw_servo = null;',
+        'private DcMotor lift_motor = null;',
+        'private DistanceSensor distance_sensor = null;',
+        'private ColorSensor color_sensor = null;',
+        'private IMU imu = null;',
+        'private TouchSensor touch_sensor = null;',
+        
+        # Check dashboard settings are typed fields
+        'private double drive_speed;',
+        'private boolean auto_align_enabled;',
         
         # Check dashboard-related methods
-        self.assertIn('private void init_dashboard(', java_code)
-        self.assertIn('private void update_dashboard_config(', java_code)
-        self.assertIn('private void update_mobile_dashboard(', java_code)
+        'private void init_dashboard(',
+        'private void update_dashboard_config(',
+        'private void update_telemetry() {',
+        
+        # Check sensors are read once into the cache
+        'private void refresh_sensors(',
+        'distance_cm = distance_sensor.getDistance(DistanceUnit.CM);',
+        'limit_pressed = touch_sensor.isPressed();',
         
         # Check control methods
-        self.assertIn('private void handle_drive_controls(', java_code)
-        self.assertIn('private void handle_manipulator_controls(', java_code)
-        self.assertIn('private void handle_special_functions(', java_code)
+        'private void handle_drive_controls(',
+        'private void handle_manipulator_controls(',
+        'private void handle_special_functions(',
         
-        # Check preset position methods
-        self.assertIn('private void move_arm_to_position(', java_code)
+        # Check preset position methods look up the int tick table
+        'private void move_arm_to_position(String position) {',
+        'int target_position = get_arm_preset_ticks(position, -1);',
         
-        # Check automated sequences
-        self.assertIn('private void run_intake_sequence(', java_code)
-        self.assertIn('private void run_scoring_sequence(', java_code)
+        # Check automated sequences are started with a fresh deadline
+        'private void start_sequence(String name) {',
+        'active_sequence = name;',
+        'sequence_deadline = getRuntime() * 1000;',
+        'private double run_intake_sequence(',
+        'private double run_scoring_sequence(',
         
         # Check safety features
-        self.assertIn('private void emergency_stop(', java_code)
-        self.assertIn('private void run_auto_functions(', java_code)
+        'private void emergency_stop(',
+        'private void run_auto_functions(',
         
         # Check advanced features
-        self.assertIn('private void auto_align_to_object(', java_code)
-        self.assertIn('private void auto_level_robot(', java_code)
+        'private void auto_align_to_object(',
+        'private void auto_level_robot(',
         
         # Check mecanum drive
-        self.assertIn('private void mecanum_drive(', java_code)
+        'private void mecanum_drive(',
         
         # Check complex control logic
-        self.assertIn('if (gamepad1.right_bumper) {', java_code)
-        self.assertIn('if (gamepad2.dpad_down) {', java_code)
-        self.assertIn('if (gamepad1.start && gamepad2.start) {', java_code)
+        'if (g1.right_bumper) {',
+        'if (g2.dpad_down && !prev_dpad_down) {',
+        'if (g1.start && g2.start) {'
+    )
+})
+
+# Examples whose snippets are listed in generated-Java order, so they are
+# checked in a single forward pass that also catches misplaced statements
+ORDERED_EXAMPLES = frozenset({'basic_teleop.py'})
+
+# Java signatures expected in the mobile controller example. They are fused
+# into one alternation of named groups so the Java is scanned once; the
+# signatures start different lines, so no two matches can overlap
+_METHOD_PATTERNS = (
+    r'private void init_dashboard\(\) \{',
+    r'private void handle_drive_controls\(\) \{',
+    r'private void mecanum_drive\(double \w+, double \w+, double \w+\) \{',
+    r'@Override\s+public void runOpMode\(\) \{'
+)
+_FUSED_METHOD_PATTERN = re.compile('|'.join(f'(?P<g{i}>{pattern})' for i, pattern in enumerate(_METHOD_PATTERNS)))
+
+# Line starts and ends that need no trailing semicolon; str.startswith() and
+# endswith() test a whole tuple in one C-level call
+_NO_SEMICOLON_PREFIXES = (
+    '//', '/*', '@', 'import', 'public class', 'private void', 'if ', '} else', 'while '
+)
+_NO_SEMICOLON_SUFFIXES = ('{', '}')
+
+TRANSPILER_PATH = ftc_transpiler.__file__
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.transpile_cache')
+
+# The transpiler cannot change while the tests run, so hash it once
+TRANSPILER_KEY = hashlib.sha1(Path(TRANSPILER_PATH).read_bytes()).hexdigest()[:16]
+
+def _cache_file(python_code):
+    """Path of the saved output for this source under the current transpiler.
+
+    Entries are named <transpiler hash>-<source hash>.java, so any change to
+    ftc_transpiler.py misses the cache.
+    """
+    source_key = hashlib.sha1(python_code.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{TRANSPILER_KEY}-{source_key}.java")
+
+def _disk_cached_transpile(python_code):
+    """Transpile, reusing output saved by an earlier run of the same transpiler"""
+    cache_file = _cache_file(python_code)
+    if os.path.exists(cache_file):
+        with open(cache_file, 'r') as f:
+            return f.read()
+    
+    # Each missing source is parsed exactly once, here; a failure comes back
+    # as a "// Transpilation error:" output, so it fails only its own file's
+    # checks rather than the setUpClass of every test
+    java_code = transpile_ftc_python_to_java(python_code)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Prune the entries a previous transpiler left behind
+    for entry in os.listdir(CACHE_DIR):
+        if not entry.startswith(TRANSPILER_KEY):
+            try:
+                os.remove(os.path.join(CACHE_DIR, entry))
+            except FileNotFoundError:
+                pass  # Another worker pruned it first
+    with open(cache_file, 'w') as f:
+        f.write(java_code)
+    return java_code
+
+def _prefetch_transpiles(sources):
+    """Transpile the sources missing from the disk cache in parallel.
+
+    The transpiler is pure-Python CPU work, so separate processes sidestep
+    the GIL. Warm runs find every source cached and start no workers.
+    """
+    pending = [python_code for python_code in sources if not os.path.exists(_cache_file(python_code))]
+    if len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(4, len(pending))) as executor:
+            list(executor.map(_disk_cached_transpile, pending))
+
+@lru_cache(maxsize=None)
+def _cached_transpile(python_code):
+    """Transpile a source once per process, keyed on its contents"""
+    return _disk_cached_transpile(python_code)
+
+class ExampleTestCase(unittest.TestCase):
+    """Base for tests that read the transpiled examples"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load and transpile each example once for every test in the class"""
+        cls.examples_dir = os.path.join(os.path.dirname(__file__), '..', 'examples')
+        cls._py = {path.name: path.read_text() for path in Path(cls.examples_dir).glob('*.py')}
+        _prefetch_transpiles(cls._py.values())
+        cls._java = {filename: _cached_transpile(python_code) for filename, python_code in cls._py.items()}
+    
+    def example_java(self, filename):
+        """Get the transpiled Java for an example file"""
+        if filename not in self._java:
+            self.skipTest(f"Example file {filename} not found")
+        return self._java[filename]
+    
+    def assert_all_in(self, needles, haystack):
+        """Assert every needle occurs in haystack, reporting all that are missing"""
+        missing = [needle for needle in needles if needle not in haystack]
+        if missing:
+            # Name only the missing needles; never repr the whole output
+            self.fail(f"Missing from generated Java: {missing}")
+    
+    def assert_all_in_order(self, needles, haystack):
+        """Assert the needles occur in haystack in the given order.
+        
+        Each search starts where the previous match ended, so the whole list
+        costs one pass over haystack.
+        """
+        missing = []
+        position = 0
+        for needle in needles:
+            index = haystack.find(needle, position)
+            if index == -1:
+                missing.append(needle)
+            else:
+                position = index + len(needle)
+        if missing:
+            self.fail(f"Missing (or out of order) in generated Java: {missing}")
+
+
+class TestExampleTranspilation(ExampleTestCase):
+    """Test transpilation of example files"""
+    
+    def test_expected_snippets(self):
+        """Test each example's Java contains its expected snippets"""
+        for filename, snippets in EXPECTED_SNIPPETS.items():
+            with self.subTest(filename=filename):
+                java_code = self.example_java(filename)
+                if filename in ORDERED_EXAMPLES:
+                    self.assert_all_in_order(snippets, java_code)
+                else:
+                    self.assert_all_in(snippets, java_code)
+    
+    def test_apriltag_detection_transpilation(self):
+        """Test AprilTag detection example transpilation"""
+        java_code = self.example_java('apriltag_detection.py')
+        self.assertNotIn('navigate_to_tag_1', java_code)
+    
+    def test_mobile_controller_transpilation(self):
+        """Test mobile controller example transpilation"""
+        java_code = self.example_java('mobile_controller.py')
+        self.assertNotIn('update_mobile_dashboard', java_code)
+        # Dashboard packets have no Java lowering, so the example sends none
+        self.assertNotIn('packet', java_code)
+        self.assertEqual(java_code.count('touch_sensor.isPressed()'), 1)
     
     def test_all_examples_compile_without_errors(self):
         """Test that all examples transpile without syntax errors"""
-        example_files = [
-            'basic_teleop.py',
-            'apriltag_detection.py',
-            'tensorflow_detection.py',
-            'mobile_controller.py'
-        ]
-        
-        for filename in example_files:
+        for filename in EXAMPLE_FILES:
             with self.subTest(filename=filename):
-                try:
-                    python_code = self.load_example_file(filename)
-                    java_code = transpile_ftc_python_to_java(python_code)
-                    
-                    # Should not contain error comments
-                    self.assertNotIn('// Transpilation error:', java_code)
-                    
-                    # Should contain basic class structure
-                    self.assertIn('extends LinearOpMode', java_code)
-                    self.assertIn('public void runOpMode()', java_code)
-                    
-                except Exception as e:
-                    self.fail(f"Failed to transpile {filename}: {str(e)}")
+                java_code = self.example_java(filename)
+                
+                # Should not contain error comments
+                self.assertNotIn('// Transpilation error:', java_code)
+                
+                # Should be pure ASCII, which CPython stores one byte per
+                # character, so every substring check runs its 1-byte search
+                self.assertTrue(java_code.isascii(), "Non-ASCII characters in generated Java")
+                
+                # Should contain basic class structure
+                self.assertIn('extends LinearOpMode', java_code)
+                self.assertIn('public void runOpMode()', java_code)
     
     def test_java_syntax_validity(self):
         """Test that generated Java has valid syntax structure"""
-        python_code = self.load_example_file('basic_teleop.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('basic_teleop.py')
         
         # Check balanced braces
         open_braces = java_code.count('{')
         close_braces = java_code.count('}')
         self.assertEqual(open_braces, close_braces, "Unbalanced braces in generated Java")
         
-        # Check balanced parentheses in method calls
-        lines = java_code.split('\n')
-        for i, line in enumerate(lines):
-            if '(' in line and ')' in line:
-                open_parens = line.count('(')
-                close_parens = line.count(')')
-                self.assertEqual(open_parens, close_parens, 
-                               f"Unbalanced parentheses on line {i+1}: {line.strip()}")
-        
-        # Check that all statements end with semicolons (where appropriate)
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if (stripped and 
-                not stripped.startswith('//') and 
-                not stripped.startswith('/*') and
-                not stripped.endswith('{') and
-                not stripped.endswith('}') and
-                not stripped.startswith('@') and
-                not stripped.startswith('import') and
-                not stripped.startswith('public class') and
-                not stripped.startswith('private void') and
-                not stripped.startswith('if ') and
-                not stripped.startswith('} else') and
-                not stripped.startswith('while ') and
-                'extends' not in stripped):
-                
-                if not stripped.endswith(';'):
-                    # Some exceptions are okay (like single '}' lines)
-                    if stripped != '}' and 'private' not in stripped:
-                        print(f"Warning: Line {i+1} might be missing semicolon: {stripped}")
+        # Check balanced parentheses overall, then per line for lines with calls
+        self.assertEqual(java_code.count('('), java_code.count(')'), "Unbalanced parentheses in generated Java")
+        lines = java_code.splitlines()
+        unbalanced = [f"line {i}: {line.strip()}" for i, line in enumerate(lines, 1)
+                      if '(' in line and ')' in line and line.count('(') != line.count(')')]
+        self.assertFalse(unbalanced, f"Unbalanced parentheses on {unbalanced}")
+        
+        # Fail on statements that may be missing semicolons. The check is a
+        # heuristic, so it runs on request: FTC_STRICT_SEMI=1
+        if not os.environ.get('FTC_STRICT_SEMI'):
+            return
+        
+        # Some exceptions are okay (like single '}' lines, or a call chain
+        # that continues on the next line)
+        stripped_lines = [line.strip() for line in lines]
+        missing = [f"line {i}: {stripped}" for i, (stripped, following) in
+                   enumerate(zip(stripped_lines, stripped_lines[1:] + ['']), 1)
+                   if stripped and stripped != '}'
+                   and not stripped.startswith(_NO_SEMICOLON_PREFIXES)
+                   and not stripped.endswith(_NO_SEMICOLON_SUFFIXES)
+                   and 'extends' not in stripped and 'private' not in stripped
+                   and not stripped.endswith(';') and not following.startswith('.')]
+        self.assertFalse(missing, f"Possibly missing semicolons on {missing}")
     
     def test_import_statements(self):
         """Test that proper import statements are generated"""
-        python_code = self.load_example_file('basic_teleop.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('basic_teleop.py')
         
         required_imports = [
             'import com.qualcomm.robotcore.eventloop.opmode.LinearOpMode;',
@@ -284,69 +446,52 @@ class TestExampleTranspilation(unittest.TestCase):
             'import com.qualcomm.robotcore.hardware.ColorSensor;'
         ]
         
-        for import_stmt in required_imports:
-            self.assertIn(import_stmt, java_code, f"Missing import: {import_stmt}")
+        self.assert_all_in(required_imports, java_code)
     
     def test_method_signature_generation(self):
         """Test that method signatures are properly generated"""
-        python_code = self.load_example_file('mobile_controller.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('mobile_controller.py')
         
         # Check that methods have proper Java signatures
-        method_patterns = [
-            r'private void init_dashboard\(\) \{',
-            r'private void handle_drive_controls\(\) \{',
-            r'private void mecanum_drive\(double \w+, double \w+, double \w+\) \{',
-            r'@Override\s+public void runOpMode\(\) \{'
-        ]
-        
-        for pattern in method_patterns:
-            self.assertRegex(java_code, pattern, f"Method signature pattern not found: {pattern}")
+        seen = {match.lastgroup for match in _FUSED_METHOD_PATTERN.finditer(java_code)}
+        missing = [pattern for i, pattern in enumerate(_METHOD_PATTERNS) if f'g{i}' not in seen]
+        self.assertFalse(missing, f"Method signature patterns not found: {missing}")
 
 
-class TestExampleFeatures(unittest.TestCase):
+class TestExampleFeatures(ExampleTestCase):
     """Test specific features in example code"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.examples_dir = os.path.join(os.path.dirname(__file__), '..', 'examples')
-    
-    def load_example_file(self, filename):
-        """Load an example Python file"""
-        filepath = os.path.join(self.examples_dir, filename)
-        if not os.path.exists(filepath):
-            self.skipTest(f"Example file {filename} not found")
-        
-        with open(filepath, 'r') as f:
-            return f.read()
-    
     def test_gamepad_controls_variety(self):
         """Test that various gamepad controls are properly handled"""
-        python_code = self.load_example_file('mobile_controller.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('mobile_controller.py')
         
+        # Each control the example reads, in the statement that reads it;
+        # the context keeps e.g. g2.b from matching inside g2.back
         gamepad_controls = [
-            'gamepad1.left_stick_y',
-            'gamepad1.right_stick_x',
-            'gamepad1.a',
-            'gamepad1.b',
-            'gamepad1.x',
-            'gamepad1.y',
-            'gamepad1.dpad_up',
-            'gamepad1.left_bumper',
-            'gamepad1.right_bumper',
-            'gamepad1.left_trigger',
-            'gamepad2.left_stick_y',
-            'gamepad2.dpad_down'
+            'double drive = -g1.left_stick_y;',
+            'double strafe = g1.left_stick_x;',
+            'double turn = g1.right_stick_x;',
+            'if (g1.right_bumper) {',
+            'if (g1.left_bumper) {',
+            'if (g1.left_trigger > 0.5) {',
+            'if (g1.back && !prev_back) {',
+            'if (g1.x) {',
+            'if (g1.y && auto_align_enabled) {',
+            'double arm_power = -g2.left_stick_y * arm_speed;',
+            'double lift_power = -g2.right_stick_y * 0.8;',
+            'if (g2.a) {',
+            'if (g2.b) {',
+            'if (g2.dpad_up && !prev_dpad_up) {',
+            'if (g2.dpad_down && !prev_dpad_down) {',
+            'if (g2.left_bumper) {',
+            'if (g2.x && "NONE".equals(active_sequence)) {',
         ]
         
-        for control in gamepad_controls:
-            self.assertIn(control, java_code, f"Gamepad control not found: {control}")
+        self.assert_all_in(gamepad_controls, java_code)
     
     def test_sensor_integration(self):
         """Test that sensor integration is properly handled"""
-        python_code = self.load_example_file('basic_teleop.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('basic_teleop.py')
         
         sensor_calls = [
             'distance_sensor.getDistance(DistanceUnit.CM)',
@@ -359,21 +504,37 @@ class TestExampleFeatures(unittest.TestCase):
     
     def test_complex_expressions(self):
         """Test that complex mathematical expressions are handled"""
-        python_code = self.load_example_file('basic_teleop.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('basic_teleop.py')
         
         # Check for complex expressions
         self.assertIn('drive + turn', java_code)
         self.assertIn('drive - turn', java_code)
         self.assertIn('-gamepad1.left_stick_y', java_code)
     
+    def test_detection_match_cache(self):
+        """Test the TensorFlow match cache returns early and scans once per new list"""
+        java_code = self.example_java('tensorflow_detection.py')
+        
+        self.assert_all_in_order([
+            'private Recognition find_matching_detection(List<Recognition> detections, String target_label) {',
+            'if (detections == matched_detections && target_label.equals(matched_label)) {\n'
+            '            return matched_detection;\n'
+            '        }',
+            'matched_detections = detections;',
+            'double best_confidence = 0.0;',
+            'for (Recognition detection : detections) {',
+            'best_confidence = detection.getConfidence();',
+            'return matched_detection;',
+        ], java_code)
+        self.assertNotIn('double best_confidence = detection.getConfidence();', java_code)
+        self.assertIn('Recognition current_detection = find_matching_detection(current_detections, detection.getLabel());', java_code)
+    
     def test_conditional_logic_complexity(self):
         """Test complex conditional logic"""
-        python_code = self.load_example_file('mobile_controller.py')
-        java_code = transpile_ftc_python_to_java(python_code)
+        java_code = self.example_java('mobile_controller.py')
         
         # Check for complex conditionals
-        self.assertIn('if (gamepad1.start && gamepad2.start)', java_code)
+        self.assertIn('if (g1.start && g2.start)', java_code)
         self.assertIn('} else if (', java_code)
         
         # Check for nested conditions
@@ -382,16 +543,5 @@ class TestExampleFeatures(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    # Create test suite
-    test_suite = unittest.TestSuite()
-    
-    # Add all test cases
-    test_suite.addTest(unittest.makeSuite(TestExampleTranspilation))
-    test_suite.addTest(unittest.makeSuite(TestExampleFeatures))
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
-    
-    # Exit with appropriate code
-    sys.exit(0 if result.wasSuccessful() else 1)
+    # Discover every test case in the module; exits non-zero on failure
+    unittest.main(verbosity=2)
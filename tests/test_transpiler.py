@@ -14,18 +14,79 @@ import unittest
 import sys
 import os
 import ast
-from unittest.mock import patch, mock_open
+import io
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from unittest.mock import patch
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from ftc_transpiler import FTCTranspiler, transpile_ftc_python_to_java, OpModeType
+from ftc_transpiler import FTCTranspiler, transpile_ast, transpile_ftc_python_to_java, OpModeType
+
+_MAIN_SOURCE = '@teleop("Test", "Test")\nclass Test:\n    def run(self):\n        pass'
+
+def _fake_open(path, mode='r', *args, **kwargs):
+    """Stand-in for open(): reads return _MAIN_SOURCE, writes are discarded"""
+    return io.StringIO(_MAIN_SOURCE) if 'r' in mode else io.StringIO()
+
+# Import lines the import test expects for a motor, servo and distance sensor
+_EXPECTED_IMPORTS = frozenset([
+    'import com.qualcomm.robotcore.eventloop.opmode.LinearOpMode;',
+    'import com.qualcomm.robotcore.eventloop.opmode.TeleOp;',
+    'import com.qualcomm.robotcore.hardware.DcMotor;',
+    'import com.qualcomm.robotcore.hardware.Servo;',
+    'import com.qualcomm.robotcore.hardware.DistanceSensor;',
+    'import org.firstinspires.ftc.robotcore.external.navigation.DistanceUnit;'
+])
+
+# Needles every generated OpMode must contain, interned once for all tests
+_RUN_OP_MODE_NEEDLES = tuple(sys.intern(needle) for needle in ('@Override', 'public void runOpMode()'))
+
+# Source touching every hardware kind plus gamepad input and control flow,
+# transpiled once before the tests run
+_WARMUP_SNIPPET = '''
+@teleop("Warmup", "Test")
+class WarmupRobot:
+    def init_hardware(self):
+        self.drive = motor("drive", "reverse")
+        self.claw = servo("claw")
+        self.color = color_sensor("color")
+        self.distance = distance_sensor("distance")
+        self.gyro = gyro("gyro")
+        self.touch = touch_sensor("touch")
+        self.light = light_sensor("light")
+        self.imu = imu("imu")
+        self.camera = webcam("Webcam 1")
+    
+    def run(self):
+        while opmode_is_active():
+            if gamepad1.a_button and not self.touch.is_pressed():
+                self.drive.set_power(-gamepad1.left_stick_y)
+            elif gamepad2.dpad_up:
+                self.claw.set_position(1.0)
+            else:
+                break
+            telemetry_add("Distance", self.distance.get_distance())
+'''
+
+def setUpModule():
+    """Pay the transpiler's one-time costs before the first timed test.
+    
+    Running every lowering path once means the first timed test does not
+    also absorb first-call costs such as the interpreter's warm-up of the
+    visitor methods.
+    """
+    transpile_ftc_python_to_java(_WARMUP_SNIPPET)
 
 class TestFTCTranspiler(unittest.TestCase):
     
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.transpiler = FTCTranspiler()
+    @classmethod
+    def setUpClass(cls):
+        """Set up one transpiler shared by the tests that only read its mappings."""
+        cls.transpiler = FTCTranspiler()
     
     def test_basic_class_creation(self):
         """Test basic class structure generation"""
@@ -39,8 +100,8 @@ class TestRobot:
         
         self.assertIn('@TeleOp(name="Test Robot", group="Test Group")', java_code)
         self.assertIn('public class TestRobot extends LinearOpMode', java_code)
-        self.assertIn('@Override', java_code)
-        self.assertIn('public void runOpMode()', java_code)
+        for needle in _RUN_OP_MODE_NEEDLES:
+            self.assertIn(needle, java_code)
     
     def test_autonomous_decorator(self):
         """Test autonomous OpMode decorator"""
@@ -76,6 +137,10 @@ class HardwareRobot:
         self.assertIn('private Servo test_servo = null;', java_code)
         self.assertIn('private DistanceSensor distance = null;', java_code)
         
+        # Check declarations follow the class header
+        self.assertLess(java_code.index('public class HardwareRobot extends LinearOpMode {'),
+                        java_code.index('// Hardware components'))
+        
         # Check hardware initialization
         self.assertIn('left_motor = hardwareMap.get(DcMotor.class, "left_drive");', java_code)
         self.assertIn('left_motor.setDirection(DcMotor.Direction.FORWARD);', java_code)
@@ -97,13 +162,32 @@ class MotorRobot:
         self.motor.set_mode("run_using_encoder")
         position = self.motor.get_current_position()
         self.motor.set_target_position(1000)
+        busy = self.motor.is_busy()
 '''
         java_code = transpile_ftc_python_to_java(python_code)
         
-        self.assertIn('motor.setPower(0.5);', java_code)
-        self.assertIn('motor.setMode(DcMotor.RunMode.RUN_USING_ENCODER);', java_code)
+        self.assertIn('motor_cache.setPower(0.5);', java_code)
+        self.assertIn('motor_cache.setMode(DcMotor.RunMode.RUN_USING_ENCODER);', java_code)
         self.assertIn('motor.getCurrentPosition()', java_code)
         self.assertIn('motor.setTargetPosition(1000);', java_code)
+        self.assertIn('motor.isBusy()', java_code)
+    
+    def test_imu_angle_translation(self):
+        """Test IMU heading/pitch/roll translation"""
+        python_code = '''
+@teleop("IMU Test", "Test")
+class ImuRobot:
+    def init_hardware(self):
+        self.imu = imu("imu")
+    
+    def loop(self):
+        heading = self.imu.get_heading()
+        roll = self.imu.get_roll()
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double heading = imu.getRobotYawPitchRollAngles().getYaw(AngleUnit.DEGREES);', java_code)
+        self.assertIn('double roll = imu.getRobotYawPitchRollAngles().getRoll(AngleUnit.DEGREES);', java_code)
     
     def test_gamepad_input_translation(self):
         """Test gamepad input translation"""
@@ -167,8 +251,43 @@ class TelemetryRobot:
 '''
         java_code = transpile_ftc_python_to_java(python_code)
         
-        self.assertIn('telemetry.addData("Status", "Running");', java_code)
-        self.assertIn('telemetry.addData("Power", 0.5);', java_code)
+        self.assertIn('telemetry.addData("Status", "Running")', java_code)
+        self.assertIn('.addData("Power", 0.5);', java_code)
+        self.assertNotIn('telemetry.addData("Power", 0.5);', java_code)
+    
+    def test_telemetry_update(self):
+        """Test telemetry_update flushes the chained frame once"""
+        python_code = '''
+@teleop("Telemetry Test", "Test")
+class TelemetryRobot:
+    def main_loop(self):
+        telemetry_add("Drive", 0.5)
+        telemetry_add("Turn", 0.1)
+        telemetry_update()
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('.addData("Turn", 0.1);\n        telemetry.update();', java_code)
+    
+    def test_boolean_and_comparison_expressions(self):
+        """Test comparison, and/or/not and abs translation"""
+        python_code = '''
+@teleop("Logic Test", "Test")
+class LogicRobot:
+    def loop(self):
+        if gamepad1.back and not self.prev_back:
+            self.enabled = not self.enabled
+        if abs(gamepad1.left_stick_y) > 0.05 or gamepad1.a_button:
+            self.active = True
+        if self.detections is not None:
+            self.active = False
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('if (gamepad1.back && !prev_back) {', java_code)
+        self.assertIn('enabled = !enabled;', java_code)
+        self.assertIn('if (Math.abs(gamepad1.left_stick_y) > 0.05 || gamepad1.a) {', java_code)
+        self.assertIn('if (detections != null) {', java_code)
     
     def test_mathematical_expressions(self):
         """Test mathematical expression translation"""
@@ -187,6 +306,56 @@ class MathRobot:
         self.assertIn('1.0 + 2.0 - 3.0 * 4.0 / 5.0', java_code)
         self.assertIn('-gamepad1.left_stick_y + gamepad1.right_stick_x', java_code)
     
+    def test_math_functions(self):
+        """Test math module functions lowering to java.lang.Math"""
+        python_code = '''
+@teleop("Math Test", "Test")
+class MathRobot:
+    def loop(self):
+        error = math.remainder(self.target - self.heading, 360.0)
+        dist = math.hypot(self.x, self.y)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double error = Math.IEEEremainder(target - heading, 360.0);', java_code)
+        self.assertIn('double dist = Math.hypot(x, y);', java_code)
+    
+    def test_binary_op_grouping(self):
+        """Test parenthesized Python groupings survive translation"""
+        python_code = '''
+@teleop("Math Test", "Test")
+class MathRobot:
+    def loop(self):
+        center = (self.left + self.right) / 2
+        spread = self.a - (self.b - self.c)
+        area = self.w * self.h + 1
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double center = (left + right) / 2;', java_code)
+        self.assertIn('double spread = a - (b - c);', java_code)
+        self.assertIn('double area = w * h + 1;', java_code)
+    
+    def test_augmented_assignment(self):
+        """Test augmented assignments lower to Java compound assignments"""
+        python_code = '''
+@autonomous("AugAssign Test", "Test")
+class AugAssignRobot:
+    def init_hardware(self):
+        self.step = 0
+    
+    def run(self):
+        polls = 0
+        while opmode_is_active():
+            polls += 1
+            self.step -= 2
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double polls = 0;', java_code)
+        self.assertIn('polls += 1;', java_code)
+        self.assertIn('step -= 2;', java_code)
+    
     def test_conditional_statements(self):
         """Test if/else statement translation"""
         python_code = '''
@@ -225,11 +394,14 @@ class LoopRobot:
         while count < 10:
             self.motor.set_power(0.1)
             count = count + 1
+            if count > 5:
+                break
 '''
         java_code = transpile_ftc_python_to_java(python_code)
         
         self.assertIn('while (count < 10) {', java_code)
         self.assertIn('count = count + 1;', java_code)
+        self.assertIn('break;', java_code)
     
     def test_imports_generation(self):
         """Test that proper imports are generated"""
@@ -246,17 +418,9 @@ class ImportRobot:
 '''
         java_code = transpile_ftc_python_to_java(python_code)
         
-        expected_imports = [
-            'import com.qualcomm.robotcore.eventloop.opmode.LinearOpMode;',
-            'import com.qualcomm.robotcore.eventloop.opmode.TeleOp;',
-            'import com.qualcomm.robotcore.hardware.DcMotor;',
-            'import com.qualcomm.robotcore.hardware.Servo;',
-            'import com.qualcomm.robotcore.hardware.DistanceSensor;',
-            'import org.firstinspires.ftc.robotcore.external.navigation.DistanceUnit;'
-        ]
-        
-        for import_stmt in expected_imports:
-            self.assertIn(import_stmt, java_code)
+        lines = frozenset(line.strip() for line in java_code.splitlines())
+        missing = sorted(_EXPECTED_IMPORTS - lines)
+        self.assertFalse(missing, f"Missing imports: {missing}")
     
     def test_method_parameters(self):
         """Test method with parameters"""
@@ -275,7 +439,599 @@ class MethodRobot:
         java_code = transpile_ftc_python_to_java(python_code)
         
         self.assertIn('private void set_motor_power(double power) {', java_code)
-        self.assertIn('motor.setPower(power);', java_code)
+        self.assertIn('motor_cache.setPower(power);', java_code)
+    
+    def test_mecanum_drive_builtin(self):
+        """Test mecanum_drive builtin lowering to the fused mixer helper"""
+        python_code = '''
+@teleop("Mecanum Test", "Test")
+class MecanumRobot:
+    def init_hardware(self):
+        self.fl = motor("fl", "forward")
+        self.fr = motor("fr", "reverse")
+        self.bl = motor("bl", "forward")
+        self.br = motor("br", "reverse")
+    
+    def run(self):
+        mecanum_drive(0.5, 0.1, 0.2, self.fl, self.fr, self.bl, self.br)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('MecanumMixer.apply(0.5, 0.1, 0.2, fl_cache, fr_cache, bl_cache, br_cache);', java_code)
+        self.assertIn('private static final double[] SIGNS = {', java_code)
+        self.assertIn('private static final class MecanumMixer {', java_code)
+        self.assertIn('double inv = 1.0 / Double.longBitsToDouble(maxBits);', java_code)
+        self.assertIn('double[] powers = new double[4];', java_code)
+        self.assertNotIn('static final double[] POWERS', java_code)
+        self.assertEqual(java_code.count('new double[4]'), 1)
+        self.assertEqual(java_code.count('class MecanumMixer'), 1)
+    
+    def test_mecanum_drive_specialization(self):
+        """Test literal-zero strafe/drive arguments select the specialized mixers"""
+        python_code = '''
+@teleop("Mecanum Test", "Test")
+class MecanumRobot:
+    def init_hardware(self):
+        self.fl = motor("fl", "forward")
+        self.fr = motor("fr", "reverse")
+        self.bl = motor("bl", "forward")
+        self.br = motor("br", "reverse")
+    
+    def run(self):
+        mecanum_drive(self.drive, 0, self.turn, self.fl, self.fr, self.bl, self.br)
+        mecanum_drive(0, 0.0, 0.3, self.fl, self.fr, self.bl, self.br)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('MecanumMixer.applyNoStrafe(drive, turn, fl_cache, fr_cache, bl_cache, br_cache);', java_code)
+        self.assertIn('MecanumMixer.applyPureTurn(0.3, fl_cache, fr_cache, bl_cache, br_cache);', java_code)
+        self.assertNotIn('MecanumMixer.apply(', java_code)
+    
+    def test_clamp_builtin(self):
+        """Test clamp builtin lowering to Range.clip"""
+        python_code = '''
+@teleop("Clamp Test", "Test")
+class ClampRobot:
+    def run(self):
+        self.loop()
+    
+    def loop(self):
+        power = clamp(gamepad1.left_stick_y, -0.5, 0.5)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double power = Range.clip(gamepad1.left_stick_y, -0.5, 0.5);', java_code)
+        self.assertIn('import com.qualcomm.robotcore.util.Range;', java_code)
+    
+    def test_max_min_builtins(self):
+        """Test max/min lowering to nested Math.max/Math.min"""
+        python_code = '''
+@teleop("Max Test", "Test")
+class MaxRobot:
+    def loop(self):
+        peak = max(1.0, abs(gamepad1.left_stick_y), abs(gamepad1.right_stick_x))
+        low = min(gamepad1.left_trigger, 0.5)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double peak = Math.max(Math.max(1.0, Math.abs(gamepad1.left_stick_y)), Math.abs(gamepad1.right_stick_x));', java_code)
+        self.assertIn('double low = Math.min(gamepad1.left_trigger, 0.5);', java_code)
+    
+    def test_motor_power_cache(self):
+        """Test motors get a PowerCache that skips repeated setPower commands"""
+        python_code = '''
+@teleop("Cache Test", "Test")
+class CacheRobot:
+    def init_hardware(self):
+        self.arm = motor("arm", "forward")
+        self.claw = servo("claw")
+    
+    def stop(self):
+        self.arm.set_mode("run_without_encoder")
+        self.arm.set_power(0)
+        self.claw.set_position(0.0)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private PowerCache arm_cache = null;', java_code)
+        self.assertIn('arm_cache = new PowerCache(arm);', java_code)
+        self.assertIn('arm_cache.setPower(0);', java_code)
+        self.assertIn('private static final class PowerCache {', java_code)
+        self.assertIn('if (power != lastPower) {', java_code)
+        self.assertIn('arm_cache.setMode(DcMotor.RunMode.RUN_WITHOUT_ENCODER);', java_code)
+        self.assertIn('if (mode != lastMode || mode == DcMotor.RunMode.STOP_AND_RESET_ENCODER) {', java_code)
+        self.assertNotIn('claw_cache', java_code)
+    
+    def test_set_powers_builtin(self):
+        """Test set_powers lowers to one PowerCache.setAll call"""
+        python_code = '''
+@teleop("Stop Test", "Test")
+class StopRobot:
+    def init_hardware(self):
+        self.left = motor("left", "forward")
+        self.right = motor("right", "reverse")
+    
+    def stop_all_motors(self):
+        set_powers(0, self.left, self.right)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('PowerCache.setAll(0, left_cache, right_cache);', java_code)
+        self.assertIn('static void setAll(double power, PowerCache... motors) {', java_code)
+    
+    def test_uncached_motor_arguments(self):
+        """Test motors without a cache field are wrapped for the PowerCache helpers"""
+        python_code = '''
+@teleop("Uncached Test", "Test")
+class UncachedRobot:
+    def init_hardware(self):
+        self.left = motor("left", "forward")
+    
+    def stop_pair(self, other: DcMotor):
+        set_powers(0, self.left, other)
+    
+    def turn_with(self, fl: DcMotor, fr: DcMotor, bl: DcMotor, br: DcMotor):
+        mecanum_drive(0, 0, 0.3, fl, fr, bl, br)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('PowerCache.setAll(0, left_cache, new PowerCache(other));', java_code)
+        self.assertIn('MecanumMixer.applyPureTurn(0.3, new PowerCache(fl), new PowerCache(fr), '
+                      'new PowerCache(bl), new PowerCache(br));', java_code)
+    
+    def test_gamepad_snapshot(self):
+        """Test gamepad snapshots are declared, copied and read as plain Gamepad objects"""
+        python_code = '''
+@teleop("Snapshot Test", "Test")
+class SnapshotRobot:
+    def init_hardware(self):
+        self.g1 = gamepad_snapshot()
+    
+    def control_loop(self):
+        self.g1.copy(gamepad1)
+        drive = -self.g1.left_stick_y
+        if self.g1.a_button:
+            drive = 0
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('import com.qualcomm.robotcore.hardware.Gamepad;', java_code)
+        self.assertIn('private Gamepad g1 = null;', java_code)
+        self.assertIn('g1 = new Gamepad();', java_code)
+        self.assertIn('g1.copy(gamepad1);', java_code)
+        self.assertIn('double drive = -g1.left_stick_y;', java_code)
+        self.assertIn('if (g1.a) {', java_code)
+    
+    def test_state_field_declarations(self):
+        """Test constant-initialized state in init_hardware becomes typed fields"""
+        python_code = '''
+@teleop("State Test", "Test")
+class StateRobot:
+    def init_hardware(self):
+        self.left_drive = motor("left_drive", "forward")
+        self.drive_speed = 1.0
+        self.auto_align = True
+        self.step = 0
+        self.mode = "NORMAL"
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private double drive_speed;', java_code)
+        self.assertIn('private boolean auto_align;', java_code)
+        self.assertIn('private int step;', java_code)
+        self.assertIn('private Mode mode;', java_code)
+        self.assertIn('drive_speed = 1.0;', java_code)
+        self.assertIn('auto_align = true;', java_code)
+    
+    def test_annotated_and_inferred_types(self):
+        """Test annotations and detection getters give fields and locals Java types"""
+        python_code = '''
+@autonomous("Typed Test", "Test")
+class TypedRobot:
+    def init_hardware(self):
+        self.tfod = tensorflow_processor()
+        self.last_detections: list[Recognition] = None
+        self.best: Recognition = None
+        self.pending = None
+    
+    def poll(self, label: str) -> list[Recognition]:
+        fresh = self.tfod.get_fresh_recognitions()
+        status = "idle"
+        self.last_detections = fresh
+        return self.last_detections
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('import java.util.List;', java_code)
+        self.assertIn('import org.firstinspires.ftc.robotcore.external.tfod.Recognition;', java_code)
+        self.assertIn('private List<Recognition> last_detections;', java_code)
+        self.assertIn('private Recognition best;', java_code)
+        self.assertIn('private Object pending;', java_code)
+        self.assertIn('last_detections = null;', java_code)
+        self.assertIn('private List<Recognition> poll(String label) {', java_code)
+        self.assertIn('List<Recognition> fresh = tfod.getFreshRecognitions();', java_code)
+        self.assertIn('String status = "idle";', java_code)
+    
+    def test_return_for_and_local_declarations(self):
+        """Test returns, for loops and self calls lower, and locals are declared once"""
+        python_code = '''
+@autonomous("Loop Test", "Test")
+class LoopRobot:
+    def pick(self, detections: list[Recognition], label: str) -> Recognition:
+        if not detections:
+            return None
+        best = 0.0
+        for detection in detections:
+            if detection.label == label and detection.confidence > best:
+                best = detection.confidence
+        for i in range(3):
+            sleep(10)
+        return None
+    
+    def scale(self, power):
+        if power > 0.5:
+            limited = 0.5
+        elif power < -0.5:
+            limited = -0.5
+        else:
+            limited = power
+        return limited * 2
+    
+    def run(self):
+        result = self.scale(0.8)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private Recognition pick(List<Recognition> detections, String label) {', java_code)
+        self.assertIn('if (detections == null || detections.isEmpty()) {', java_code)
+        self.assertIn('return null;', java_code)
+        self.assertIn('for (Recognition detection : detections) {', java_code)
+        self.assertIn('if (detection.getLabel().equals(label) && detection.getConfidence() > best) {', java_code)
+        self.assertIn('best = detection.getConfidence();', java_code)
+        self.assertIn('for (int i = 0; i < 3; i++) {', java_code)
+        self.assertIn('private double scale(double power) {', java_code)
+        self.assertIn('double limited = 0.0;', java_code)
+        self.assertIn('limited = 0.5;', java_code)
+        self.assertIn('} else if (power < -0.5) {', java_code)
+        self.assertIn('limited = -0.5;', java_code)
+        self.assertIn('limited = power;', java_code)
+        self.assertIn('return limited * 2;', java_code)
+        self.assertIn('double result = scale(0.8);', java_code)
+        self.assertEqual(java_code.count('double best'), 1)
+    
+    def test_inferred_return_type_at_call_site(self):
+        """Test a call to an unannotated method takes its inferred return type"""
+        python_code = '''
+@autonomous("Return Type Test", "Test")
+class ReturnTypeRobot:
+    def init_hardware(self):
+        self.tags = apriltag_processor()
+    
+    def run(self):
+        detections = self.get_detections()
+        status = self.describe(3)
+        if detections:
+            telemetry_add("Status", status)
+    
+    def get_detections(self):
+        return self.tags.get_detections()
+    
+    def describe(self, count):
+        text = "Tags: " + "seen"
+        return text
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('List<AprilTagDetection> detections = get_detections();', java_code)
+        self.assertIn('String status = describe(3);', java_code)
+        self.assertIn('if (detections != null && !detections.isEmpty()) {', java_code)
+        self.assertIn('private List<AprilTagDetection> get_detections() {', java_code)
+        self.assertIn('private String describe(double count) {', java_code)
+    
+    def test_list_subscript(self):
+        """Test indexing a typed list lowers to List.get()"""
+        python_code = '''
+@autonomous("Subscript Test", "Test")
+class SubscriptRobot:
+    def pick(self, detections: list[Recognition], count):
+        first = detections[0]
+        last = detections[-1]
+        for i in range(3):
+            nth = detections[i]
+        middle = detections[count / 2]
+        return first
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('Recognition first = detections.get(0);', java_code)
+        self.assertIn('Recognition last = detections.get(detections.size() - 1);', java_code)
+        self.assertIn('Recognition nth = detections.get(i);', java_code)
+        self.assertIn('Recognition middle = detections.get((int) (count / 2));', java_code)
+        self.assertIn('private Recognition pick(List<Recognition> detections, double count) {', java_code)
+    
+    def test_apriltag_detection_fields(self):
+        """Test AprilTag detection fields lower to the SDK's fields and types"""
+        python_code = '''
+@autonomous("Tag Field Test", "Test")
+class TagFieldRobot:
+    def handle(self, detection: AprilTagDetection, name: str):
+        tag_id = detection.id
+        pose = detection.ftc_pose
+        bearing = detection.ftc_pose.bearing
+        if name:
+            telemetry_add("Tag", tag_id)
+        if not name:
+            telemetry_add("Range", pose.range)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private void handle(AprilTagDetection detection, String name) {', java_code)
+        self.assertIn('int tag_id = detection.id;', java_code)
+        self.assertIn('AprilTagPoseFtc pose = detection.ftcPose;', java_code)
+        self.assertIn('import org.firstinspires.ftc.vision.apriltag.AprilTagPoseFtc;', java_code)
+        self.assertIn('double bearing = detection.ftcPose.bearing;', java_code)
+        self.assertIn('if (name != null && !name.isEmpty()) {', java_code)
+        self.assertIn('if (name == null || name.isEmpty()) {', java_code)
+        self.assertIn('telemetry.addData("Range", pose.range);', java_code)
+    
+    def test_field_assigned_from_builtin(self):
+        """Test fields assigned from non-hardware builtins keep the assignment"""
+        python_code = '''
+@teleop("Builtin Field Test", "Test")
+class BuiltinFieldRobot:
+    def init_hardware(self):
+        self.sequence_deadline = 0.0
+        self.offset = 0.0
+    
+    def start(self, error):
+        self.sequence_deadline = runtime_ms()
+        self.offset = abs(error)
+        self.offset = dashboard_get("Offset")
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('sequence_deadline = getRuntime() * 1000;', java_code)
+        self.assertIn('offset = Math.abs(error);', java_code)
+        self.assertIn('// offset = /* UNKNOWN CALL */;', java_code)
+    
+    def test_class_constants(self):
+        """Test class-level literals lower to static constants and switch lookups"""
+        python_code = '''
+@teleop("Constant Test", "Test")
+class ConstantRobot:
+    HOLD_POWER = 0.5
+    COUNTS_PER_INCH = 1120.0 / (4.0 * math.pi)
+    ARM_PRESET_TICKS = {"HOME": 0, "HIGH": 1500}
+    TAG_NAMES = {1: "Left", 2: "Right"}
+    
+    def move_arm(self, position: str):
+        target = self.ARM_PRESET_TICKS.get(position, -1)
+        counts = int(12 * self.COUNTS_PER_INCH)
+        name = self.TAG_NAMES.get(2, None)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private static final double HOLD_POWER = 0.5;', java_code)
+        self.assertIn('private static int get_arm_preset_ticks(String key, int fallback) {', java_code)
+        self.assertIn('case "HIGH": return 1500;', java_code)
+        self.assertIn('private void move_arm(String position) {', java_code)
+        self.assertIn('int target = get_arm_preset_ticks(position, -1);', java_code)
+        self.assertIn('private static String get_tag_names(int key, String fallback) {', java_code)
+        self.assertIn('String name = get_tag_names(2, null);', java_code)
+        self.assertIn('private static final double COUNTS_PER_INCH = 1120.0 / (4.0 * Math.PI);', java_code)
+        self.assertIn('double counts = (int) (12 * COUNTS_PER_INCH);', java_code)
+    
+    def test_class_constant_types(self):
+        """Test class-level arithmetic is typed from its operands"""
+        python_code = '''
+@teleop("Constant Type Test", "Test")
+class ConstantTypeRobot:
+    GREETING = "Hello, " + "driver"
+    TICKS_PER_REV = 1120 * 2
+    HALF_REV = TICKS_PER_REV / 2
+    AREA = 2 ** 10
+    STEPS = -7 // 2
+    FLAGS = 1 << 4 | 1
+    REPEATED = "a" * 3
+    
+    def run(self):
+        if self.FLAGS & 1 == 0:
+            sleep(10)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private static final String GREETING = "Hello, " + "driver";', java_code)
+        self.assertIn('private static final int TICKS_PER_REV = 1120 * 2;', java_code)
+        self.assertIn('private static final double HALF_REV = (double) TICKS_PER_REV / 2;', java_code)
+        self.assertIn('private static final double AREA = Math.pow(2, 10);', java_code)
+        self.assertIn('private static final double STEPS = Math.floor((double) (-7) / 2);', java_code)
+        self.assertIn('private static final int FLAGS = 1 << 4 | 1;', java_code)
+        self.assertIn('if ((FLAGS & 1) == 0) {', java_code)
+        self.assertNotIn('REPEATED', java_code)
+    
+    def test_string_state_enum_promotion(self):
+        """Test literal-only string state becomes an enum and other strings use equals()"""
+        python_code = '''
+@teleop("Enum Test", "Test")
+class EnumRobot:
+    def init_hardware(self):
+        self.drive_mode = "NORMAL"
+        self.arm_position = "HOME"
+    
+    def loop(self):
+        if gamepad1.left_bumper:
+            self.drive_mode = "TURBO"
+        if self.drive_mode == "TURBO":
+            telemetry_add("Mode", self.drive_mode)
+    
+    def move_arm(self, position):
+        self.arm_position = position
+        if self.arm_position != "HOME":
+            telemetry_add("Arm", self.arm_position)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private enum DriveMode { NORMAL, TURBO }', java_code)
+        self.assertIn('private DriveMode drive_mode;', java_code)
+        self.assertIn('drive_mode = DriveMode.TURBO;', java_code)
+        self.assertIn('if (drive_mode == DriveMode.TURBO) {', java_code)
+        self.assertIn('private String arm_position;', java_code)
+        self.assertIn('if (!"HOME".equals(arm_position)) {', java_code)
+    
+    def test_runtime_ms_builtin(self):
+        """Test runtime_ms builtin lowering to getRuntime()"""
+        python_code = '''
+@teleop("Runtime Test", "Test")
+class RuntimeRobot:
+    def run(self):
+        self.loop()
+    
+    def loop(self):
+        now = runtime_ms()
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('double now = getRuntime() * 1000;', java_code)
+    
+    def test_at_rate_loop(self):
+        """Test at_rate context lowering to a fixed-period deadline loop"""
+        python_code = '''
+@teleop("Rate Test", "Test")
+class RateRobot:
+    def init_hardware(self):
+        self.arm = motor("arm", "forward")
+    
+    def run(self):
+        with at_rate(50):
+            self.arm.set_power(0.5)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('import java.util.concurrent.locks.LockSupport;', java_code)
+        self.assertIn('long tick_deadline_ns = System.nanoTime();', java_code)
+        self.assertIn('while (opModeIsActive()) {', java_code)
+        self.assertIn('LockSupport.parkNanos(wait_ns);', java_code)
+        self.assertIn('tick_deadline_ns += 20000000L;', java_code)
+        self.assertIn('arm_cache.setPower(0.5);', java_code)
+        self.assertNotIn('sleep(', java_code)
+    
+    def test_at_rate_loops_in_one_method(self):
+        """Test each at_rate loop declares its own deadline and a bad rate is an error"""
+        python_code = '''
+@teleop("Two Rate Test", "Test")
+class TwoRateRobot:
+    def run(self):
+        with at_rate(50):
+            sleep_ms = 0
+        with at_rate(10):
+            sleep_ms = 1
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertEqual(java_code.count('long tick_deadline_ns = System.nanoTime();'), 1)
+        self.assertIn('long tick_deadline_ns_2 = System.nanoTime();', java_code)
+        self.assertIn('tick_deadline_ns_2 += 100000000L;', java_code)
+        self.assertIn('long wait_ns_2;', java_code)
+        
+        for rate in ('0', '-5', 'rate'):
+            with self.subTest(rate=rate):
+                with self.assertRaisesRegex(ValueError, 'at_rate\\(\\) needs a positive rate'):
+                    transpile_ast(ast.parse(python_code.replace('at_rate(10)', f'at_rate({rate})')))
+    
+    def test_apriltag_vision_portal(self):
+        """Test AprilTag processor and vision portal lowering to SDK builders"""
+        python_code = '''
+@autonomous("Vision Test", "Test")
+class VisionRobot:
+    def init_hardware(self):
+        self.webcam = webcam("Webcam 1")
+        self.apriltag = apriltag_processor({"decimation": 2, "num_threads": 4, "sigma": 0.0})
+        self.portal = vision_portal(self.webcam, self.apriltag)
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('private WebcamName webcam = null;', java_code)
+        self.assertIn('private AprilTagProcessor apriltag = null;', java_code)
+        self.assertIn('private VisionPortal portal = null;', java_code)
+        self.assertIn('webcam = hardwareMap.get(WebcamName.class, "Webcam 1");', java_code)
+        self.assertIn('apriltag = new AprilTagProcessor.Builder()', java_code)
+        self.assertIn('.setNumThreads(4)', java_code)
+        self.assertIn('apriltag.setDecimation(2);', java_code)
+        self.assertIn('.setCamera(webcam)', java_code)
+        self.assertIn('.addProcessor(apriltag)', java_code)
+        self.assertNotIn('sigma', java_code)
+    
+    def test_vision_portal_options(self):
+        """Test vision_portal config keys map to VisionPortal.Builder setters"""
+        python_code = '''
+@autonomous("Portal Test", "Test")
+class PortalRobot:
+    def init_hardware(self):
+        self.webcam = webcam("Webcam 1")
+        self.apriltag = apriltag_processor()
+        self.portal = vision_portal(self.webcam, self.apriltag, {
+            "stream_format": "YUY2",
+            "camera_resolution": [640, 480],
+            "live_view": False,
+            "auto_stop_live_view": True
+        })
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('.addProcessor(apriltag)', java_code)
+        self.assertIn('.setStreamFormat(VisionPortal.StreamFormat.YUY2)', java_code)
+        self.assertIn('.setCameraResolution(new Size(640, 480))', java_code)
+        self.assertIn('import android.util.Size;', java_code)
+        self.assertIn('.enableLiveView(false)', java_code)
+        self.assertIn('.setAutoStopLiveView(true)', java_code)
+    
+    def test_tensorflow_processor_config(self):
+        """Test tensorflow_processor config lowering to TfodProcessor.Builder"""
+        python_code = '''
+@autonomous("Tfod Test", "Test")
+class TfodRobot:
+    def init_hardware(self):
+        self.tfod = tensorflow_processor({
+            "model_asset_name": "PowerPlay_int8.tflite",
+            "model_labels": ["Bolt", "Bulb"],
+            "is_model_quantized": True,
+            "input_size": 300,
+            "confidence_threshold": 0.7,
+            "num_executor_threads": 2,
+            "num_detector_threads": 2
+        })
+        self.default_tfod = tensorflow_processor()
+        self.fp16_tfod = tensorflow_processor({"precision": "fp16"})
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('tfod = new TfodProcessor.Builder()', java_code)
+        self.assertIn('.setModelAssetName("PowerPlay_int8.tflite")', java_code)
+        self.assertIn('.setModelLabels(new String[] {"Bolt", "Bulb"})', java_code)
+        self.assertIn('.setIsModelQuantized(true)', java_code)
+        self.assertIn('.setModelInputSize(300)', java_code)
+        self.assertIn('tfod.setMinResultConfidence((float) 0.7);', java_code)
+        self.assertIn('.setNumExecutorThreads(2)', java_code)
+        self.assertIn('.setNumDetectorThreads(2)', java_code)
+        self.assertIn('default_tfod = TfodProcessor.easyCreateWithDefaults();', java_code)
+        self.assertIn('.setIsModelQuantized(false)', java_code)
+    
+    def test_vision_detection_methods(self):
+        """Test detection polling methods lower to the processor getters"""
+        python_code = '''
+@autonomous("Detection Test", "Test")
+class DetectionRobot:
+    def init_hardware(self):
+        self.apriltag = apriltag_processor()
+    
+    def run(self):
+        fresh = self.apriltag.get_fresh_detections()
+        current = self.apriltag.get_detections()
+'''
+        java_code = transpile_ftc_python_to_java(python_code)
+        
+        self.assertIn('apriltag.getFreshDetections()', java_code)
+        self.assertIn('apriltag.getDetections()', java_code)
     
     def test_error_handling(self):
         """Test error handling for invalid Python code"""
@@ -292,41 +1048,43 @@ class ErrorRobot
     
     def test_hardware_type_mapping(self):
         """Test hardware type mapping"""
-        transpiler = FTCTranspiler()
-        
-        self.assertEqual(transpiler.hardware_types['motor'], 'DcMotor')
-        self.assertEqual(transpiler.hardware_types['servo'], 'Servo')
-        self.assertEqual(transpiler.hardware_types['distance_sensor'], 'DistanceSensor')
-        self.assertEqual(transpiler.hardware_types['color_sensor'], 'ColorSensor')
-        self.assertEqual(transpiler.hardware_types['imu'], 'IMU')
+        for dsl_type, java_type in (('motor', 'DcMotor'),
+                                    ('servo', 'Servo'),
+                                    ('distance_sensor', 'DistanceSensor'),
+                                    ('color_sensor', 'ColorSensor'),
+                                    ('imu', 'IMU')):
+            with self.subTest(dsl_type=dsl_type):
+                self.assertEqual(self.transpiler.hardware_types[dsl_type], java_type)
     
     def test_motor_direction_mapping(self):
         """Test motor direction mapping"""
-        transpiler = FTCTranspiler()
-        
-        self.assertEqual(transpiler.motor_directions['forward'], 'DcMotor.Direction.FORWARD')
-        self.assertEqual(transpiler.motor_directions['reverse'], 'DcMotor.Direction.REVERSE')
+        for direction, java_direction in (('forward', 'DcMotor.Direction.FORWARD'),
+                                          ('reverse', 'DcMotor.Direction.REVERSE')):
+            with self.subTest(direction=direction):
+                self.assertEqual(self.transpiler.motor_directions[direction], java_direction)
     
     def test_gamepad_attribute_mapping(self):
         """Test gamepad attribute mapping"""
-        transpiler = FTCTranspiler()
-        
-        self.assertEqual(transpiler.convert_gamepad_attr('left_stick_y'), 'left_stick_y')
-        self.assertEqual(transpiler.convert_gamepad_attr('a_button'), 'a')
-        self.assertEqual(transpiler.convert_gamepad_attr('dpad_up'), 'dpad_up')
-        self.assertEqual(transpiler.convert_gamepad_attr('left_bumper'), 'left_bumper')
+        for attr, java_attr in (('left_stick_y', 'left_stick_y'),
+                                ('a_button', 'a'),
+                                ('dpad_up', 'dpad_up'),
+                                ('left_bumper', 'left_bumper')):
+            with self.subTest(attr=attr):
+                self.assertEqual(self.transpiler.convert_gamepad_attr(attr), java_attr)
     
     def test_binary_operator_conversion(self):
         """Test binary operator conversion"""
-        transpiler = FTCTranspiler()
-        
-        self.assertEqual(transpiler.convert_binary_op(ast.Add()), '+')
-        self.assertEqual(transpiler.convert_binary_op(ast.Sub()), '-')
-        self.assertEqual(transpiler.convert_binary_op(ast.Mult()), '*')
-        self.assertEqual(transpiler.convert_binary_op(ast.Div()), '/')
-        self.assertEqual(transpiler.convert_binary_op(ast.Lt()), '<')
-        self.assertEqual(transpiler.convert_binary_op(ast.Gt()), '>')
-        self.assertEqual(transpiler.convert_binary_op(ast.Eq()), '==')
+        for op_type, java_op in ((ast.Add, '+'),
+                                 (ast.Sub, '-'),
+                                 (ast.Mult, '*'),
+                                 (ast.Div, '/'),
+                                 (ast.BitAnd, '&'),
+                                 (ast.LShift, '<<'),
+                                 (ast.Lt, '<'),
+                                 (ast.Gt, '>'),
+                                 (ast.Eq, '==')):
+            with self.subTest(op=op_type.__name__):
+                self.assertEqual(self.transpiler.convert_binary_op(op_type()), java_op)
     
     def test_complex_robot_example(self):
         """Test a complex robot example with multiple features"""
@@ -386,22 +1144,25 @@ class ComplexRobot:
         self.assertIn('private DcMotor left_drive = null;', java_code)
         self.assertIn('private Servo claw_servo = null;', java_code)
         self.assertIn('private DistanceSensor distance_sensor = null;', java_code)
-        self.assertIn('left_drive.setMode(DcMotor.RunMode.RUN_USING_ENCODER);', java_code)
+        self.assertIn('left_drive_cache.setMode(DcMotor.RunMode.RUN_USING_ENCODER);', java_code)
         self.assertIn('if (gamepad2.a) {', java_code)
         self.assertIn('if (distance < 10) {', java_code)
-        self.assertIn('telemetry.addData("Distance", distance);', java_code)
+        self.assertIn('telemetry.addData("Drive", drive)', java_code)
+        self.assertIn('.addData("Distance", distance);', java_code)
 
 
 class TestTranspilerIntegration(unittest.TestCase):
     """Integration tests for the transpiler"""
     
-    @patch('builtins.open', new_callable=mock_open, read_data='@teleop("Test", "Test")\nclass Test:\n    def run(self):\n        pass')
-    @patch('sys.argv', ['ftc_transpiler.py', 'input.py', 'output.java'])
-    def test_main_function_file_processing(self, mock_file):
+    def test_main_function_file_processing(self):
         """Test main function file processing"""
         from ftc_transpiler import main
         
-        with patch('builtins.print') as mock_print:
+        with ExitStack() as stack:
+            stack.enter_context(patch('builtins.open', _fake_open))
+            stack.enter_context(patch('sys.argv', ['ftc_transpiler.py', 'input.py', 'output.java']))
+            mock_print = stack.enter_context(patch('builtins.print'))
+            
             main()
             mock_print.assert_called_with("Successfully transpiled input.py to output.java")
     
@@ -415,8 +1176,8 @@ class EmptyRobot:
         java_code = transpile_ftc_python_to_java(python_code)
         
         self.assertIn('public class EmptyRobot extends LinearOpMode', java_code)
-        self.assertIn('@Override', java_code)
-        self.assertIn('public void runOpMode()', java_code)
+        for needle in _RUN_OP_MODE_NEEDLES:
+            self.assertIn(needle, java_code)
     
     def test_no_decorator(self):
         """Test class without OpMode decorator"""
@@ -432,19 +1193,73 @@ class NoDecoratorRobot:
         # But no OpMode annotation
         self.assertNotIn('@TeleOp', java_code)
         self.assertNotIn('@Autonomous', java_code)
+    
+    def test_repeat_transpile_is_identical(self):
+        """Test transpiling the same source twice reuses the parse safely"""
+        python_code = '''
+@teleop("Repeat", "Test")
+class RepeatRobot:
+    def init_hardware(self):
+        self.arm = motor("arm")
+    
+    def run(self):
+        self.arm.set_power(0.5)
+'''
+        first = transpile_ftc_python_to_java(python_code)
+        second = transpile_ftc_python_to_java(python_code)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(first.count('private DcMotor arm = null;'), 1)
+    
+    def test_transpile_ast_matches_source_entry_point(self):
+        """Test transpiling a parsed tree matches transpiling its source"""
+        python_code = '''
+@teleop("Tree Test")
+class TreeRobot:
+    def init_hardware(self):
+        self.arm = motor("arm")
+    
+    def run(self):
+        self.arm.set_power(0.5)
+'''
+        self.assertEqual(transpile_ast(ast.parse(python_code)),
+                         transpile_ftc_python_to_java(python_code))
+    
+    def test_transpile_daemon_round_trip(self):
+        """Test the daemon answers each JSON source line with its Java"""
+        sources = [_MAIN_SOURCE, _MAIN_SOURCE.replace('class Test', 'class Other')]
+        daemon = os.path.join(os.path.dirname(__file__), 'transpile_daemon.py')
+        result = subprocess.run([sys.executable, daemon], capture_output=True, text=True,
+                                input=''.join(json.dumps(source) + '\n' for source in sources))
+        
+        self.assertEqual([json.loads(line) for line in result.stdout.splitlines()],
+                         [transpile_ftc_python_to_java(source) for source in sources])
 
 
-if __name__ == '__main__':
-    # Create test suite
-    test_suite = unittest.TestSuite()
+def _run_parallel():
+    """Run each test class in its own interpreter, one per core.
     
-    # Add all test cases
-    test_suite.addTest(unittest.makeSuite(TestFTCTranspiler))
-    test_suite.addTest(unittest.makeSuite(TestTranspilerIntegration))
+    A fresh interpreter costs far more than a single test here, so work is
+    split per class rather than per test method.
+    """
+    loader = unittest.TestLoader()
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    class_ids = [f"{module}.{case_class.__name__}"
+                 for case_class in (TestFTCTranspiler, TestTranspilerIntegration)
+                 if loader.loadTestsFromTestCase(case_class).countTestCases()]
     
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
+    def run_class(class_id):
+        return subprocess.run([sys.executable, '-m', 'unittest', class_id], cwd=test_dir).returncode
+    
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return_codes = list(executor.map(run_class, class_ids))
+    return 0 if all(code == 0 for code in return_codes) else 1
+
+
+if __name__ == '__main__':
+    if '--parallel' in sys.argv:
+        sys.exit(_run_parallel())
     
-    # Exit with appropriate code
-    sys.exit(0 if result.wasSuccessful() else 1)
+    # Discover every test case in the module; exits non-zero on failure
+    unittest.main(verbosity=2)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the version management utility
+
+Tests version parsing and bumping, and the git integration against a
+throwaway repository:
+- Commit and tag creation
+- Failing commits
+- Git status reporting
+"""
+
+import unittest
+import sys
+import os
+import io
+import stat
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from version_manager import VersionManager
+
+def _git(*args):
+    return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+
+class TestVersionManager(unittest.TestCase):
+    """Test cases for VersionManager"""
+
+    def setUp(self):
+        """Set up a fresh git repository as the working directory"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_cwd = os.getcwd()
+        os.chdir(self._tmp.name)
+        _git('init', '-q', '-b', 'main')
+        _git('config', 'user.name', 'Test')
+        _git('config', 'user.email', 'test@example.com')
+        _git('config', 'commit.gpgsign', 'false')
+        self.vm = VersionManager()
+
+    def tearDown(self):
+        os.chdir(self._old_cwd)
+        self._tmp.cleanup()
+
+    def run_quietly(self, func, *args):
+        """Call a VersionManager method, returning its result and what it printed"""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            result = func(*args)
+        return result, out.getvalue()
+
+    def test_bump_version(self):
+        """Test each bump type resets the lower components"""
+        self.vm.set_version("1.2.3")
+        self.assertEqual(self.vm.bump_version("patch"), ("1.2.3", "1.2.4"))
+        self.assertEqual(self.vm.bump_version("minor"), ("1.2.4", "1.3.0"))
+        self.assertEqual(self.vm.bump_version("major"), ("1.3.0", "2.0.0"))
+
+        with open("VERSION") as f:
+            self.assertEqual(f.read(), "2.0.0")
+        with self.assertRaises(ValueError):
+            self.vm.bump_version("build")
+
+    def test_invalid_version(self):
+        """Test malformed versions are rejected"""
+        with open("VERSION", "w") as f:
+            f.write("1.2")
+
+        with self.assertRaises(ValueError):
+            VersionManager().get_current_version()
+        with self.assertRaises(ValueError):
+            self.vm.set_version("v1.0.0")
+
+    def test_commit_and_tag(self):
+        """Test a version change is committed and tagged"""
+        self.vm.set_version("0.1.0")
+
+        committed, _ = self.run_quietly(self.vm.git_commit_version, "0.1.0")
+        tagged, _ = self.run_quietly(self.vm.git_tag_version, "0.1.0")
+
+        self.assertTrue(committed)
+        self.assertTrue(tagged)
+        self.assertEqual(_git('log', '-1', '--format=%s'), 'Bump version to 0.1.0')
+        self.assertEqual(_git('tag', '--list'), 'v0.1.0')
+
+    def test_git_output_is_not_captured(self):
+        """Test git's own output is left on the terminal, not swallowed"""
+        self.vm.set_version("0.1.0")
+
+        with patch('version_manager.subprocess.run', wraps=subprocess.run) as run:
+            self.run_quietly(self.vm.git_commit_version, "0.1.0")
+            self.run_quietly(self.vm.git_tag_version, "0.1.0")
+
+        for call in run.call_args_list:
+            command = call.args[0]
+            if command[1] in ('add', 'commit', 'tag'):
+                self.assertNotIn('capture_output', call.kwargs, command)
+                self.assertNotIn('stdout', call.kwargs, command)
+                self.assertNotIn('stderr', call.kwargs, command)
+
+    def test_failed_commit(self):
+        """Test a commit rejected by a hook is reported as a failure"""
+        hook = os.path.join('.git', 'hooks', 'pre-commit')
+        with open(hook, 'w') as f:
+            f.write('#!/bin/sh\nexit 1\n')
+        os.chmod(hook, os.stat(hook).st_mode | stat.S_IEXEC)
+        self.vm.set_version("0.1.0")
+
+        committed, output = self.run_quietly(self.vm.git_commit_version, "0.1.0")
+
+        self.assertFalse(committed)
+        self.assertIn('Error committing version: git commit exited with 1', output)
+
+    def test_git_status(self):
+        """Test the branch, short commit hash and changes flag"""
+        self.assertIsNone(self.vm.get_git_status())
+
+        self.vm.set_version("0.1.0")
+        self.run_quietly(self.vm.git_commit_version, "0.1.0")
+        status = self.vm.get_git_status()
+
+        self.assertEqual(status['current_branch'], 'main')
+        self.assertEqual(status['latest_commit'], _git('rev-parse', '--short', 'HEAD'))
+        self.assertFalse(status['has_changes'])
+
+        self.vm.set_version("0.2.0")
+        self.assertTrue(self.vm.get_git_status()['has_changes'])
+
+    def test_not_a_git_repo(self):
+        """Test git steps are skipped outside a repository"""
+        with tempfile.TemporaryDirectory() as plain_dir:
+            os.chdir(plain_dir)
+            vm = VersionManager()
+
+            committed, output = self.run_quietly(vm.git_commit_version, "0.1.0")
+
+            self.assertFalse(committed)
+            self.assertIn('Not in a git repository', output)
+            self.assertIsNone(vm.get_git_status())
+
+if __name__ == '__main__':
+    # Discover every test case in the module; exits non-zero on failure
+    unittest.main(verbosity=2)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Long-running transpiler process for external test harnesses
+
+Imports the transpiler once, then reads one JSON-encoded Python DSL
+source per line from stdin and writes the JSON-encoded Java for it as one
+line on stdout. Harnesses that transpile many snippets pay interpreter
+startup and import once instead of per snippet.
+
+Usage:
+    python tests/transpile_daemon.py < sources.jsonl > java.jsonl
+"""
+
+import sys
+import os
+import json
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ftc_transpiler import transpile_ftc_python_to_java
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        
+        java_code = transpile_ftc_python_to_java(json.loads(line))
+        print(json.dumps(java_code), flush=True)
+
+if __name__ == '__main__':
+    main()